@@ -2,6 +2,9 @@
 ASGI config for api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The comment stream (``comments.streams``) needs to be served through it.
+API paths are served with the lean ``API_MIDDLEWARE`` stack, see
+``api.handlers``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -9,8 +12,14 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+from api.handlers import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
 application = get_asgi_application()
+
+# Only served processes flush post views in the background, see
+# posts.counters.
+from posts.counters import view_counter  # noqa: E402
+
+view_counter.start_background_flush()
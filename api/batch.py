@@ -0,0 +1,147 @@
+"""
+Composite requests.
+
+``POST /api/v1/batch/`` runs several API requests within one HTTP request::
+
+    {"requests": [
+        {"method": "GET", "path": "/api/v1/posts/1/"},
+        {"method": "GET", "path": "/api/v1/users/?ids=3,4"}
+    ]}
+
+and answers ``{"responses": [{"status", "headers", "body"}, ...]}`` in the
+same order. Sub-requests are dispatched straight to their views in this
+process: the caller is authenticated once and sub-requests run as that user,
+and they share the request's identity map, so a user or category loaded by
+one of them is not fetched again by the next. Each sub-request runs on its
+own; a failing one does not roll back the others, and a sub-request that
+raises is answered with a 500 in its slot while the rest still run.
+"""
+import asyncio
+import io
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status, viewsets
+from rest_framework.response import Response
+
+from utils.renderers import FastJSONRenderer
+
+logger = logging.getLogger('django.request')
+
+API_PREFIX = '/api/v1/'
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_path(self, value):
+        if not value.startswith(API_PREFIX):
+            raise serializers.ValidationError(f"Expected a path starting with {API_PREFIX}.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=BatchRequestSerializer(), allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"Expected at most {settings.BATCH_MAX_REQUESTS} requests."
+            )
+        return value
+
+
+class BatchViewSet(viewsets.ViewSet):
+    # Sub-requests apply the permissions of their own views.
+    permission_classes = []
+    serializer_class = BatchSerializer
+    # Headers a sub-request may set; everything else is the batch request's.
+    forwarded_headers = ('if-match', 'if-none-match', 'accept-language')
+
+    def create(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({
+            'responses': [
+                self.dispatch_sub_request(request, sub_request)
+                for sub_request in serializer.validated_data['requests']
+            ]
+        })
+
+    def dispatch_sub_request(self, request, sub_request):
+        url = urlsplit(sub_request['path'])
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return self.error(status.HTTP_404_NOT_FOUND, "Not found.")
+        if getattr(match.func, 'cls', None) is BatchViewSet or asyncio.iscoroutinefunction(match.func):
+            return self.error(status.HTTP_400_BAD_REQUEST, "This path cannot be batched.")
+
+        sub = self.build_request(request, sub_request, url)
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Http404:
+            return self.error(status.HTTP_404_NOT_FOUND, "Not found.")
+        except PermissionDenied:
+            return self.error(status.HTTP_403_FORBIDDEN, "Permission denied.")
+        except Exception:
+            # Earlier sub-requests may have written already; failing the
+            # whole batch would hide which ones did.
+            logger.exception("Internal Server Error in batched request: %s", sub_request['path'])
+            return self.error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Server error.")
+        if response.streaming:
+            return self.error(status.HTTP_400_BAD_REQUEST, "This path cannot be batched.")
+
+        headers = {
+            name: value for name, value in response.items()
+            if name not in ('Content-Type', 'Content-Length', 'Vary', 'Allow')
+        }
+        if hasattr(response, 'data'):
+            body = response.data
+        else:
+            body = response.content.decode(response.charset) or None
+        return {'status': response.status_code, 'headers': headers, 'body': body}
+
+    def build_request(self, request, sub_request, url):
+        body = b''
+        if 'body' in sub_request:
+            body = FastJSONRenderer().render(sub_request['body'])
+
+        environ = {
+            key: value for key, value in request.META.items()
+            if not key.startswith(('wsgi.', 'HTTP_IF_'))
+            and key not in ('CONTENT_TYPE', 'CONTENT_LENGTH')
+        }
+        environ.update({
+            'REQUEST_METHOD': sub_request['method'],
+            'PATH_INFO': url.path,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': url.query,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.url_scheme': request.scheme,
+        })
+        for name, value in sub_request.get('headers', {}).items():
+            if name.lower() in self.forwarded_headers:
+                environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        sub = WSGIRequest(environ)
+        # Reuse the batch request's authentication instead of decoding the
+        # token again in every sub-request.
+        if request.user.is_authenticated:
+            sub._force_auth_user = request.user
+            sub._force_auth_token = request.auth
+        sub._dont_enforce_csrf_checks = True
+        return sub
+
+    def error(self, status_code, detail):
+        return {'status': status_code, 'headers': {}, 'body': {'detail': detail}}
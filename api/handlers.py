@@ -0,0 +1,139 @@
+"""
+Separate middleware stacks for the API and the rest of the site.
+
+Requests whose path starts with one of ``API_PATH_PREFIXES`` are handled
+with the ``API_MIDDLEWARE`` stack: ``MIDDLEWARE`` without the session,
+CSRF, authentication and messages middleware of ``SESSION_ONLY_MIDDLEWARE``.
+API views authenticate with JWT and are CSRF exempt, so those only add a
+fixed cost to every call. The admin and the schema pages keep the full
+``MIDDLEWARE`` stack.
+
+Both stacks resolve against ``ROOT_URLCONF``; only the middleware differs.
+The test client always uses ``MIDDLEWARE``.
+"""
+import logging
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('django.request')
+
+
+def is_api_path(path):
+    return path.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+class APIHandlerMixin:
+    def get_middleware(self):
+        return settings.API_MIDDLEWARE
+
+    def load_middleware(self, is_async=False):
+        # BaseHandler.load_middleware() with the chain built from
+        # get_middleware() rather than settings.MIDDLEWARE, which other
+        # handlers may be reading at the same time.
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(self.get_middleware()):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, 'sync_capable', True)
+            middleware_can_async = getattr(middleware, 'async_capable', False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    f"Middleware {middleware_path} must have at least one of "
+                    f"sync_capable/async_capable set to True."
+                )
+            elif not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async,
+                    handler,
+                    handler_is_async,
+                    debug=settings.DEBUG,
+                    name=f"middleware {middleware_path}",
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed as exc:
+                if settings.DEBUG:
+                    logger.debug("MiddlewareNotUsed(%r): %s", middleware_path, exc)
+                continue
+            else:
+                handler = adapted_handler
+
+            if mw_instance is None:
+                raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+
+            if hasattr(mw_instance, 'process_view'):
+                self._view_middleware.insert(0, self.adapt_method_mode(is_async, mw_instance.process_view))
+            if hasattr(mw_instance, 'process_template_response'):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, 'process_exception'):
+                # Exception middleware always runs synchronously.
+                self._exception_middleware.append(
+                    self.adapt_method_mode(False, mw_instance.process_exception)
+                )
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        # Assigned last, as it flags the initialization as complete.
+        self._middleware_chain = self.adapt_method_mode(is_async, handler, handler_is_async)
+
+
+class APIWSGIHandler(APIHandlerMixin, WSGIHandler):
+    pass
+
+
+class APIASGIHandler(APIHandlerMixin, ASGIHandler):
+    pass
+
+
+class WSGIDispatcher:
+    def __init__(self, api, default):
+        self.api = api
+        self.default = default
+
+    def __call__(self, environ, start_response):
+        handler = self.api if is_api_path(environ.get('PATH_INFO', '')) else self.default
+        return handler(environ, start_response)
+
+
+class ASGIDispatcher:
+    def __init__(self, api, default):
+        self.api = api
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        handler = self.default
+        if scope['type'] == 'http':
+            path = scope['path']
+            root_path = scope.get('root_path', '')
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            if is_api_path(path):
+                handler = self.api
+        return await handler(scope, receive, send)
+
+
+def get_wsgi_application():
+    django.setup(set_prefix=False)
+    return WSGIDispatcher(APIWSGIHandler(), WSGIHandler())
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ASGIDispatcher(APIASGIHandler(), ASGIHandler())
@@ -0,0 +1,134 @@
+"""
+Swagger and Redoc views.
+
+The OpenAPI document is written to ``SCHEMA_ARTIFACT_DIR`` at deploy time by
+``manage.py generate_schema`` and served from there with long-lived caching
+headers and an ETag. Only with ``DEBUG`` does a missing artifact fall back to
+generating the schema on each request.
+
+``drf_yasg.views`` pulls in the schema generators and inspectors, which
+every worker would otherwise import while loading the URLconf. The views
+are created on the first request instead, once per process; the UI pages
+cache their HTML for ``SCHEMA_CACHE_TIMEOUT`` seconds and load the document
+from the artifact URL.
+"""
+import functools
+import hashlib
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+ARTIFACTS = {
+    '.json': ('openapi.json', 'application/json'),
+    '.yaml': ('openapi.yaml', 'application/yaml'),
+}
+
+
+def get_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Snippets API",
+        default_version='v1',
+        description="Test description",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@snippets.local"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema_view():
+    from drf_yasg.views import get_schema_view as build_schema_view
+    from rest_framework import permissions
+
+    return build_schema_view(
+        get_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_view(ui=None):
+    schema_view = get_schema_view()
+    if ui is None:
+        return schema_view.without_ui(cache_timeout=settings.SCHEMA_CACHE_TIMEOUT)
+    return schema_view.with_ui(ui, cache_timeout=settings.SCHEMA_CACHE_TIMEOUT)
+
+
+def generate_schema(url=None):
+    """
+    Generate the public OpenAPI document and encode it in every artifact
+    format.
+
+    :return: The encoded document per format, e.g. ``{'.json': b'...'}``.
+    :rtype: dict
+    """
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+    generator = get_schema_view().generator_class(get_info(), url=url)
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        '.json': OpenAPICodecJson(validators=[]).encode(schema),
+        '.yaml': OpenAPICodecYaml(validators=[]).encode(schema),
+    }
+
+
+def get_artifact_path(format):
+    return os.path.join(settings.SCHEMA_ARTIFACT_DIR, ARTIFACTS[format][0])
+
+
+def load_artifact(format):
+    """
+    :return: ``(content, etag, mtime)`` of the artifact, or None if it has
+        not been generated.
+    :rtype: tuple
+    """
+    path = get_artifact_path(format)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return read_artifact(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def read_artifact(path, mtime_ns):
+    with open(path, 'rb') as artifact:
+        content = artifact.read()
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return content, etag, mtime_ns // 10 ** 9
+
+
+@require_safe
+def schema_json(request, format=None):
+    if format not in ARTIFACTS:
+        raise Http404()
+
+    artifact = load_artifact(format)
+    if artifact is None:
+        if settings.DEBUG:
+            return get_view()(request, format=format)
+        raise Http404("The API schema has not been generated.")
+
+    content, etag, mtime = artifact
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is None:
+        response = HttpResponse(content, content_type=ARTIFACTS[format][1])
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Cache-Control'] = f"public, max-age={settings.SCHEMA_MAX_AGE}"
+    return response
+
+
+def schema_swagger_ui(request, *args, **kwargs):
+    return get_view('swagger')(request, *args, **kwargs)
+
+
+def schema_redoc(request, *args, **kwargs):
+    return get_view('redoc')(request, *args, **kwargs)
@@ -30,7 +30,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('SECRET_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DEBUG')
+DEBUG = os.environ.get('DEBUG', '').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = ["*"]
 
@@ -46,16 +46,28 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'django_filters',
-    'django_extensions',
     'drf_yasg',
     'users',
     'posts',
     'comments',
     'categories',
+    'sync',
+    'utils',
 ]
 
+# Development-only apps are left out in production so workers boot without
+# importing them.
+if DEBUG:
+    INSTALLED_APPS += [
+        'django_extensions',
+    ]
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.middleware.CompressionMiddleware',
+    'utils.identity.IdentityMapMiddleware',
+    'utils.querylog.SlowQueryMiddleware',
+    'utils.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,6 +76,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Requests to API_PATH_PREFIXES skip the session, CSRF, authentication and
+# messages middleware of the admin, see api.handlers.
+API_PATH_PREFIXES = ['/api/', '/token/']
+SESSION_ONLY_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+API_MIDDLEWARE = [m for m in MIDDLEWARE if m not in SESSION_ONLY_MIDDLEWARE]
+
 ROOT_URLCONF = 'api.urls'
 
 TEMPLATES = [
@@ -143,13 +166,175 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend'
+        'django_filters.rest_framework.DjangoFilterBackend',
+        'utils.filters.IdsFilterBackend',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'utils.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# List endpoints accept ?ids=1,2,3 with up to IDS_FILTER_MAX_IDS ids, and
+# /api/v1/batch/ runs up to BATCH_MAX_REQUESTS sub-requests per request.
+IDS_FILTER_MAX_IDS = 100
+BATCH_MAX_REQUESTS = 20
+
+# Serve list endpoints from values() rows instead of running the serializer
+# per object, see utils.values.ValuesRowBuilder. Opt-in.
+VALUES_FAST_PATH = False
+
+# Responses smaller than COMPRESSION_MIN_SIZE bytes are sent uncompressed.
+# Compressed bodies are reused from an LRU of COMPRESSION_CACHE_MAX_BYTES.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Post views are buffered per worker and written every
+# VIEW_COUNTER_FLUSH_INTERVAL seconds or once VIEW_COUNTER_FLUSH_THRESHOLD
+# distinct posts are pending. Workers started by api.wsgi or api.asgi also
+# write them from a background thread when traffic stops and when they exit,
+# so a worker that is killed loses at most VIEW_COUNTER_FLUSH_INTERVAL
+# seconds of views.
+VIEW_COUNTER_FLUSH_INTERVAL = 10
+VIEW_COUNTER_FLUSH_THRESHOLD = 1000
+
+# Trending scores halve every TRENDING_HALF_LIFE_HOURS. The rank_posts
+# command reads the comments created since its last run, at most
+# TRENDING_WINDOW_HOURS back, leaving out the last TRENDING_SETTLE_SECONDS so
+# comments of transactions in flight are read by the next run. It weighs a
+# comment and a view with the weights below; a weight of 0 ignores the signal.
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WINDOW_HOURS = 7 * 24
+TRENDING_SETTLE_SECONDS = 5
+TRENDING_COMMENT_WEIGHT = 1.0
+TRENDING_VIEW_WEIGHT = 0.1
+
+# build_related_posts keeps RELATED_POSTS_COUNT related posts per post,
+# scoring category overlap with RELATED_POSTS_CATEGORY_WEIGHT and hashed
+# title/body terms with the rest.
+RELATED_POSTS_COUNT = 5
+RELATED_POSTS_CATEGORY_WEIGHT = 0.6
+RELATED_POSTS_HASH_FEATURES = 2 ** 18
+
+# Tables partitioned by month on created_at. manage_partitions keeps
+# PARTITION_MONTHS_AHEAD months of partitions ready and, when
+# PARTITION_RETENTION_MONTHS is set, detaches partitions older than that.
+PARTITIONED_TABLES = ['comments_comment']
+PARTITION_MONTHS_AHEAD = 3
+PARTITION_RETENTION_MONTHS = None
+
+# The OpenAPI document is written to SCHEMA_ARTIFACT_DIR by generate_schema
+# and served with max-age=SCHEMA_MAX_AGE. The Swagger/Redoc pages are built on
+# first request, cached for SCHEMA_CACHE_TIMEOUT seconds and load the
+# document from the artifact URL.
+SCHEMA_ARTIFACT_DIR = BASE_DIR / 'build' / 'schema'
+SCHEMA_MAX_AGE = 24 * 60 * 60
+SCHEMA_CACHE_TIMEOUT = 0 if DEBUG else 24 * 60 * 60
+
+SWAGGER_SETTINGS = {
+    'SPEC_URL': '/swagger.json/',
 }
 
+REDOC_SETTINGS = {
+    'SPEC_URL': '/swagger.json/',
+}
+
+# With COMMENT_GROUP_COMMIT, concurrent comment creates in a worker are
+# written together with one INSERT after waiting at most
+# COMMENT_GROUP_COMMIT_MAX_WAIT seconds for up to
+# COMMENT_GROUP_COMMIT_MAX_BATCH comments.
+COMMENT_GROUP_COMMIT = False
+COMMENT_GROUP_COMMIT_MAX_WAIT = 0.005
+COMMENT_GROUP_COMMIT_MAX_BATCH = 100
+
+# New comments are streamed to clients of /api/v1/comments/stream/ through
+# COMMENT_STREAM_BACKEND: utils.pubsub.LocalBackend only reaches connections of
+# the worker that created the comment, utils.pubsub.PostgresBackend reaches all
+# workers through LISTEN/NOTIFY. A worker serves at most
+# COMMENT_STREAM_MAX_CONNECTIONS streams, drops a stream that falls
+# COMMENT_STREAM_QUEUE_SIZE events behind and sends a heartbeat after
+# COMMENT_STREAM_HEARTBEAT idle seconds. Streams end after
+# COMMENT_STREAM_MAX_AGE seconds, as Django 4.2 does not notice clients that
+# disconnect; reconnecting clients are sent up to COMMENT_STREAM_BACKLOG
+# missed comments.
+COMMENT_STREAM_BACKEND = 'utils.pubsub.LocalBackend'
+COMMENT_STREAM_MAX_CONNECTIONS = 10000
+COMMENT_STREAM_QUEUE_SIZE = 64
+COMMENT_STREAM_HEARTBEAT = 15
+COMMENT_STREAM_MAX_AGE = 300
+COMMENT_STREAM_RETRY = 3000
+COMMENT_STREAM_BACKLOG = 100
+
+# SLOW_QUERY_SAMPLE_RATE of the queries taking at least SLOW_QUERY_THRESHOLD_MS
+# are recorded with their plan in a per-worker log of SLOW_QUERY_LOG_SIZE
+# entries, see utils.querylog. With SLOW_QUERY_EXPLAIN_ANALYZE, sampled SELECTs
+# run again under EXPLAIN ANALYZE. A sample rate of 0 disables the sampler.
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', 0))
+SLOW_QUERY_THRESHOLD_MS = 200
+SLOW_QUERY_EXPLAIN_ANALYZE = True
+SLOW_QUERY_LOG_SIZE = 100
+
+# Requests of staff users sending the PROFILE_HEADER header, and
+# PROFILE_SAMPLE_RATE of all requests, are profiled by sampling their stack
+# every PROFILE_INTERVAL_MS, see utils.profiling. Each worker keeps collapsed
+# stacks of PROFILE_MAX_ROUTES routes with up to PROFILE_MAX_STACKS distinct
+# stacks each. Without a header and a sample rate of 0 the profiler is off.
+PROFILE_HEADER = os.environ.get('PROFILE_HEADER', 'X-Profile') or None
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL_MS = 5
+PROFILE_MAX_ROUTES = 50
+PROFILE_MAX_STACKS = 2000
+
+# User activity digests are cached for USER_STATS_CACHE_TIMEOUT seconds and
+# list the USER_STATS_TOP_CATEGORIES categories a user posted in most.
+USER_STATS_CACHE_TIMEOUT = 60
+USER_STATS_TOP_CATEGORIES = 3
+
+# Rows of these models are fetched at most once per request by primary key,
+# see utils.identity.
+IDENTITY_MAP_MODELS = ['auth.User', 'categories.Category']
+
+# Bulk comment moderation hides or deletes at most MODERATION_BATCH_SIZE
+# comments per statement.
+MODERATION_BATCH_SIZE = 5000
+
+# RSS/Atom feeds list the FEED_ITEMS newest posts. Rendered feeds are cached
+# until a post of the feed changes, or FEED_CACHE_TIMEOUT seconds, and may be
+# cached by clients and proxies for FEED_MAX_AGE seconds, see posts.feeds.
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60
+FEED_MAX_AGE = 60
+
+# The sync endpoint returns at most SYNC_PAGE_SIZE rows per resource and page
+# and holds back rows written in the last SYNC_SETTLE_SECONDS, so that rows of
+# transactions still in flight are not skipped. Tombstones of deleted rows are
+# kept SYNC_TOMBSTONE_RETENTION_DAYS; cursors older than a pruned tombstone have
+# to sync again.
+SYNC_PAGE_SIZE = 500
+SYNC_SETTLE_SECONDS = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# Revoked tokens are checked against a bloom filter in each worker, see
+# users.revocation. Revocations made by other workers are picked up within
+# TOKEN_REVOCATION_REFRESH_INTERVAL seconds; the filter is rebuilt without
+# expired tokens every TOKEN_REVOCATION_REBUILD_INTERVAL seconds and sized
+# for TOKEN_REVOCATION_BLOOM_CAPACITY tokens at
+# TOKEN_REVOCATION_BLOOM_ERROR_RATE false positives.
+TOKEN_REVOCATION_REFRESH_INTERVAL = 5
+TOKEN_REVOCATION_REBUILD_INTERVAL = 60 * 60
+TOKEN_REVOCATION_BLOOM_CAPACITY = 100000
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = 0.001
+
 JWT_AUTH = {
     'JWT_EXPIRATION_DELTA': datetime.timedelta(days=1),
 }
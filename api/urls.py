@@ -17,18 +17,17 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework import routers
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
-from users.views import UserViewSet
+from users.views import LogoutView, RevokeAllView, TokenObtainPairView, TokenRefreshView, UserViewSet
+from posts.feeds import category_feed, owner_feed, post_feed
 from posts.views import PostViewSet
+from comments.streams import comment_stream
 from comments.views import CommentViewSet
 from categories.views import CategoryViewSet
+from sync.views import SyncViewSet
+from utils.views import ProfileViewSet, SlowQueryViewSet
 
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from api.batch import BatchViewSet
+from api.schema import schema_json, schema_redoc, schema_swagger_ui
 
 
 router = routers.DefaultRouter()
@@ -36,33 +35,29 @@ router.register(r'users', UserViewSet, basename='user')
 router.register(r'posts', PostViewSet, basename='post')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'categories', CategoryViewSet, basename='category')
-
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Snippets API",
-      default_version='v1',
-      description="Test description",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@snippets.local"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
+router.register(r'sync', SyncViewSet, basename='sync')
+router.register(r'batch', BatchViewSet, basename='batch')
+router.register(r'slow-queries', SlowQueryViewSet, basename='slow-query')
+router.register(r'profiles', ProfileViewSet, basename='profile')
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/v1/", include(
         [
+            path("comments/stream/", comment_stream, name='comment-stream'),
+            path("feeds/posts.<str:feed_format>", post_feed, name='post-feed'),
+            path("feeds/categories/<int:pk>.<str:feed_format>", category_feed, name='category-feed'),
+            path("feeds/users/<int:pk>.<str:feed_format>", owner_feed, name='user-feed'),
             path("", include(router.urls))
         ]
     )
     ),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('token/logout/', LogoutView.as_view(), name='token_logout'),
+    path('token/revoke-all/', RevokeAllView.as_view(), name='token_revoke_all'),
+    path('swagger<format>/', schema_json, name='schema-json'),
+    path('swagger/', schema_swagger_ui, name='schema-swagger-ui'),
+    path('redoc/', schema_redoc, name='schema-redoc'),
 ]
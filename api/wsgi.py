@@ -2,6 +2,8 @@
 WSGI config for api project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+API paths are served with the lean ``API_MIDDLEWARE`` stack, see
+``api.handlers``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
@@ -9,8 +11,14 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 
 import os
 
-from django.core.wsgi import get_wsgi_application
+from api.handlers import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
 application = get_wsgi_application()
+
+# Only served processes flush post views in the background, see
+# posts.counters.
+from posts.counters import view_counter  # noqa: E402
+
+view_counter.start_background_flush()
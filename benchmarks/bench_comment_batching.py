@@ -0,0 +1,73 @@
+"""
+Compare comment inserts per second under contention with one transaction
+per comment and with group commit. Rows are committed to the configured
+database and deleted at the end.
+
+    python benchmarks/bench_comment_batching.py [--threads 32] [--comments 50]
+"""
+import argparse
+import threading
+import time
+
+from common import report, setup_django
+
+
+def run(create, threads, comments):
+    from django.db import connection
+
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(comments):
+            create(i)
+        connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * comments / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--comments', type=int, default=50)
+    parser.add_argument('--max-wait', type=float, default=0.005)
+    parser.add_argument('--max-batch', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from comments.batching import CommentBatcher
+    from comments.models import Comment
+    from posts.models import Post
+
+    batcher = CommentBatcher(max_wait=args.max_wait, max_batch=args.max_batch)
+    user = User.objects.create(username="bench_comment_batching_user")
+    try:
+        post = Post.objects.create(title="Live event", body="body", owner=user)
+        single = run(
+            lambda i: Comment.objects.create(body=f"Comment {i}", owner=user, post=post),
+            args.threads, args.comments
+        )
+        grouped = run(
+            lambda i: batcher.create(body=f"Comment {i}", owner=user, post=post),
+            args.threads, args.comments
+        )
+        report([
+            (f"one commit per comment ({args.threads} threads)", f"{single:10.0f} inserts/s"),
+            (f"group commit ({args.threads} threads)", f"{grouped:10.0f} inserts/s"),
+        ])
+    finally:
+        Comment.all_objects.filter(owner=user).hard_delete()
+        Post.all_objects.filter(owner=user).hard_delete()
+        user.delete()
+
+
+if __name__ == '__main__':
+    main()
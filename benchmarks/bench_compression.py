@@ -0,0 +1,57 @@
+"""
+Show the bandwidth versus CPU trade-off of the response compression
+settings on a large ``/api/v1/posts/`` payload.
+
+    python benchmarks/bench_compression.py [--posts 200] [--link-mbps 1.5]
+"""
+import argparse
+import gzip
+
+from common import measure, post_list_payload, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--link-mbps', type=float, default=1.5,
+                        help="Client link speed used to estimate transfer time.")
+    args = parser.parse_args()
+
+    setup_django()
+    from utils.middleware import CompressedBodyCache, brotli
+    from utils.renderers import FastJSONRenderer
+
+    body = FastJSONRenderer().render(post_list_payload(posts=args.posts))
+    bytes_per_second = args.link_mbps * 1e6 / 8
+
+    candidates = [("identity", lambda: body)]
+    candidates += [
+        (f"gzip-{level}", lambda level=level: gzip.compress(body, compresslevel=level, mtime=0))
+        for level in (1, 6, 9)
+    ]
+    if brotli is not None:
+        candidates += [
+            (f"br-{quality}", lambda quality=quality: brotli.compress(body, quality=quality))
+            for quality in (1, 5, 11)
+        ]
+
+    print(f"body: {len(body)} bytes, link: {args.link_mbps} Mbps")
+    rows = []
+    for name, compress in candidates:
+        size = len(compress())
+        seconds = measure(compress, repeat=3, number=5)
+        rows.append((name, (
+            f"{size:9d} B  ratio {len(body) / size:5.1f}  "
+            f"cpu {seconds * 1e3:7.2f} ms  transfer {size / bytes_per_second * 1e3:8.1f} ms"
+        )))
+
+    cache = CompressedBodyCache(64 * 1024 * 1024)
+    key = cache.key('gzip', body)
+    cache.set(key, gzip.compress(body, mtime=0))
+    seconds = measure(lambda: cache.get(cache.key('gzip', body)), repeat=3, number=20)
+    rows.append(("cached gzip", f"cpu {seconds * 1e3:7.2f} ms (digest + lookup)"))
+    report(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Compare the stock DRF JSON renderer/parser with the project ones on a large
+``/api/v1/posts/`` payload.
+
+    python benchmarks/bench_json.py [--posts 1000]
+"""
+import argparse
+import io
+
+from common import measure, post_list_payload, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from utils.parsers import FastJSONParser
+    from utils.renderers import FastJSONRenderer, orjson
+
+    payload = post_list_payload(posts=args.posts)
+    body = JSONRenderer().render(payload)
+    assert FastJSONRenderer().render(payload) == body
+
+    print(f"payload: {args.posts} posts, {len(body) / 1e6:.1f} MB, orjson: {orjson is not None}")
+    rows = []
+    for name, renderer in (("stock", JSONRenderer()), ("fast", FastJSONRenderer())):
+        seconds = measure(lambda: renderer.render(payload))
+        rows.append((f"render {name}", f"{seconds * 1e3:8.2f} ms  {len(body) / seconds / 1e6:8.1f} MB/s"))
+    for name, json_parser in (("stock", JSONParser()), ("fast", FastJSONParser())):
+        seconds = measure(lambda: json_parser.parse(io.BytesIO(body)))
+        rows.append((f"parse {name}", f"{seconds * 1e3:8.2f} ms  {len(body) / seconds / 1e6:8.1f} MB/s"))
+    report(rows)
+
+
+if __name__ == '__main__':
+    main()
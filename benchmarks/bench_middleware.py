@@ -0,0 +1,72 @@
+"""
+Compare the per-request cost of the full ``MIDDLEWARE`` stack with the lean
+``API_MIDDLEWARE`` stack that serves API paths, see ``api.handlers``.
+
+    python benchmarks/bench_middleware.py [--path /api/v1/] [--number 500]
+
+Each stack is first measured around a stub view returning a fixed response,
+which isolates the middleware overhead, then on the given paths.
+"""
+import argparse
+from wsgiref.util import setup_testing_defaults
+
+from common import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--path', action='append',
+                        help="Path to request, can be repeated (default: /api/v1/).")
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.signals import request_finished, request_started
+    from django.db import close_old_connections
+    from django.http import HttpResponse
+
+    from api.handlers import APIWSGIHandler
+
+    settings.ALLOWED_HOSTS = ['*']
+    # Keep one connection open, like CONN_MAX_AGE does in production.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+
+    def stub(handler_class):
+        class StubHandler(handler_class):
+            def _get_response(self, request):
+                return HttpResponse(b'{}', content_type='application/json')
+        return StubHandler()
+
+    cases = [
+        ("stub view", '/api/v1/', [
+            ("full MIDDLEWARE", stub(WSGIHandler)), ("API_MIDDLEWARE", stub(APIWSGIHandler))
+        ]),
+    ]
+    handlers = [("full MIDDLEWARE", WSGIHandler()), ("API_MIDDLEWARE", APIWSGIHandler())]
+    cases += [(path, path, handlers) for path in args.path or ['/api/v1/']]
+
+    rows = []
+    for label, path, case_handlers in cases:
+        def request(handler, path=path):
+            environ = {'PATH_INFO': path, 'HTTP_ACCEPT': 'application/json'}
+            setup_testing_defaults(environ)
+            body = b''.join(handler(environ, lambda status, headers: None))
+            assert body
+
+        timings = {}
+        for name, handler in case_handlers:
+            timings[name] = measure(lambda handler=handler: request(handler), number=args.number)
+            rows.append((f"{label} {name}", f"{timings[name] * 1e6:8.1f} us/request"))
+        saved = timings["full MIDDLEWARE"] - timings["API_MIDDLEWARE"]
+        rows.append((f"{label} saved", (
+            f"{saved * 1e6:8.1f} us/request "
+            f"({saved / timings['full MIDDLEWARE'] * 100:.0f}%)"
+        )))
+    report(rows)
+
+
+if __name__ == '__main__':
+    main()
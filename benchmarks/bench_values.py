@@ -0,0 +1,71 @@
+"""
+Compare serializer and values() fast path throughput for the list
+endpoints. Rows are created inside a transaction that is rolled back.
+
+    python benchmarks/bench_values.py [--posts 1000]
+"""
+import argparse
+
+from common import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--comments-per-post', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from categories.models import Category
+    from categories.serializers import CategorySerializer
+    from comments.models import Comment
+    from comments.serializers import CommentSerializer
+    from posts.models import Post
+    from posts.serializers import PostSerializer
+    from utils.values import ValuesRowBuilder
+
+    with transaction.atomic():
+        user = User.objects.create(username="bench_values_user")
+        categories = Category.objects.bulk_create(
+            Category(name=f"bench-category-{i}") for i in range(20)
+        )
+        posts = Post.objects.bulk_create(
+            Post(title=f"Post {i}", body="body " * 100, owner=user)
+            for i in range(args.posts)
+        )
+        Post.categories.through.objects.bulk_create(
+            Post.categories.through(post_id=post.pk, category_id=categories[i % 20].pk)
+            for i, post in enumerate(posts)
+        )
+        Comment.objects.bulk_create(
+            Comment(body="Nice post!", owner=user, post=post)
+            for post in posts
+            for _ in range(args.comments_per_post)
+        )
+
+        rows = []
+        for serializer_class, queryset in (
+            (PostSerializer, Post.objects.filter(owner=user)),
+            (CommentSerializer, Comment.objects.filter(owner=user)),
+            (CategorySerializer, Category.objects.filter(name__startswith="bench-category-")),
+        ):
+            count = queryset.count()
+            builder = ValuesRowBuilder(serializer_class)
+            serializer_seconds = measure(
+                lambda: serializer_class(queryset.all(), many=True).data, repeat=3, number=1
+            )
+            values_seconds = measure(
+                lambda: builder.to_representation(builder.values(queryset.all())), repeat=3, number=1
+            )
+            name = serializer_class.__name__
+            rows.append((f"{name} serializer", f"{count / serializer_seconds:10.0f} rows/s"))
+            rows.append((f"{name} values", f"{count / values_seconds:10.0f} rows/s"))
+        report(rows)
+
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
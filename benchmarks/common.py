@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+
+def setup_django():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+
+    import django
+    django.setup()
+
+
+def measure(func, repeat=5, number=20):
+    """
+    Return the best wall time of ``repeat`` runs of ``number`` calls, in
+    seconds per call.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def post_list_payload(posts=1000, comments_per_post=5, body_size=2000):
+    """
+    Build data shaped like the ``/api/v1/posts/`` list response.
+    """
+    words = (
+        "django rest framework api serializer viewset query index cache "
+        "request response python postgres migration model field category "
+        "comment post user token router middleware latency throughput"
+    ).split()
+    rng = random.Random(0)
+    timestamp = "2023-08-29T20:18:00.123456Z"
+
+    def text(size):
+        result = []
+        length = 0
+        while length < size:
+            word = rng.choice(words)
+            result.append(word)
+            length += len(word) + 1
+        return " ".join(result)[:size]
+
+    payload = []
+    for post_id in range(1, posts + 1):
+        payload.append({
+            "id": post_id,
+            "title": f"Django Rest Article {post_id}",
+            "body": text(body_size),
+            "owner": post_id % 50 + 1,
+            "categories": [post_id % 7 + 1, post_id % 11 + 1],
+            "comments": [
+                {
+                    "id": post_id * comments_per_post + i,
+                    "body": text(120),
+                    "owner": i + 1,
+                    "post": post_id,
+                    "created_at": timestamp,
+                    "updated_at": timestamp,
+                    "version": 1,
+                }
+                for i in range(comments_per_post)
+            ],
+            "version": 1,
+        })
+    return payload
+
+
+def report(rows):
+    width = max(len(row[0]) for row in rows)
+    for name, value in rows:
+        print(f"{name.ljust(width)}  {value}")
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.4 on 2026-10-19 14:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0003_updated_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ['pk'], 'verbose_name_plural': 'categories'},
+        ),
+    ]
@@ -6,3 +6,7 @@ class Category(BaseModel):
 
     class Meta:
         verbose_name_plural = 'categories'
+        ordering = ['pk']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='category_updated_idx'),
+        ]
@@ -1,48 +1,21 @@
 from rest_framework import status
-from rest_framework.test import APITestCase
-from django.contrib.auth.models import User
 from categories.models import Category
 from categories.views import CategoryViewSet
 from model_bakery import baker
-from utils.mixins import required_test_methods
+from utils.testing import BaseAPITestCase
 
 
-@required_test_methods(http_methods='all', class_view_set=CategoryViewSet)
-class CategoryViewSetTestCase(APITestCase):
+class CategoryViewSetTestCase(BaseAPITestCase):
     BASE_URL = "/api/v1/categories/"
-
-    def setUp(self) -> None:
-        self.super_user = User.objects.create_superuser(
-        username="test_admin",
-        email="test_admin@gmail.com",
-        password="dummy_password321"
-    )
-        self.normal_user = User.objects.create_user(
-        username="normal_user",
-        email="dummy@gmail.com",
-        password="dummy_password321"
-    )
-
-        self.category1 = baker.make(Category, name="Python")
-        self.category2 = baker.make(Category, name="Web Development")
-        self.category3 = baker.make(Category, name="Django Rest Framework")
-
-    def tearDown(self) -> None:
-        Category.objects.all().delete()
-        self.assertEqual(Category.objects.count(), 0)
-
-    
-    def _get_jwt_token(self, username, password) -> dict[str, str]:
-        data = {
-            "username": username,
-            "password": password
-        }
-        access_token = self.client.post("/token/", data=data).json().get('access')
-        header = {
-            "Authorization": f"Bearer {access_token}"
-        }
-
-        return header
+    view_set = CategoryViewSet
+    required_http_methods = 'all'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category1 = baker.make(Category, name="Python")
+        cls.category2 = baker.make(Category, name="Web Development")
+        cls.category3 = baker.make(Category, name="Django Rest Framework")
 
     def test_get_queryset(self):
         header = self._get_jwt_token(username="test_admin", password="dummy_password321")
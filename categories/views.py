@@ -2,9 +2,10 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
 from .models import Category
 from .serializers import CategorySerializer
+from utils.mixins import IdentityMapMixin, ValuesListMixin
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(IdentityMapMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
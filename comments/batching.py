@@ -0,0 +1,151 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_save, pre_save
+
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingComment:
+    def __init__(self, comment):
+        self.comment = comment
+        self.error = None
+        self.lead = False
+        self.done = threading.Event()
+
+
+class CommentBatcher:
+    """
+    Group commit for comment inserts within one worker process.
+
+    The first caller of ``create`` becomes the leader: it waits up to
+    ``max_wait`` seconds, or until ``max_batch`` comments are pending, and
+    then inserts every pending comment with a single multi-row
+    ``INSERT ... RETURNING`` in one transaction. The other callers block
+    until their comment is written and get their own instance back, with
+    its id, or the error of their row. Comments left pending beyond
+    ``max_batch`` are written by the next leader.
+
+    ``pre_save`` is sent once for every comment and ``post_save`` once for
+    every comment written, like ``Model.save()`` does. Callers inside a transaction write directly, as
+    the leader's transaction is not theirs.
+    """
+
+    def __init__(self, max_wait, max_batch):
+        self.max_wait = max_wait
+        self.max_batch = max(1, max_batch)
+        self._reset()
+
+    def create(self, **fields):
+        comment = Comment(**fields)
+        if connection.in_atomic_block:
+            comment.save()
+            return comment
+
+        pending = _PendingComment(comment)
+        with self._condition:
+            self._pending.append(pending)
+            if not self._leading:
+                self._leading = True
+                pending.lead = True
+            elif len(self._pending) >= self.max_batch:
+                self._condition.notify_all()
+
+        while True:
+            if pending.lead:
+                pending.lead = False
+                self._lead()
+            pending.done.wait()
+            if not pending.lead:
+                break
+            pending.done.clear()
+
+        if pending.error is not None:
+            raise pending.error
+        return comment
+
+    def _lead(self):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: len(self._pending) >= self.max_batch, timeout=self.max_wait
+            )
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            if self._pending:
+                # Hand the rest over to a new leader.
+                self._pending[0].lead = True
+                self._pending[0].done.set()
+            else:
+                self._leading = False
+
+        try:
+            self.write(batch)
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def write(self, batch):
+        # Signals are sent once per row, like Model.save(): pre_save before
+        # the row is inserted, post_save once it is written.
+        ready = []
+        for pending in batch:
+            try:
+                pre_save.send(
+                    sender=Comment, instance=pending.comment, raw=False,
+                    using=connection.alias, update_fields=None
+                )
+            except Exception as error:
+                pending.error = error
+            else:
+                ready.append(pending)
+        if not ready:
+            return
+
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create([pending.comment for pending in ready])
+            written = ready
+        except DatabaseError:
+            logger.exception("Group commit of %d comments failed, inserting them one by one.", len(ready))
+            written = []
+            for pending in ready:
+                pending.comment.pk = None
+                pending.comment._state.adding = True
+                try:
+                    with transaction.atomic():
+                        Comment.objects.bulk_create([pending.comment])
+                except Exception as error:
+                    pending.error = error
+                else:
+                    written.append(pending)
+        except Exception as error:
+            for pending in ready:
+                pending.error = error
+            return
+
+        for pending in written:
+            try:
+                post_save.send(
+                    sender=Comment, instance=pending.comment, created=True, raw=False,
+                    using=connection.alias, update_fields=None
+                )
+            except Exception as error:
+                pending.error = error
+
+    def _reset(self):
+        self._condition = threading.Condition()
+        self._pending = []
+        self._leading = False
+
+
+comment_batcher = CommentBatcher(
+    max_wait=settings.COMMENT_GROUP_COMMIT_MAX_WAIT,
+    max_batch=settings.COMMENT_GROUP_COMMIT_MAX_BATCH,
+)
+# Comments pending before a fork belong to the parent process.
+os.register_at_fork(after_in_child=comment_batcher._reset)
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from comments.services import CommentModerationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Hide or delete the comments matching the given ids, owner, post "
+        "and body pattern in bounded batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=CommentModerationService.ACTIONS)
+        parser.add_argument('--ids', type=int, nargs='+', help="Comment ids.")
+        parser.add_argument('--owner', type=int, help="Id of the comments' owner.")
+        parser.add_argument('--post', type=int, help="Id of the comments' post.")
+        parser.add_argument('--pattern', help="Regular expression matched against the body.")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help="Maximum number of comments moderated per statement."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many comments match."
+        )
+
+    def handle(self, *args, **options):
+        criteria = {key: options[key] for key in ('ids', 'owner', 'post', 'pattern')}
+        if all(value is None for value in criteria.values()):
+            raise CommandError("At least one of --ids, --owner, --post or --pattern is required.")
+
+        service = CommentModerationService(batch_size=options['batch_size'])
+        result = service.moderate(
+            options['action'],
+            dry_run=options['dry_run'],
+            progress=lambda done, matched: self.stdout.write(f"{done}/{matched}"),
+            **criteria
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"{result['matched']} comments would be moderated.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Moderated {result['moderated']} of {result['matched']} comments."
+            ))
@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.utils import timezone
+
+from utils.partitions import convert_table
+
+
+def partition_comments(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    convert_table(
+        'comments_comment',
+        partitioned=True,
+        now=timezone.now(),
+        connection=schema_editor.connection
+    )
+
+
+def unpartition_comments(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    convert_table(
+        'comments_comment',
+        partitioned=False,
+        now=timezone.now(),
+        connection=schema_editor.connection
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_comments, unpartition_comments),
+    ]
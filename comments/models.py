@@ -1,11 +1,28 @@
 from django.db import models
-from utils.models import BaseModel
+from utils.models import SoftDeleteModel, VersionedModel
 
 
-class Comment(BaseModel):
+class Comment(SoftDeleteModel, VersionedModel):
     body = models.TextField(blank=False)
     owner = models.ForeignKey('auth.User', related_name='comments', on_delete=models.CASCADE)
     post = models.ForeignKey('posts.Post', related_name='comments', on_delete=models.CASCADE)
 
     class Meta:
-        ordering = ['created_at']
\ No newline at end of file
+        ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_live_post_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=['created_at'],
+                name='comment_live_created_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                name='comment_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False)
+            ),
+        ]
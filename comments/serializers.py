@@ -1,5 +1,8 @@
+import re
+
 from rest_framework import serializers
 from comments.models import Comment
+from comments.services import CommentModerationService
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -12,13 +15,36 @@ class CommentSerializer(serializers.ModelSerializer):
             'owner', 
             'post', 
             'created_at', 
-            'updated_at'
+            'updated_at',
+            'version'
         )
         read_only_fields = [
             'id',
             'owner',
             'created_at',
-            'updated_at'
+            'updated_at',
+            'version'
         ]
 
 
+class CommentModerationSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=CommentModerationService.ACTIONS)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    owner = serializers.IntegerField(required=False)
+    post = serializers.IntegerField(required=False)
+    pattern = serializers.CharField(required=False, max_length=500)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_pattern(self, value):
+        try:
+            re.compile(value)
+        except re.error as error:
+            raise serializers.ValidationError(f"Invalid pattern: {error}.")
+        return value
+
+    def validate(self, attrs):
+        if not any(key in attrs for key in ('ids', 'owner', 'post', 'pattern')):
+            raise serializers.ValidationError(
+                "At least one of ids, owner, post or pattern is required."
+            )
+        return attrs
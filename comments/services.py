@@ -0,0 +1,78 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from comments.models import Comment
+
+logger = logging.getLogger(__name__)
+
+
+class CommentModerationService(object):
+    """
+    Hide (soft delete) or delete comments matching a set of criteria with
+    set-based statements of at most ``batch_size`` rows each, so that large
+    spam waves are cleared without loading comments or holding long locks.
+    """
+    HIDE = 'hide'
+    DELETE = 'delete'
+    ACTIONS = (HIDE, DELETE)
+
+    def __init__(self, batch_size=None):
+        self.batch_size = max(1, batch_size or settings.MODERATION_BATCH_SIZE)
+
+    def get_queryset(self, action, ids=None, owner=None, post=None, pattern=None):
+        """
+        Comments matching all the given criteria. Hiding only matches live
+        comments; deleting also matches already hidden ones.
+        """
+        queryset = Comment.objects.all() if action == self.HIDE else Comment.all_objects.all()
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+        if owner is not None:
+            queryset = queryset.filter(owner_id=owner)
+        if post is not None:
+            queryset = queryset.filter(post_id=post)
+        if pattern:
+            queryset = queryset.filter(body__regex=pattern)
+        return queryset
+
+    def moderate(self, action, dry_run=False, progress=None, **criteria):
+        """
+        Count the matching comments, then unless ``dry_run`` hide or delete
+        them batch by batch, each batch in its own transaction.
+
+        :param progress: Called with ``(done, matched)`` after each batch.
+        :type progress: callable
+
+        :return: ``{'matched': ..., 'moderated': ...}``.
+        :rtype: dict
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown moderation action {action!r}.")
+
+        queryset = self.get_queryset(action, **criteria)
+        matched = queryset.count()
+        if dry_run or not matched:
+            return {'matched': matched, 'moderated': 0}
+
+        done = 0
+        while True:
+            batch = Comment.all_objects.filter(
+                pk__in=queryset.order_by().values('pk')[:self.batch_size]
+            )
+            with transaction.atomic():
+                if action == self.HIDE:
+                    now = timezone.now()
+                    count = batch.update(deleted_at=now, updated_at=now)
+                else:
+                    count, _ = batch.hard_delete()
+            if not count:
+                break
+
+            done += count
+            logger.info("Moderation %s: %d/%d comments.", action, done, matched)
+            if progress is not None:
+                progress(done, matched)
+        return {'matched': matched, 'moderated': done}
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Comment
+from .streams import publish_comment
+
+
+@receiver(post_save, sender=Comment)
+def publish_created_comment(sender, instance, created, using, **kwargs):
+    if created:
+        publish_comment(instance, using=using)
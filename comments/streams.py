@@ -0,0 +1,158 @@
+"""
+Server-Sent Events stream of the new comments of a post.
+
+``GET /api/v1/comments/stream/?post=<id>`` keeps the connection open and
+sends every comment created on the post as an ``event: comment`` with the
+same JSON as the comments list. A reconnecting client sends the
+``Last-Event-ID`` header, or ``?last_id=``, and first gets the comments it
+missed. More than ``COMMENT_STREAM_BACKLOG`` missed comments are sent over
+several reconnects.
+
+A created comment publishes ``"<post id>:<comment id>"`` on the
+``COMMENT_STREAM_BACKEND``. Each worker that has subscribers for the post
+loads the comment once, encodes the event once and hands the same bytes to
+every connection through ``utils.pubsub.hub``. Idle connections cost one
+task and one bounded queue; a heartbeat line is sent after
+``COMMENT_STREAM_HEARTBEAT`` idle seconds so proxies keep the connection open.
+
+Django 4.2 does not stop a streaming response when the client disconnects,
+and ASGI servers drop what is sent to a closed connection, so a stream
+cannot tell that its client is gone. Every stream therefore ends after
+``COMMENT_STREAM_MAX_AGE`` seconds, releasing its subscription, and the
+client reconnects with ``Last-Event-ID`` without missing a comment.
+"""
+import asyncio
+import functools
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.utils.module_loading import import_string
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from posts.models import Post
+from utils.pubsub import hub
+from utils.renderers import FastJSONRenderer
+from utils.values import get_values_builder
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'comment_created'
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.COMMENT_STREAM_BACKEND)()
+
+
+def get_channel(post_id):
+    return f"comments:{post_id}"
+
+
+def encode_event(row):
+    data = FastJSONRenderer().render(row)
+    return b"id: %d\nevent: comment\ndata: %s\n\n" % (row['id'], data)
+
+
+def get_events(queryset):
+    """
+    :return: ``(id, event)`` of each comment of ``queryset``.
+    :rtype: list of tuple
+    """
+    builder = get_values_builder(CommentSerializer)
+    return [
+        (row['id'], encode_event(row))
+        for row in builder.to_representation(builder.values(queryset))
+    ]
+
+
+def publish_comment(comment, using=None):
+    get_backend().publish(NOTIFY_CHANNEL, f"{comment.post_id}:{comment.pk}", using=using)
+
+
+def on_notification(payload):
+    try:
+        post_id, comment_id = (int(value) for value in payload.split(':'))
+    except ValueError:
+        logger.warning("Ignoring comment notification %r.", payload)
+        return
+
+    channel = get_channel(post_id)
+    if not hub.has_subscribers(channel):
+        return
+    for message in get_events(Comment.objects.filter(pk=comment_id, post_id=post_id)):
+        hub.publish(channel, message)
+
+
+async def stream_events(subscription, backlog, last_id):
+    loop = asyncio.get_running_loop()
+    closes_at = loop.time() + settings.COMMENT_STREAM_MAX_AGE
+    try:
+        yield b"retry: %d\n\n" % settings.COMMENT_STREAM_RETRY
+        for _, event in backlog:
+            yield event
+        if len(backlog) >= settings.COMMENT_STREAM_BACKLOG:
+            return
+
+        while True:
+            remaining = closes_at - loop.time()
+            if remaining <= 0:
+                return
+            timeout = min(settings.COMMENT_STREAM_HEARTBEAT, remaining)
+            try:
+                message = await subscription.get(timeout=timeout)
+            except asyncio.TimeoutError:
+                if timeout == remaining:
+                    return
+                yield b": heartbeat\n\n"
+                continue
+            if message is None:
+                # Too far behind; the client reconnects with Last-Event-ID.
+                return
+            comment_id, event = message
+            if comment_id > last_id:
+                yield event
+    finally:
+        subscription.close()
+
+
+async def comment_stream(request):
+    # require_safe does not wrap coroutine views before Django 5.0.
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    try:
+        post_id = int(request.GET.get('post', ''))
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_id') or 0)
+    except ValueError:
+        return HttpResponse(status=400)
+
+    if hub.count() >= settings.COMMENT_STREAM_MAX_CONNECTIONS:
+        response = HttpResponse(status=503)
+        response['Retry-After'] = str(settings.COMMENT_STREAM_RETRY // 1000)
+        return response
+    if not await Post.objects.filter(pk=post_id).aexists():
+        raise Http404()
+
+    get_backend().listen(NOTIFY_CHANNEL, on_notification)
+    # Subscribe before reading the backlog so no comment falls in between.
+    subscription = hub.subscribe(get_channel(post_id), settings.COMMENT_STREAM_QUEUE_SIZE)
+    backlog = []
+    try:
+        if last_id:
+            queryset = Comment.objects.filter(post_id=post_id, pk__gt=last_id).order_by('pk')
+            backlog = await sync_to_async(get_events)(queryset[:settings.COMMENT_STREAM_BACKLOG])
+    except BaseException:
+        subscription.close()
+        raise
+    if backlog:
+        last_id = backlog[-1][0]
+
+    response = StreamingHttpResponse(
+        stream_events(subscription, backlog, last_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,98 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection
+from django.db.models.signals import pre_save
+from django.test import TransactionTestCase, override_settings
+from model_bakery import baker
+from rest_framework.test import APITransactionTestCase
+
+from comments.batching import CommentBatcher
+from comments.models import Comment
+from posts.models import Post
+
+
+class CommentBatcherTestCase(TransactionTestCase):
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.post = baker.make(Post, owner=self.owner)
+
+    def create_concurrently(self, batcher, fields):
+        results = [None] * len(fields)
+
+        def create(index):
+            try:
+                results[index] = batcher.create(**fields[index])
+            except Exception as error:
+                results[index] = error
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=create, args=(i,)) for i in range(len(fields))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_creates_share_one_insert(self):
+        batcher = CommentBatcher(max_wait=5, max_batch=6)
+        fields = [{'body': f"Comment {i}", 'owner': self.owner, 'post': self.post} for i in range(6)]
+
+        with mock.patch.object(Comment.objects, 'bulk_create', wraps=Comment.objects.bulk_create) as bulk_create:
+            comments = self.create_concurrently(batcher, fields)
+
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertEqual(
+            sorted(Comment.objects.values_list('pk', 'body')),
+            sorted((comment.pk, comment.body) for comment in comments)
+        )
+
+    def test_batches_are_bounded(self):
+        batcher = CommentBatcher(max_wait=0.05, max_batch=2)
+        fields = [{'body': f"Comment {i}", 'owner': self.owner, 'post': self.post} for i in range(5)]
+
+        with mock.patch.object(Comment.objects, 'bulk_create', wraps=Comment.objects.bulk_create) as bulk_create:
+            comments = self.create_concurrently(batcher, fields)
+
+        self.assertTrue(all(isinstance(comment, Comment) for comment in comments))
+        self.assertEqual(Comment.objects.count(), 5)
+        self.assertTrue(all(len(call.args[0]) <= 2 for call in bulk_create.call_args_list))
+
+    def test_failing_row_does_not_fail_the_batch(self):
+        batcher = CommentBatcher(max_wait=5, max_batch=3)
+        fields = [
+            {'body': "Good", 'owner': self.owner, 'post': self.post},
+            {'body': "Bad", 'owner': self.owner, 'post_id': 0},
+            {'body': "Good", 'owner': self.owner, 'post': self.post},
+        ]
+
+        saved = []
+        receiver = lambda sender, instance, **kwargs: saved.append(instance.body)  # noqa: E731
+        pre_save.connect(receiver, sender=Comment)
+        self.addCleanup(pre_save.disconnect, receiver, sender=Comment)
+        with self.assertLogs('comments.batching', 'ERROR'):
+            results = self.create_concurrently(batcher, fields)
+
+        self.assertIsInstance(results[1], IntegrityError)
+        # Signals are not sent again for the rows inserted one by one.
+        self.assertEqual(sorted(saved), ["Bad", "Good", "Good"])
+        self.assertEqual(Comment.objects.filter(body="Good").count(), 2)
+
+
+class GroupCommitViewTestCase(APITransactionTestCase):
+    # Outside of a test transaction, so that the view goes through the
+    # batcher instead of saving directly.
+    @override_settings(COMMENT_GROUP_COMMIT=True)
+    def test_create(self):
+        user = baker.make(User)
+        post = baker.make(Post, owner=user)
+        self.client.force_authenticate(user)
+
+        with mock.patch.object(Comment.objects, 'bulk_create', wraps=Comment.objects.bulk_create) as bulk_create:
+            response = self.client.post("/api/v1/comments/", {'body': "Hi", 'post': post.pk}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Comment.objects.get().pk, response.json()['id'])
+        bulk_create.assert_called_once()
@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from comments.models import Comment
+from comments.services import CommentModerationService
+from posts.models import Post
+
+
+class CommentModerationTestCase(APITestCase):
+    BASE_URL = "/api/v1/comments/moderate/"
+
+    def setUp(self) -> None:
+        self.admin = baker.make(User, is_staff=True)
+        self.spammer = baker.make(User)
+        self.user = baker.make(User)
+        self.post = baker.make(Post, owner=self.user)
+
+        self.spam = baker.make(
+            Comment, post=self.post, owner=self.spammer, body="Buy cheap pills", _quantity=7
+        )
+        self.ham = baker.make(Comment, post=self.post, owner=self.user, body="Great post")
+
+    def test_hide_in_batches(self):
+        progress = []
+        result = CommentModerationService(batch_size=3).moderate(
+            'hide', owner=self.spammer.pk, progress=lambda *args: progress.append(args)
+        )
+
+        self.assertEqual(result, {'matched': 7, 'moderated': 7})
+        self.assertEqual(progress, [(3, 7), (6, 7), (7, 7)])
+        self.assertEqual(list(Comment.objects.values_list('pk', flat=True)), [self.ham.pk])
+        self.assertEqual(Comment.all_objects.count(), 8)
+
+    def test_delete_by_pattern_includes_hidden_comments(self):
+        self.spam[0].delete()
+
+        result = CommentModerationService().moderate('delete', pattern='cheap')
+
+        self.assertEqual(result, {'matched': 7, 'moderated': 7})
+        self.assertEqual(list(Comment.all_objects.values_list('pk', flat=True)), [self.ham.pk])
+
+    def test_endpoint_dry_run(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(self.BASE_URL, {
+            'action': 'delete',
+            'ids': [self.spam[0].pk, self.spam[1].pk, self.ham.pk],
+            'owner': self.spammer.pk,
+            'dry_run': True
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'action': 'delete', 'dry_run': True, 'matched': 2, 'moderated': 0
+        })
+        self.assertEqual(Comment.objects.count(), 8)
+
+    def test_endpoint_hides_by_post(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            self.BASE_URL, {'action': 'hide', 'post': self.post.pk}, format='json'
+        )
+
+        self.assertEqual(response.json()['moderated'], 8)
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_endpoint_requires_criteria_and_staff(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(self.BASE_URL, {'action': 'hide'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            self.BASE_URL, {'action': 'hide', 'pattern': '('}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            self.BASE_URL, {'action': 'hide', 'post': self.post.pk}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('moderate_comments', 'hide', '--pattern=pills', '--batch-size=5', stdout=out)
+
+        self.assertIn("Moderated 7 of 7 comments.", out.getvalue())
+        self.assertEqual(Comment.objects.count(), 1)
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from comments.models import Comment
+from posts.models import Post
+from utils.partitions import (
+    add_months,
+    create_partition,
+    default_partition_name,
+    detach_partitions_before,
+    get_partitions,
+    is_partitioned,
+    month_start,
+    partition_name,
+)
+
+TABLE = 'comments_comment'
+
+
+class PartitionsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.post = baker.make(Post, owner=self.owner)
+        self.month = datetime(2001, 5, 1, tzinfo=dt_timezone.utc)
+
+    def make_comment(self, created_at):
+        comment = baker.make(Comment, post=self.post, owner=self.owner)
+        Comment.objects.filter(pk=comment.pk).update(created_at=created_at)
+        return comment
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def test_month_arithmetic(self):
+        self.assertEqual(add_months(self.month, 8), datetime(2002, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(add_months(self.month, -5), datetime(2000, 12, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(month_start(datetime(2001, 5, 31, 23, tzinfo=dt_timezone.utc)), self.month)
+
+    def test_comments_are_partitioned(self):
+        self.assertTrue(is_partitioned(TABLE))
+        self.assertIn(month_start(datetime.now(dt_timezone.utc)), get_partitions(TABLE))
+
+    def test_create_partition_moves_rows_out_of_the_default_partition(self):
+        comment = self.make_comment(self.month.replace(day=15))
+        self.assertEqual(self.count_rows(default_partition_name(TABLE)), 1)
+
+        self.assertTrue(create_partition(TABLE, self.month))
+        self.assertFalse(create_partition(TABLE, self.month))
+
+        self.assertEqual(self.count_rows(default_partition_name(TABLE)), 0)
+        self.assertEqual(self.count_rows(partition_name(TABLE, self.month)), 1)
+        self.assertTrue(Comment.objects.filter(pk=comment.pk).exists())
+
+    def test_detached_partitions_are_archived(self):
+        comment = self.make_comment(self.month.replace(day=15))
+        create_partition(TABLE, self.month)
+        # Fire the deferred foreign key checks of the rows made above, as
+        # tables with pending trigger events cannot be altered.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        detached = detach_partitions_before(TABLE, add_months(self.month, 1))
+
+        self.assertEqual(detached, [partition_name(TABLE, self.month)])
+        self.assertFalse(Comment.all_objects.filter(pk=comment.pk).exists())
+        self.assertEqual(self.count_rows(partition_name(TABLE, self.month)), 1)
+        # Archived comments do not keep their post from being deleted.
+        self.post.hard_delete()
+
+    def test_comments_of_a_post_skip_older_partitions(self):
+        create_partition(TABLE, self.month)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/comments/", {'post': self.post.pk})
+        self.assertEqual(response.status_code, 200)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {queries[-1]['sql']}")
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn(partition_name(TABLE, month_start(self.post.created_at)), plan)
+        self.assertNotIn(partition_name(TABLE, self.month), plan)
+
+    def test_command_dry_run(self):
+        out = StringIO()
+        call_command('manage_partitions', '--months-ahead=24', '--dry-run', stdout=out)
+
+        future = add_months(month_start(datetime.now(dt_timezone.utc)), 24)
+        self.assertIn(f"{partition_name(TABLE, future)} would be created.", out.getvalue())
+        self.assertNotIn(partition_name(TABLE, future), get_partitions(TABLE).values())
+
+    def test_command_creates_future_partitions(self):
+        call_command('manage_partitions', '--months-ahead=5', stdout=StringIO())
+
+        future = add_months(month_start(datetime.now(dt_timezone.utc)), 5)
+        self.assertIn(future, get_partitions(TABLE))
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from model_bakery import baker
+
+from comments.models import Comment
+from posts.models import Post
+from utils.pubsub import Hub, PostgresBackend, hub
+
+
+class HubTestCase(TestCase):
+    async def test_publish_reaches_subscribers_of_the_channel(self):
+        hub = Hub()
+        with hub.subscribe('a', 10) as first, hub.subscribe('b', 10) as second:
+            hub.publish('a', 'message')
+
+            self.assertEqual(await first.get(timeout=1), 'message')
+            with self.assertRaises(asyncio.TimeoutError):
+                await second.get(timeout=0.01)
+        self.assertEqual(hub.count(), 0)
+        self.assertFalse(hub.has_subscribers('a'))
+
+    async def test_slow_subscriber_is_dropped(self):
+        hub = Hub()
+        with hub.subscribe('a', 2) as subscription:
+            for i in range(3):
+                hub.publish('a', i)
+            await asyncio.sleep(0)
+
+            self.assertTrue(subscription.overflowed)
+            self.assertIsNone(await subscription.get(timeout=1))
+
+
+class PostgresBackendTestCase(TransactionTestCase):
+    def test_notifications_are_delivered_on_commit(self):
+        received = []
+        delivered = threading.Event()
+        backend = PostgresBackend()
+        backend.poll_interval = 0.05
+
+        def callback(payload):
+            received.append(payload)
+            delivered.set()
+
+        backend.listen('test_channel', callback)
+        try:
+            # Give the listener time to run LISTEN.
+            delivered.wait(0.5)
+            with transaction.atomic():
+                backend.publish('test_channel', "1:2")
+                self.assertEqual(received, [])
+            self.assertTrue(delivered.wait(5))
+        finally:
+            backend.stop()
+        self.assertEqual(received, ["1:2"])
+
+
+@override_settings(COMMENT_STREAM_HEARTBEAT=0.05)
+class CommentStreamTestCase(TestCase):
+    URL = "/api/v1/comments/stream/"
+
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.post = baker.make(Post, owner=self.owner)
+        self.earlier = baker.make(Comment, post=self.post, owner=self.owner, _quantity=2)
+
+    def create_comment(self, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Comment.objects.create(post=self.post, owner=self.owner, body=body)
+
+    async def read(self, response):
+        return await asyncio.wait_for(anext(response.streaming_content), timeout=1)
+
+    async def test_new_comments_are_streamed(self):
+        response = await self.async_client.get(self.URL, {'post': self.post.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue((await self.read(response)).startswith(b"retry: "))
+
+        comment = await sync_to_async(self.create_comment)("Live!")
+        await sync_to_async(baker.make)(Comment, owner=self.owner)
+
+        event = await self.read(response)
+        self.assertTrue(event.startswith(b"id: %d\nevent: comment\ndata: {" % comment.pk))
+        self.assertIn(b'"body":"Live!"', event)
+        self.assertEqual(await self.read(response), b": heartbeat\n\n")
+        await response.streaming_content.aclose()
+
+    async def test_missed_comments_are_sent_on_reconnect(self):
+        response = await self.async_client.get(
+            self.URL, {'post': self.post.pk}, headers={'Last-Event-ID': str(self.earlier[0].pk)}
+        )
+        await self.read(response)
+
+        event = await self.read(response)
+        self.assertTrue(event.startswith(b"id: %d\n" % self.earlier[1].pk))
+        self.assertEqual(await self.read(response), b": heartbeat\n\n")
+        await response.streaming_content.aclose()
+
+    async def test_invalid_requests(self):
+        response = await self.async_client.get(self.URL, {'post': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+        response = await self.async_client.get(self.URL, {'post': self.post.pk + 1000})
+        self.assertEqual(response.status_code, 404)
+
+        with self.settings(COMMENT_STREAM_MAX_CONNECTIONS=0):
+            response = await self.async_client.get(self.URL, {'post': self.post.pk})
+        self.assertEqual(response.status_code, 503)
+
+
+@override_settings(COMMENT_STREAM_HEARTBEAT=0.05, COMMENT_STREAM_MAX_AGE=0.3)
+class CommentStreamDisconnectTestCase(TransactionTestCase):
+    # ASGIHandler runs the queries of a request in a thread of its own, which
+    # only sees committed rows.
+    URL = "/api/v1/comments/stream/"
+
+    def setUp(self) -> None:
+        self.post = baker.make(Post, owner=baker.make(User))
+
+    async def test_stream_of_disconnected_client_ends(self):
+        disconnected = asyncio.Event()
+        sent = []
+
+        async def receive():
+            if not sent:
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            # ASGI servers drop messages to closed connections.
+            if not disconnected.is_set():
+                sent.append(message)
+                if message['type'] == 'http.response.body':
+                    disconnected.set()
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': self.URL, 'query_string': f"post={self.post.pk}".encode(),
+            'headers': [(b'host', b'testserver')], 'server': ('testserver', 80),
+        }
+        handler = asyncio.ensure_future(ASGIHandler()(scope, receive, send))
+        await asyncio.wait_for(disconnected.wait(), timeout=2)
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertEqual(hub.count(), 1)
+
+        await asyncio.wait_for(handler, timeout=2)
+        self.assertEqual(hub.count(), 0)
@@ -1,67 +1,46 @@
 from rest_framework import status
-from rest_framework.test import APITestCase
-from django.contrib.auth.models import User
 from posts.models import Post
 from comments.models import Comment
 from comments.serializers import CommentSerializer
 from model_bakery import baker
+from utils.testing import BaseAPITestCase
 
 
-
-class CommentViewSetTestCase(APITestCase):
+class CommentViewSetTestCase(BaseAPITestCase):
     BASE_URL = "/api/v1/comments/"
 
-    def setUp(self) -> None:
-        self.super_user = User.objects.create_superuser(
-        username="test_admin",
-        email="test_admin@gmail.com",
-        password="dummy_password321"
-    )
-        self.normal_user = User.objects.create_user(
-        username="normal_user",
-        email="dummy@gmail.com",
-        password="dummy_password321"
-    )
-        self.post_1 = baker.make(Post)
-        self.post_2 = baker.make(Post)
-
-        self.comment_1 = Comment.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.post_1 = baker.make(Post)
+        cls.post_2 = baker.make(Post)
+
+        cls.comment_1 = Comment.objects.create(
             body="This is amazing and well explained!",
-            owner=self.normal_user,
-            post=self.post_1
+            owner=cls.normal_user,
+            post=cls.post_1
         )
-        self.comment_2 = Comment.objects.create(
+        cls.comment_2 = Comment.objects.create(
             body="Perfect!!",
-            owner=self.super_user,
-            post=self.post_2  
+            owner=cls.super_user,
+            post=cls.post_2
         )
 
-
-    def tearDown(self) -> None:
-        Post.objects.all().delete()
-        Comment.objects.all().delete()
-
-        self.assertEqual(Comment.objects.count(), 0)
-        self.assertEqual(Post.objects.count(), 0)
-        
-    def _get_jwt_token(self, username, password) -> dict[str, str]:
-        data = {
-            "username": username,
-            "password": password
-        }
-        access_token = self.client.post("/token/", data=data).json().get('access')
-        header = {
-            "Authorization": f"Bearer {access_token}"
-        }
-
-        return header
-    
     def test_get_all_comments(self):
         header = self._get_jwt_token(username="test_admin", password="dummy_password321")
         response = self.client.get(self.BASE_URL, headers=header).json()
 
         self.assertEqual(len(response), 2)
 
+    def test_get_comments_of_a_post(self):
+        response = self.client.get(self.BASE_URL, {'post': self.post_1.pk})
+        self.assertEqual([comment['id'] for comment in response.json()], [self.comment_1.pk])
+
+        response = self.client.get(self.BASE_URL, {'post': 0})
+        self.assertEqual(response.json(), [])
+        response = self.client.get(self.BASE_URL, {'post': "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_update_a_comment(self):
         header = self._get_jwt_token(username="test_admin", password="dummy_password321")
         data={
@@ -140,6 +119,7 @@ class CommentViewSetTestCase(APITestCase):
        
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Comment.objects.filter(pk=self.comment_1.pk).exists())
+        self.assertTrue(Comment.all_objects.filter(pk=self.comment_1.pk).exists())
 
     def test_create_a_comment(self):
         header = self._get_jwt_token(username="normal_user", password="dummy_password321")
@@ -1,15 +1,61 @@
+from django.conf import settings
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from utils.permissions import IsOwnerOrReadOnly
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
+from .batching import comment_batcher
 from .models import Comment
-from .serializers import CommentSerializer
+from .serializers import CommentModerationSerializer, CommentSerializer
+from .services import CommentModerationService
 from utils.permissions import IsOwnerOrAdmin
+from utils.mixins import OptimisticConcurrencyMixin, ValuesListMixin
+from utils.partitions import month_start
+from posts.models import Post
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all()
+class CommentViewSet(OptimisticConcurrencyMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Comment.objects.filter(post__deleted_at__isnull=True)
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrAdmin]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        post_id = self.request.query_params.get('post')
+        if post_id is None or self.detail:
+            return queryset
+
+        try:
+            post_id = int(post_id)
+        except ValueError:
+            raise ValidationError({'post': "Expected a post id."})
+        created_at = Post.objects.filter(pk=post_id).values_list('created_at', flat=True).first()
+        if created_at is None:
+            return queryset.none()
+        # Comments are never older than their post. Bounding created_at lets
+        # the planner skip the monthly partitions before the post; the start
+        # of its month skips the same ones and leaves room for clock skew
+        # between workers.
+        return queryset.filter(post_id=post_id, created_at__gte=month_start(created_at))
+
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        if settings.COMMENT_GROUP_COMMIT:
+            serializer.instance = comment_batcher.create(
+                owner=self.request.user, **serializer.validated_data
+            )
+        else:
+            serializer.save(owner=self.request.user)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def moderate(self, request):
+        serializer = CommentModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        criteria = dict(serializer.validated_data)
+
+        result = CommentModerationService().moderate(**criteria)
+        return Response({
+            'action': criteria['action'],
+            'dry_run': criteria['dry_run'],
+            **result
+        })
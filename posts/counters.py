@@ -0,0 +1,158 @@
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# Fixed origin of the decayed scores. Scores are stored as
+# ln(sum(2 ** ((t - SCORE_EPOCH) / half_life))) so they never need to be
+# decayed in place: ordering by the stored value is ordering by the current
+# decayed score.
+SCORE_EPOCH = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def decay_rate():
+    return math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def log_score(hits, at=None):
+    """
+    Log-space score of ``hits`` events that happened at ``at``.
+    """
+    at = at or timezone.now()
+    return math.log(hits) + decay_rate() * (at - SCORE_EPOCH).total_seconds()
+
+
+class ViewCounter:
+    """
+    Buffers post views in memory and writes them with one
+    ``UPDATE ... FROM (VALUES ...)`` statement, either every
+    ``flush_interval`` seconds or once ``flush_threshold`` distinct posts are
+    pending, so that reads do not turn into one write each.
+
+    Increments are thread-safe. Every worker process keeps its own buffer;
+    the additive UPDATE makes concurrent flushes from several processes
+    safe. Views buffered when a flush fails are kept for the next one.
+
+    Without ``start_background_flush`` a flush only happens on an
+    increment, so views buffered when traffic stops wait for the next view
+    and those buffered when the process exits are lost.
+    """
+
+    def __init__(self, flush_interval, flush_threshold):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._background = False
+        self._reset()
+
+    def start_background_flush(self):
+        """
+        Also flush from a daemon thread once views have been pending for
+        ``flush_interval`` seconds, and when the process exits.
+        """
+        with self._lock:
+            if self._background:
+                return
+            self._background = True
+        atexit.register(self.flush)
+
+    def increment(self, post_id, hits=1):
+        with self._lock:
+            self._pending[post_id] += hits
+            if self._background and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+                self._thread.start()
+            due = (
+                len(self._pending) >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        :return: The number of posts written.
+        :rtype: int
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        try:
+            self.write(pending)
+        except DatabaseError:
+            logger.exception("Could not flush %d post view counters.", len(pending))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return len(pending)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                wait = self._last_flush + self.flush_interval - time.monotonic()
+                due = wait <= 0 and bool(self._pending)
+            if not due:
+                time.sleep(wait if wait > 0 else self.flush_interval)
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Background flush of post view counters failed.")
+            finally:
+                # The thread has its own connection, which no request cycle
+                # closes.
+                connection.close()
+
+    def write(self, pending):
+        now = timezone.now()
+        rows = sorted(
+            (post_id, hits, log_score(hits, now)) for post_id, hits in pending.items()
+        )
+        table = Post._meta.db_table
+        values = ', '.join(['(%s, %s, %s)'] * len(rows))
+        sql = f"""
+            UPDATE {table} AS post
+            SET views = post.views + v.hits::bigint,
+                views_flushed_at = %s,
+                view_score = CASE
+                    WHEN post.view_score IS NULL THEN v.score::double precision
+                    ELSE GREATEST(post.view_score, v.score::double precision)
+                        + LN(1 + EXP(-ABS(post.view_score - v.score::double precision)))
+                END
+            FROM (VALUES {values}) AS v(id, hits, score)
+            WHERE post.id = v.id::bigint
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [now] + [param for row in rows for param in row])
+
+    def _reset(self):
+        # The flush thread does not survive a fork; the next increment
+        # starts a new one.
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._thread = None
+
+
+view_counter = ViewCounter(
+    flush_interval=settings.VIEW_COUNTER_FLUSH_INTERVAL,
+    flush_threshold=settings.VIEW_COUNTER_FLUSH_THRESHOLD,
+)
+# Views counted before a fork belong to the parent process.
+os.register_at_fork(after_in_child=view_counter._reset)
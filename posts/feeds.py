@@ -0,0 +1,184 @@
+"""
+RSS and Atom feeds of the newest posts, of all posts, of a category and of
+an owner:
+
+    /api/v1/feeds/posts.rss
+    /api/v1/feeds/categories/<id>.atom
+    /api/v1/feeds/users/<id>.rss
+
+A feed lists the ``FEED_ITEMS`` newest posts. The rendered XML is cached
+with its ETag and served with ``304 Not Modified`` to clients sending a
+matching ``If-None-Match`` or ``If-Modified-Since``, so a feed is rendered
+once per change instead of once per poll.
+
+Cached feeds are keyed by a version token per scope (``posts``,
+``category:<id>``, ``owner:<id>``). The signals in ``posts.signals`` drop the
+tokens of the scopes a post belongs to once its transaction commits; the
+next request gets a new token and renders the feed again. A render that
+raced with a change is stored under the dropped token and never served.
+Tokens expire after ``FEED_CACHE_TIMEOUT`` seconds like the feeds, so
+requests for categories or users that do not exist leave nothing behind,
+and with a per-process cache backend other workers see a change after that
+long at the latest.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from categories.models import Category
+from .models import Post
+
+FEED_TYPES = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+
+
+def get_scope_key(scope):
+    return f"feed-version:{scope}"
+
+
+def invalidate_feeds(scopes, using=None):
+    """
+    Drop the cached feeds of ``scopes`` once the current transaction
+    commits.
+    """
+    keys = [get_scope_key(scope) for scope in scopes]
+    transaction.on_commit(lambda: cache.delete_many(keys), using=using)
+
+
+def get_feed_key(scope, feed_format, request):
+    scope_key = get_scope_key(scope)
+    version = cache.get(scope_key)
+    if version is None:
+        cache.add(scope_key, uuid.uuid4().hex, settings.FEED_CACHE_TIMEOUT)
+        version = cache.get(scope_key)
+    # Links in the feed are absolute, so each host gets its own copy.
+    return f"feed:{scope}:{version}:{feed_format}:{request.scheme}://{request.get_host()}"
+
+
+class PostFeed(Feed):
+    title = "Latest posts"
+    description = "The newest posts."
+
+    def __init__(self, feed_format):
+        self.feed_type = FEED_TYPES[feed_format]
+
+    @classmethod
+    def get_scope(cls, pk):
+        return 'posts'
+
+    def get_queryset(self, obj):
+        return Post.objects.all()
+
+    def link(self, obj):
+        return reverse('post-list')
+
+    def items(self, obj):
+        return self.get_queryset(obj).select_related('owner').order_by('-created_at')[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.body
+
+    def item_link(self, item):
+        return reverse('post-detail', args=[item.pk])
+
+    def item_author_name(self, item):
+        return item.owner.username
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+
+class CategoryPostFeed(PostFeed):
+    @classmethod
+    def get_scope(cls, pk):
+        return f"category:{pk}"
+
+    def get_object(self, request, pk):
+        return Category.objects.get(pk=pk)
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(categories=obj)
+
+    def title(self, obj):
+        return f"Latest posts in {obj.name}"
+
+    def description(self, obj):
+        return f"The newest posts in {obj.name}."
+
+    def link(self, obj):
+        return reverse('category-detail', args=[obj.pk])
+
+
+class OwnerPostFeed(PostFeed):
+    @classmethod
+    def get_scope(cls, pk):
+        return f"owner:{pk}"
+
+    def get_object(self, request, pk):
+        return User.objects.get(pk=pk)
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(owner=obj)
+
+    def title(self, obj):
+        return f"Latest posts by {obj.username}"
+
+    def description(self, obj):
+        return f"The newest posts by {obj.username}."
+
+    def link(self, obj):
+        return reverse('user-detail', args=[obj.pk])
+
+
+def feed_view(feed_class):
+    @require_safe
+    def view(request, feed_format, **kwargs):
+        if feed_format not in FEED_TYPES:
+            raise Http404()
+
+        key = get_feed_key(feed_class.get_scope(kwargs.get('pk')), feed_format, request)
+        entry = cache.get(key)
+        if entry is None:
+            rendered = feed_class(feed_format)(request, **kwargs)
+            entry = {
+                'content': rendered.content,
+                'content_type': rendered['Content-Type'],
+                'etag': '"%s"' % hashlib.blake2b(rendered.content, digest_size=16).hexdigest(),
+                'last_modified': rendered.get('Last-Modified'),
+            }
+            cache.set(key, entry, settings.FEED_CACHE_TIMEOUT)
+
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response['Last-Modified'] = entry['last_modified']
+        patch_cache_control(response, public=True, max_age=settings.FEED_MAX_AGE)
+        return get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=parse_http_date_safe(entry['last_modified'] or ''),
+            response=response,
+        )
+
+    return view
+
+
+post_feed = feed_view(PostFeed)
+category_feed = feed_view(CategoryPostFeed)
+owner_feed = feed_view(OwnerPostFeed)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.related import build_related_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute related posts from category overlap and title/body "
+        "similarity. Only posts affected by changes since the last build are "
+        "recomputed unless --full is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Recompute the related posts of every post."
+        )
+
+    def handle(self, *args, **options):
+        built = build_related_posts(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Built related posts for {built} posts."))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.ranking import rank_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold the comments created since the last run and the changed view "
+        "scores into the trending scores. Meant to run every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-hours',
+            type=int,
+            default=settings.TRENDING_WINDOW_HOURS,
+            help="Comments older than this are not read, even after a long pause."
+        )
+
+    def handle(self, *args, **options):
+        ranked = rank_posts(window=timedelta(hours=options['window_hours']))
+        self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} posts."))
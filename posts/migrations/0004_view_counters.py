@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='view_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='views',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(models.OrderBy(models.F('view_score'), descending=True), condition=models.Q(('deleted_at__isnull', True), ('view_score__isnull', False)), name='post_view_score_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_view_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRanking',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='posts.post')),
+                ('activity_score', models.FloatField(null=True)),
+                ('view_score', models.FloatField(null=True)),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(models.OrderBy(models.F('score'), descending=True), name='postranking_score_idx')],
+            },
+        ),
+    ]
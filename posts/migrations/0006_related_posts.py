@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_ranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_posts', to='posts.post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to', to='posts.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['post', 'rank'], name='relatedpost_post_rank_idx'), models.Index(fields=['related'], name='relatedpost_related_idx'), models.Index(fields=['computed_at'], name='relatedpost_computed_idx')],
+            },
+        ),
+    ]
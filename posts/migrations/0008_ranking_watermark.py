@@ -0,0 +1,20 @@
+# Generated by Django 4.2.4 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comments_until', models.DateTimeField()),
+            ],
+        ),
+    ]
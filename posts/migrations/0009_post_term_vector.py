@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-19 14:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_ranking_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTermVector',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='term_vector', serialize=False, to='posts.post')),
+                ('columns', models.BinaryField()),
+                ('weights', models.BinaryField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.4 on 2026-10-19 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_term_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views_flushed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='rankingwatermark',
+            name='views_until',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='postranking',
+            name='score',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('views_flushed_at__isnull', False)), fields=['views_flushed_at'], name='post_views_flushed_idx'),
+        ),
+    ]
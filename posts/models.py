@@ -1,19 +1,106 @@
 from django.db.models import (
+    BinaryField,
     CharField,
     TextField,
+    FloatField,
+    PositiveBigIntegerField,
+    PositiveSmallIntegerField,
+    DateTimeField,
     ForeignKey,
+    OneToOneField,
     ManyToManyField,
+    Index,
+    Model,
+    F,
+    Q,
     CASCADE
 )
-from utils.models import BaseModel
+from utils.models import SoftDeleteModel, VersionedModel
 from categories.models import Category
 
 
-class Post(BaseModel):
+class Post(SoftDeleteModel, VersionedModel):
     title = CharField(max_length=100, null=False, blank=False)
     body = TextField(null=False, blank=False)
     owner = ForeignKey('auth.User', related_name='posts', on_delete=CASCADE)
     categories = ManyToManyField(Category)
+    views = PositiveBigIntegerField(default=0, editable=False)
+    # Time-decayed view count in log space, see posts.counters.
+    view_score = FloatField(null=True, blank=True, editable=False)
+    views_flushed_at = DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            Index(
+                fields=['-created_at'],
+                name='post_live_created_idx',
+                condition=Q(deleted_at__isnull=True)
+            ),
+            Index(
+                fields=['deleted_at'],
+                name='post_deleted_idx',
+                condition=Q(deleted_at__isnull=False)
+            ),
+            Index(
+                F('view_score').desc(),
+                name='post_view_score_idx',
+                condition=Q(deleted_at__isnull=True, view_score__isnull=False)
+            ),
+            Index(fields=['updated_at', 'id'], name='post_updated_idx'),
+            Index(
+                fields=['views_flushed_at'],
+                name='post_views_flushed_idx',
+                condition=Q(views_flushed_at__isnull=False)
+            ),
+        ]
+
+
+class PostRanking(Model):
+    post = OneToOneField(Post, primary_key=True, related_name='ranking', on_delete=CASCADE)
+    # Log-space scores relative to posts.counters.SCORE_EPOCH.
+    activity_score = FloatField(null=True)
+    view_score = FloatField(null=True)
+    # None while no score has a positive weight.
+    score = FloatField(null=True)
+    computed_at = DateTimeField()
+
+    class Meta:
+        indexes = [
+            Index(F('score').desc(), name='postranking_score_idx'),
+        ]
+
+
+class RankingWatermark(Model):
+    """
+    Single row: comments created up to ``comments_until`` are folded into
+    the ``PostRanking`` activity scores, and view scores flushed up to
+    ``views_until`` are copied into them.
+    """
+    comments_until = DateTimeField()
+    views_until = DateTimeField(null=True)
+
+
+class RelatedPost(Model):
+    post = ForeignKey(Post, related_name='related_posts', on_delete=CASCADE)
+    related = ForeignKey(Post, related_name='related_to', on_delete=CASCADE)
+    score = FloatField()
+    rank = PositiveSmallIntegerField()
+    computed_at = DateTimeField()
+
+    class Meta:
+        indexes = [
+            Index(fields=['post', 'rank'], name='relatedpost_post_rank_idx'),
+            Index(fields=['related'], name='relatedpost_related_idx'),
+            Index(fields=['computed_at'], name='relatedpost_computed_idx'),
+        ]
+
+
+class PostTermVector(Model):
+    """
+    Hashed term frequencies of a post's title and body as parallel int32
+    column and float64 weight arrays, see posts.related.
+    """
+    post = OneToOneField(Post, primary_key=True, related_name='term_vector', on_delete=CASCADE)
+    columns = BinaryField()
+    weights = BinaryField()
@@ -0,0 +1,150 @@
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast, Extract
+from django.utils import timezone
+
+from comments.models import Comment
+from .counters import SCORE_EPOCH, decay_rate
+from .models import Post, PostRanking, RankingWatermark
+
+
+def activity_scores(post_ids, timestamps, rate):
+    """
+    Log-space decayed activity per post, vectorized over all events.
+
+    :param post_ids: Post id of every event.
+    :type post_ids: numpy.ndarray
+
+    :param timestamps: Seconds since ``SCORE_EPOCH`` of every event.
+    :type timestamps: numpy.ndarray
+
+    :return: The distinct post ids and ``ln(sum(exp(rate * t)))`` for each.
+    :rtype: tuple of numpy.ndarray
+    """
+    order = np.argsort(post_ids, kind='stable')
+    post_ids = post_ids[order]
+    exponents = timestamps[order] * rate
+
+    unique_ids, starts, counts = np.unique(post_ids, return_index=True, return_counts=True)
+    # log-sum-exp per group, shifted by the group maximum to stay finite.
+    maxima = np.maximum.reduceat(exponents, starts)
+    sums = np.add.reduceat(np.exp(exponents - np.repeat(maxima, counts)), starts)
+    return unique_ids, maxima + np.log(sums)
+
+
+def combine(activity_score, view_score):
+    """
+    :return: The weighted log-space sum of the scores, or None when no score
+        has a positive weight.
+    :rtype: float
+    """
+    weighted = []
+    for score, weight in (
+        (activity_score, settings.TRENDING_COMMENT_WEIGHT),
+        (view_score, settings.TRENDING_VIEW_WEIGHT),
+    ):
+        if weight < 0:
+            raise ImproperlyConfigured("Trending weights cannot be negative.")
+        if score is not None and weight > 0:
+            weighted.append(score + math.log(weight))
+    if not weighted:
+        return None
+    return float(np.logaddexp.reduce(weighted))
+
+
+def rank_posts(now=None, window=None):
+    """
+    Refresh ``PostRanking`` incrementally. Only the comments created since
+    the previous run, as recorded by ``RankingWatermark``, are read; their
+    decayed activity is added to the stored ``activity_score`` with
+    ``logaddexp``. Posts whose views were flushed since the previous run
+    are updated too, and a row is only written when one of its scores
+    changed. The activity score is kept even while no score has a positive
+    weight, with ``score`` None, so raising a weight later does not lose the
+    comments already read.
+
+    Scores live in log space relative to ``SCORE_EPOCH``: decay is the
+    growth of the epoch offset of new events, so stored scores are never
+    decayed in place and rows of posts without new activity stay correctly
+    ordered without rewriting. ``window`` bounds how far back the first run,
+    or a run after a long pause, reads comments.
+
+    :return: The number of rankings written.
+    :rtype: int
+    """
+    now = now or timezone.now()
+    window = window or timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    until = now - timedelta(seconds=settings.TRENDING_SETTLE_SECONDS)
+
+    with transaction.atomic():
+        watermark = RankingWatermark.objects.select_for_update().first()
+        since = now - window
+        if watermark is not None:
+            since = max(since, watermark.comments_until)
+
+        events = Comment.objects.filter(
+            created_at__gt=since,
+            created_at__lte=until,
+            post__deleted_at__isnull=True
+        ).annotate(
+            epoch=Cast(Extract('created_at', 'epoch'), FloatField())
+        ).order_by().values_list('post_id', 'epoch')
+        events = np.array(list(events), dtype=np.float64).reshape(-1, 2)
+
+        new_activity = {}
+        if len(events):
+            post_ids, scores = activity_scores(
+                events[:, 0].astype(np.int64),
+                events[:, 1] - SCORE_EPOCH.timestamp(),
+                decay_rate()
+            )
+            new_activity = dict(zip(post_ids.tolist(), scores.tolist()))
+
+        changed_views = Post.objects.filter(view_score__isnull=False)
+        if watermark is not None and watermark.views_until is not None:
+            changed_views = changed_views.filter(
+                views_flushed_at__gt=watermark.views_until, views_flushed_at__lte=until
+            )
+        post_ids = set(new_activity) | set(changed_views.values_list('pk', flat=True))
+
+        rankings = []
+        for post_id, stored_activity, stored_view, view_score, score in Post.objects.filter(
+            pk__in=post_ids
+        ).values_list(
+            'pk', 'ranking__activity_score', 'ranking__view_score', 'view_score', 'ranking__score'
+        ):
+            activity_score = stored_activity
+            if post_id in new_activity:
+                activity_score = new_activity[post_id] if activity_score is None else float(
+                    np.logaddexp(activity_score, new_activity[post_id])
+                )
+            new_score = combine(activity_score, view_score)
+            if (activity_score, view_score, new_score) == (stored_activity, stored_view, score):
+                continue
+            rankings.append(PostRanking(
+                post_id=post_id,
+                activity_score=activity_score,
+                view_score=view_score,
+                score=new_score,
+                computed_at=now
+            ))
+
+        PostRanking.objects.bulk_create(
+            rankings,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['post'],
+            update_fields=['activity_score', 'view_score', 'score', 'computed_at']
+        )
+        if watermark is None:
+            RankingWatermark.objects.create(comments_until=until, views_until=until)
+        elif until > watermark.comments_until:
+            watermark.comments_until = watermark.views_until = until
+            watermark.save(update_fields=['comments_until', 'views_until'])
+    return len(rankings)
@@ -0,0 +1,228 @@
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from scipy import sparse
+
+from .models import Post, PostTermVector, RelatedPost
+
+TOKEN_RE = re.compile(r'\w\w+')
+
+
+def hash_terms(text, features):
+    """
+    Hashed term frequencies of ``text`` as ``{column: weight}`` with
+    sublinear (``1 + ln(tf)``) weighting.
+    """
+    counts = {}
+    for token in TOKEN_RE.findall(text.lower()):
+        column = zlib.crc32(token.encode()) % features
+        counts[column] = counts.get(column, 0) + 1
+    return {column: 1 + np.log(count) for column, count in counts.items()}
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def encode_terms(title, body):
+    """
+    :return: The hashed term vector of a post as int32 columns and float64
+        weights.
+    :rtype: tuple of numpy.ndarray
+    """
+    terms = hash_terms(f"{title} {body}", settings.RELATED_POSTS_HASH_FEATURES)
+    return (
+        np.fromiter(terms.keys(), dtype=np.int32, count=len(terms)),
+        np.fromiter(terms.values(), dtype=np.float64, count=len(terms)),
+    )
+
+
+def encode_posts(posts, post_categories):
+    """
+    Encode posts as rows of one sparse matrix: the L2 normalized category
+    one-hot vector and the L2 normalized hashed term vector, scaled so the
+    dot product of two rows is the weighted sum of both cosine similarities.
+
+    :param posts: ``(id, columns, weights)`` tuples of the term vectors of
+        ``encode_terms``.
+    :type posts: list of tuple
+
+    :param post_categories: Category ids per post id.
+    :type post_categories: dict
+
+    :return: The post ids in row order and the CSR matrix.
+    :rtype: tuple
+    """
+    features = settings.RELATED_POSTS_HASH_FEATURES
+    category_weight = settings.RELATED_POSTS_CATEGORY_WEIGHT
+    category_columns = {}
+
+    ids = []
+    category_rows, category_cols = [], []
+    term_rows, term_cols, term_data = [], [], []
+    for row, (post_id, columns, weights) in enumerate(posts):
+        ids.append(post_id)
+        for category_id in post_categories.get(post_id, ()):
+            column = category_columns.setdefault(category_id, len(category_columns))
+            category_rows.append(row)
+            category_cols.append(column)
+        term_rows.append(np.full(len(columns), row, dtype=np.int64))
+        term_cols.append(columns)
+        term_data.append(weights)
+
+    shape = len(ids)
+    term_rows = np.concatenate(term_rows) if term_rows else np.zeros(0, dtype=np.int64)
+    term_cols = np.concatenate(term_cols) if term_cols else np.zeros(0, dtype=np.int32)
+    term_data = np.concatenate(term_data) if term_data else np.zeros(0)
+    categories = sparse.csr_matrix(
+        (np.ones(len(category_rows)), (category_rows, category_cols)),
+        shape=(shape, max(len(category_columns), 1))
+    )
+    terms = sparse.csr_matrix((term_data, (term_rows, term_cols)), shape=(shape, features))
+
+    matrix = sparse.hstack([
+        normalize_rows(categories) * np.sqrt(category_weight),
+        normalize_rows(terms) * np.sqrt(1 - category_weight),
+    ]).tocsr()
+    return np.array(ids, dtype=np.int64), matrix
+
+
+def nearest_neighbours(matrix, rows, count, chunk_size=256):
+    """
+    Top ``count`` most similar rows of ``matrix`` for each of ``rows``,
+    computed with one sparse product per chunk of rows.
+
+    :return: ``(row, neighbour_row, score)`` tuples, best first per row.
+    :rtype: list of tuple
+    """
+    transposed = matrix.T.tocsc()
+    neighbours = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        similarities = (matrix[chunk] @ transposed).tocsr()
+        for offset, row in enumerate(chunk):
+            begin, end = similarities.indptr[offset], similarities.indptr[offset + 1]
+            columns = similarities.indices[begin:end]
+            scores = similarities.data[begin:end]
+
+            keep = (columns != row) & (scores > 0)
+            columns, scores = columns[keep], scores[keep]
+            if len(scores) > count:
+                top = np.argpartition(-scores, count)[:count]
+                columns, scores = columns[top], scores[top]
+
+            order = np.lexsort((columns, -scores))
+            neighbours.extend(
+                (row, int(columns[i]), float(scores[i])) for i in order
+            )
+    return neighbours
+
+
+def update_term_vectors(queryset):
+    """
+    Encode and store the term vectors of the posts of ``queryset``.
+    """
+    vectors = []
+    for post_id, title, body in queryset.values_list('pk', 'title', 'body').iterator():
+        columns, weights = encode_terms(title, body)
+        vectors.append(PostTermVector(post_id=post_id, columns=columns.tobytes(), weights=weights.tobytes()))
+    PostTermVector.objects.bulk_create(
+        vectors,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['post'],
+        update_fields=['columns', 'weights']
+    )
+
+
+def build_related_posts(full=False):
+    """
+    Precompute the related posts of every post that changed since the last
+    build, of the posts listing a changed post and of the changed posts'
+    new neighbours. With ``full`` every post is recomputed.
+
+    Term vectors are stored in ``PostTermVector``; an incremental build only
+    encodes the posts that changed since the last build. Run a full build
+    after changing ``RELATED_POSTS_HASH_FEATURES``.
+
+    :return: The number of posts whose related posts were written.
+    :rtype: int
+    """
+    now = timezone.now()
+    last_build = None if full else RelatedPost.objects.aggregate(
+        last_build=Max('computed_at')
+    )['last_build']
+
+    if last_build is None:
+        update_term_vectors(Post.objects.all())
+    else:
+        update_term_vectors(Post.objects.filter(
+            Q(updated_at__gte=last_build) | Q(term_vector__isnull=True)
+        ))
+
+    posts = [
+        (post_id, np.frombuffer(columns, dtype=np.int32), np.frombuffer(weights, dtype=np.float64))
+        for post_id, columns, weights in PostTermVector.objects.filter(
+            post__deleted_at__isnull=True
+        ).order_by('post_id').values_list('post_id', 'columns', 'weights')
+    ]
+    post_categories = {}
+    for post_id, category_id in Post.categories.through.objects.filter(
+        post__deleted_at__isnull=True
+    ).values_list('post_id', 'category_id'):
+        post_categories.setdefault(post_id, []).append(category_id)
+
+    ids, matrix = encode_posts(posts, post_categories)
+    rows_by_id = {post_id: row for row, post_id in enumerate(ids.tolist())}
+    count = settings.RELATED_POSTS_COUNT
+
+    if last_build is None:
+        changed = set(rows_by_id)
+        deleted = set()
+    else:
+        changed = set(Post.all_objects.filter(
+            updated_at__gte=last_build
+        ).values_list('pk', flat=True))
+        deleted = changed - set(rows_by_id)
+        changed -= deleted
+        # Posts whose current list mentions a changed post.
+        changed |= set(RelatedPost.objects.filter(
+            related_id__in=changed | deleted
+        ).values_list('post_id', flat=True)) - deleted
+
+    rows = [rows_by_id[post_id] for post_id in sorted(changed) if post_id in rows_by_id]
+    neighbours = nearest_neighbours(matrix, rows, count)
+    if last_build is not None:
+        # Changed posts may now belong to their new neighbours' lists too.
+        extra = sorted({neighbour for _, neighbour, _ in neighbours} - set(rows))
+        neighbours += nearest_neighbours(matrix, extra, count)
+        rows += extra
+
+    related = []
+    ranks = {}
+    for row, neighbour, score in neighbours:
+        ranks[row] = ranks.get(row, 0) + 1
+        related.append(RelatedPost(
+            post_id=int(ids[row]),
+            related_id=int(ids[neighbour]),
+            score=score,
+            rank=ranks[row],
+            computed_at=now
+        ))
+
+    with transaction.atomic():
+        stale = Q(post_id__in=[int(ids[row]) for row in rows])
+        if deleted:
+            stale |= Q(post_id__in=deleted) | Q(related_id__in=deleted)
+        if full:
+            stale = Q()
+        RelatedPost.objects.filter(stale).delete()
+        RelatedPost.objects.bulk_create(related, batch_size=1000)
+    return len(rows)
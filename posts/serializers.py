@@ -1,11 +1,12 @@
-from . models import Post
+from . models import Post, RelatedPost
 from rest_framework import serializers
 from categories.models import Category
 from comments.serializers import CommentSerializer
+from utils.relations import IdentityMapPrimaryKeyRelatedField
 
 
 class PostSerializer(serializers.ModelSerializer):
-    categories = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), many=True)
+    categories = IdentityMapPrimaryKeyRelatedField(queryset=Category.objects.all(), many=True)
     comments = CommentSerializer(many=True, read_only=True)
     
     class Meta:
@@ -16,13 +17,33 @@ class PostSerializer(serializers.ModelSerializer):
             'body',
             'owner',
             'categories',
-            'comments'
+            'comments',
+            'views',
+            'version'
         )
         read_only_fields = [
             'id',
             'comments',
             'owner',
+            'views',
+            'version',
             'created_at',
             'updated_at'
         ]
-        
\ No newline at end of file
+
+
+class RelatedPostSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='related_id')
+    title = serializers.CharField(source='related.title')
+    owner = serializers.IntegerField(source='related.owner_id')
+    created_at = serializers.DateTimeField(source='related.created_at')
+
+    class Meta:
+        model = RelatedPost
+        fields = (
+            'id',
+            'title',
+            'owner',
+            'created_at',
+            'score'
+        )
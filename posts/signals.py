@@ -0,0 +1,113 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from categories.models import Category
+from .feeds import invalidate_feeds
+from .models import Post
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def touch_posts_on_category_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Bump ``updated_at`` of posts whose categories changed, so jobs that pick
+    up changed posts by ``updated_at`` see category-only edits too.
+    """
+    if reverse:
+        if action == 'pre_clear':
+            post_ids = list(instance.post_set.values_list('pk', flat=True))
+        elif action in ('post_add', 'post_remove'):
+            post_ids = list(pk_set)
+        else:
+            return
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        post_ids = [instance.pk]
+    else:
+        return
+
+    Post.all_objects.filter(pk__in=post_ids).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Category)
+def touch_posts_on_category_delete(sender, instance, **kwargs):
+    """
+    Deleting a category removes it from its posts without ``m2m_changed``.
+    """
+    Post.all_objects.filter(categories=instance).update(updated_at=timezone.now())
+
+
+def get_feed_scopes(post, categories=True):
+    scopes = ['posts', f"owner:{post.owner_id}"]
+    if categories:
+        category_ids = Post.categories.through.objects.filter(
+            post_id=post.pk
+        ).values_list('category_id', flat=True)
+        scopes += [f"category:{category_id}" for category_id in category_ids]
+    return scopes
+
+
+@receiver(post_save, sender=Post)
+def invalidate_feeds_on_post_save(sender, instance, created, using, **kwargs):
+    # Categories of a new post are added afterwards, see the m2m_changed
+    # receiver below.
+    invalidate_feeds(get_feed_scopes(instance, categories=not created), using=using)
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_feeds_on_post_delete(sender, instance, using, **kwargs):
+    invalidate_feeds(get_feed_scopes(instance), using=using)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def invalidate_feeds_on_category_change(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if reverse:
+        if action in ('post_add', 'post_remove', 'pre_clear'):
+            invalidate_feeds([f"category:{instance.pk}"], using=using)
+    elif action in ('post_add', 'post_remove'):
+        invalidate_feeds([f"category:{category_id}" for category_id in pk_set], using=using)
+    elif action == 'pre_clear':
+        invalidate_feeds(get_feed_scopes(instance), using=using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category_feed(sender, instance, using, **kwargs):
+    invalidate_feeds([f"category:{instance.pk}"], using=using)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # A deferred username is left unread and looked up on save instead.
+    instance._stored_username = instance.__dict__.get('username')
+
+
+@receiver(pre_save, sender=User)
+def detect_owner_rename(sender, instance, update_fields, using, **kwargs):
+    # Feeds show the username of the owner of each post. Logins and password
+    # changes keep it, so only a username that differs from the stored one
+    # invalidates them.
+    instance._username_changed = False
+    if instance._state.adding or (update_fields is not None and 'username' not in update_fields):
+        return
+    stored = getattr(instance, '_stored_username', None)
+    if stored is None:
+        stored = sender._base_manager.using(using).filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+    instance._username_changed = stored is not None and stored != instance.username
+
+
+@receiver(post_save, sender=User)
+def invalidate_owner_feeds(sender, instance, using, **kwargs):
+    instance._stored_username = instance.__dict__.get('username')
+    if not getattr(instance, '_username_changed', False):
+        return
+    instance._username_changed = False
+    category_ids = Post.categories.through.objects.filter(
+        post__owner_id=instance.pk
+    ).values_list('category_id', flat=True).distinct()
+    invalidate_feeds(
+        ['posts', f"owner:{instance.pk}"] + [f"category:{category_id}" for category_id in category_ids],
+        using=using
+    )
@@ -0,0 +1,85 @@
+import gzip
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from posts.models import Post
+from utils.middleware import CompressionMiddleware, parse_accept_encoding, strip_etag_coding
+
+
+class CompressionMiddlewareTestCase(APITestCase):
+    BASE_URL = "/api/v1/posts/"
+
+    def setUp(self) -> None:
+        owner = baker.make(User)
+        baker.make(Post, body="Compressible body. " * 100, owner=owner, _quantity=5)
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip;q=0.5, br, identity;q=0, *;q=bad"),
+            {"gzip": 0.5, "br": 1.0, "identity": 0.0, "*": 0.0}
+        )
+
+    def test_gzip_is_negotiated(self):
+        plain = self.client.get(self.BASE_URL)
+        response = self.client.get(self.BASE_URL, headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_refused_coding_is_not_used(self):
+        response = self.client.get(self.BASE_URL, headers={"Accept-Encoding": "gzip;q=0, br;q=0"})
+        self.assertNotIn("Content-Encoding", response)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_responses_are_not_compressed(self):
+        with mock.patch("utils.middleware.hashlib.sha256") as sha256:
+            response = self.client.get(self.BASE_URL, headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response)
+        sha256.assert_not_called()
+
+    def test_accept_encoding_is_left_as_sent(self):
+        header = "gzip;q=0.5, br;q=0.1"
+        response = self.client.get(self.BASE_URL, headers={"Accept-Encoding": header})
+        self.assertEqual(response.wsgi_request.META["HTTP_ACCEPT_ENCODING"], header)
+        self.assertEqual(response.wsgi_request.compression_coding, "gzip")
+
+    def test_identical_bodies_are_compressed_once(self):
+        def fake_compress(middleware, coding, content):
+            return gzip.compress(content)
+
+        with mock.patch.object(
+            CompressionMiddleware, "compress", autospec=True, side_effect=fake_compress
+        ) as compress:
+            first = self.client.get(self.BASE_URL, headers={"Accept-Encoding": "gzip"})
+            second = self.client.get(self.BASE_URL, headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_compressed_etag_stays_strong(self):
+        self.client.force_authenticate(baker.make(User, is_staff=True))
+        url = f"{self.BASE_URL}{Post.objects.last().pk}/"
+        plain = self.client.get(url)
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(plain["ETag"], '"1"')
+        self.assertEqual(response["ETag"], '"1-gzip"')
+        self.assertEqual(strip_etag_coding("1-gzip"), "1")
+
+    def test_compressed_etag_answers_not_modified(self):
+        self.client.force_authenticate(baker.make(User, is_staff=True))
+        url = f"{self.BASE_URL}{Post.objects.last().pk}/"
+        response = self.client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": '"1-gzip"'}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"1-gzip"')
+        self.assertEqual(response.content, b"")
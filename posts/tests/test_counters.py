@@ -0,0 +1,81 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from posts.counters import ViewCounter, view_counter
+from posts.models import Post
+from posts.ranking import rank_posts
+
+
+class ViewCounterTestCase(APITestCase):
+    BASE_URL = "/api/v1/posts/"
+
+    def setUp(self) -> None:
+        view_counter.flush()
+        owner = baker.make(User)
+        self.post_1 = baker.make(Post, owner=owner)
+        self.post_2 = baker.make(Post, owner=owner)
+        self.post_3 = baker.make(Post, owner=owner)
+
+    def test_views_are_buffered_until_flush(self):
+        counter = ViewCounter(flush_interval=3600, flush_threshold=100)
+        counter.increment(self.post_1.pk)
+        counter.increment(self.post_1.pk)
+
+        self.assertEqual(Post.objects.get(pk=self.post_1.pk).views, 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(counter.flush(), 1)
+        self.assertEqual(Post.objects.get(pk=self.post_1.pk).views, 2)
+        self.assertEqual(counter.flush(), 0)
+
+    def test_threshold_triggers_flush(self):
+        counter = ViewCounter(flush_interval=3600, flush_threshold=2)
+        counter.increment(self.post_1.pk)
+        counter.increment(self.post_2.pk)
+
+        self.assertEqual(Post.objects.get(pk=self.post_1.pk).views, 1)
+        self.assertEqual(Post.objects.get(pk=self.post_2.pk).views, 1)
+
+    def test_background_flush_without_traffic(self):
+        counter = ViewCounter(flush_interval=0.2, flush_threshold=100)
+        flushed = threading.Event()
+
+        def write(pending):
+            flushed.thread = threading.current_thread()
+            flushed.set()
+
+        with mock.patch('posts.counters.atexit.register') as register, \
+                mock.patch.object(counter, 'write', side_effect=write) as write:
+            counter.start_background_flush()
+            counter.increment(self.post_1.pk)
+            self.assertTrue(flushed.wait(5))
+
+        write.assert_called_once_with({self.post_1.pk: 1})
+        self.assertEqual(flushed.thread.name, 'view-counter-flush')
+        register.assert_called_once_with(counter.flush)
+
+    def test_retrieve_counts_a_view(self):
+        self.client.force_authenticate(user=baker.make(User, is_staff=True))
+        self.client.get(f"{self.BASE_URL}{self.post_1.pk}/")
+        self.client.get(f"{self.BASE_URL}{self.post_1.pk}/")
+        view_counter.flush()
+
+        response = self.client.get(f"{self.BASE_URL}{self.post_1.pk}/")
+        self.assertEqual(response.json().get('views'), 2)
+
+    def test_trending_ranks_by_decayed_views(self):
+        counter = ViewCounter(flush_interval=3600, flush_threshold=100)
+        counter.increment(self.post_2.pk, hits=5)
+        counter.increment(self.post_1.pk, hits=2)
+        counter.flush()
+        counter.increment(self.post_1.pk, hits=2)
+        counter.flush()
+        rank_posts()
+
+        response = self.client.get(f"{self.BASE_URL}trending/")
+
+        self.assertEqual([item['id'] for item in response.json()], [self.post_2.pk, self.post_1.pk])
+        self.assertEqual(len(self.client.get(f"{self.BASE_URL}trending/?limit=1").json()), 1)
@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from model_bakery import baker
+from rest_framework import status
+
+from categories.models import Category
+from posts.models import Post
+from utils.testing import BaseAPITestCase
+
+
+@override_settings(FEED_ITEMS=3)
+class PostFeedTestCase(BaseAPITestCase):
+    BASE_URL = "/api/v1/feeds/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = baker.make(Category, name="Python")
+        cls.other_category = baker.make(Category, name="Web")
+        cls.posts = [
+            baker.make(Post, title=f"Article {i}", owner=cls.normal_user if i % 2 else cls.super_user)
+            for i in range(1, 6)
+        ]
+        cls.posts[0].categories.add(cls.category)
+
+    def setUp(self):
+        cache.clear()
+
+    def _titles(self, response):
+        return [
+            title.split(b'</title>')[0].decode()
+            for title in response.content.split(b'<title>')[2:]
+        ]
+
+    def test_rss_feed_of_newest_posts(self):
+        response = self.client.get(self.BASE_URL + "posts.rss")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/rss+xml'))
+        self.assertEqual(self._titles(response), ["Article 5", "Article 4", "Article 3"])
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_atom_feed(self):
+        response = self.client.get(self.BASE_URL + "posts.atom")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/atom+xml'))
+        self.assertIn(b"<name>test_admin</name>", response.content)
+
+    def test_cached_feed_and_not_modified(self):
+        response = self.client.get(self.BASE_URL + "posts.rss")
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.BASE_URL + "posts.rss")
+            not_modified = self.client.get(self.BASE_URL + "posts.rss", HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+
+    def test_post_changes_invalidate_feeds(self):
+        self.client.get(self.BASE_URL + "posts.rss")
+        post = self.posts[-1]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.update_if_version(post.version, title="Renamed")
+        response = self.client.get(self.BASE_URL + "posts.rss")
+        self.assertEqual(self._titles(response), ["Renamed", "Article 4", "Article 3"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        response = self.client.get(self.BASE_URL + "posts.rss")
+        self.assertEqual(self._titles(response), ["Article 4", "Article 3", "Article 2"])
+
+    def test_category_feed(self):
+        url = self.BASE_URL + f"categories/{self.category.pk}.rss"
+        self.assertEqual(self._titles(self.client.get(url)), ["Article 1"])
+        other = self.client.get(self.BASE_URL + f"categories/{self.other_category.pk}.rss")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[2].categories.add(self.category)
+        self.assertEqual(self._titles(self.client.get(url)), ["Article 3", "Article 1"])
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL + f"categories/{self.other_category.pk}.rss")
+        self.assertEqual(response.content, other.content)
+
+    def test_owner_feed(self):
+        response = self.client.get(self.BASE_URL + f"users/{self.normal_user.pk}.atom")
+        self.assertEqual(self._titles(response), ["Article 5", "Article 3", "Article 1"])
+
+    def test_renamed_owner_invalidates_feeds(self):
+        urls = [
+            self.BASE_URL + "posts.atom",
+            self.BASE_URL + f"users/{self.normal_user.pk}.atom",
+            self.BASE_URL + f"categories/{self.category.pk}.atom",
+        ]
+        for url in urls:
+            self.assertIn(b"<name>normal_user</name>", self.client.get(url).content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.normal_user.username = "renamed_user"
+            self.normal_user.save()
+        for url in urls:
+            self.assertIn(b"<name>renamed_user</name>", self.client.get(url).content, url)
+
+    def test_login_keeps_feeds(self):
+        self.client.get(self.BASE_URL + "posts.rss")
+        # Saves last_login only.
+        self.assertTrue(self.client.login(username="test_admin", password=self.PASSWORD))
+        with self.assertNumQueries(0):
+            self.client.get(self.BASE_URL + "posts.rss")
+
+    def test_unchanged_username_keeps_feeds(self):
+        self.client.get(self.BASE_URL + "posts.rss")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.normal_user.set_password("another_password321")
+            self.normal_user.save()
+            self.normal_user.first_name = "Normal"
+            self.normal_user.save()
+        self.assertEqual(callbacks, [])
+        with self.assertNumQueries(0):
+            self.client.get(self.BASE_URL + "posts.rss")
+
+    def test_unknown_feeds(self):
+        self.assertEqual(self.client.get(self.BASE_URL + "posts.json").status_code, status.HTTP_404_NOT_FOUND)
+        with mock.patch.object(cache, 'add', wraps=cache.add) as add:
+            response = self.client.get(self.BASE_URL + "categories/0.rss")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # The version token of a missing category expires.
+        self.assertEqual(add.call_args.args[2], settings.FEED_CACHE_TIMEOUT)
+        response = self.client.post(self.BASE_URL + "posts.rss")
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from comments.models import Comment
+from posts.models import Post
+
+
+class PurgeDeletedCommandTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = baker.make(User)
+        self.live_post = baker.make(Post, owner=self.user)
+        self.old_post = baker.make(Post, owner=self.user)
+        self.recent_post = baker.make(Post, owner=self.user)
+
+        baker.make(Comment, post=self.old_post, owner=self.user, _quantity=5)
+        self.live_comment = baker.make(Comment, post=self.live_post, owner=self.user)
+        self.old_comment = baker.make(Comment, post=self.live_post, owner=self.user)
+
+        long_ago = timezone.now() - timedelta(days=30)
+        Post.all_objects.update(created_at=long_ago - timedelta(days=1))
+        Comment.all_objects.update(created_at=long_ago - timedelta(days=1))
+        Post.all_objects.filter(pk=self.old_post.pk).update(deleted_at=long_ago)
+        Comment.all_objects.filter(pk=self.old_comment.pk).update(deleted_at=long_ago)
+        self.recent_post.delete()
+
+    def test_purges_only_rows_past_the_grace_period(self):
+        call_command('purge_deleted', '--older-than=7', '--batch-size=2', stdout=StringIO())
+
+        self.assertFalse(Post.all_objects.filter(pk=self.old_post.pk).exists())
+        self.assertFalse(Comment.all_objects.filter(post=self.old_post.pk).exists())
+        self.assertFalse(Comment.all_objects.filter(pk=self.old_comment.pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.recent_post.pk).exists())
+        self.assertTrue(Comment.objects.filter(pk=self.live_comment.pk).exists())
+
+    def test_dry_run_does_not_delete(self):
+        out = StringIO()
+        call_command('purge_deleted', '--dry-run', stdout=out)
+
+        self.assertIn("6 comments would be purged.", out.getvalue())
+        self.assertIn("1 posts would be purged.", out.getvalue())
+        self.assertTrue(Post.all_objects.filter(pk=self.old_post.pk).exists())
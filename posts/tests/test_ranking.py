@@ -0,0 +1,147 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import F
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from comments.models import Comment
+from posts.counters import SCORE_EPOCH, ViewCounter, decay_rate
+from posts.models import Post, PostRanking
+from posts.ranking import activity_scores, combine, rank_posts
+
+
+@override_settings(TRENDING_SETTLE_SECONDS=0)
+class RankingTestCase(APITestCase):
+    BASE_URL = "/api/v1/posts/"
+
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.quiet_post = baker.make(Post, owner=self.owner)
+        self.busy_post = baker.make(Post, owner=self.owner)
+        self.old_post = baker.make(Post, owner=self.owner)
+
+    def comment(self, post, age=timedelta()):
+        comment = baker.make(Comment, post=post, owner=self.owner)
+        Comment.objects.filter(pk=comment.pk).update(created_at=timezone.now() - age)
+
+    def test_activity_scores_are_log_sum_exp_per_post(self):
+        post_ids, scores = activity_scores(
+            np.array([2, 1, 2]), np.array([10.0, 20.0, 30.0]), 0.1
+        )
+
+        self.assertEqual(post_ids.tolist(), [1, 2])
+        np.testing.assert_allclose(scores, [2.0, np.log(np.exp(1.0) + np.exp(3.0))])
+
+    def test_recent_activity_outranks_old_activity(self):
+        for _ in range(3):
+            self.comment(self.busy_post)
+        self.comment(self.quiet_post)
+        for _ in range(3):
+            self.comment(self.old_post, age=timedelta(days=4))
+
+        self.assertEqual(rank_posts(), 3)
+
+        response = self.client.get(f"{self.BASE_URL}trending/")
+        self.assertEqual(
+            [item['id'] for item in response.json()],
+            [self.busy_post.pk, self.quiet_post.pk, self.old_post.pk]
+        )
+
+    def test_only_changed_posts_are_rewritten(self):
+        self.comment(self.busy_post)
+        self.comment(self.busy_post)
+        first_run = timezone.now()
+        self.assertEqual(rank_posts(now=first_run), 1)
+
+        self.comment(self.quiet_post)
+        # A comment dated before the last run is not read again.
+        self.comment(self.old_post, age=timedelta(days=1))
+        self.assertEqual(rank_posts(), 1)
+        self.assertEqual(PostRanking.objects.get(post=self.busy_post).computed_at, first_run)
+        self.assertFalse(PostRanking.objects.filter(post=self.old_post).exists())
+
+        counter = ViewCounter(flush_interval=3600, flush_threshold=100)
+        counter.increment(self.quiet_post.pk, hits=100)
+        counter.flush()
+
+        self.assertEqual(rank_posts(), 1)
+        self.assertEqual(PostRanking.objects.get(post=self.busy_post).computed_at, first_run)
+        self.assertEqual(self.client.get(f"{self.BASE_URL}trending/").json()[0]['id'], self.quiet_post.pk)
+        self.assertEqual(rank_posts(), 0)
+
+    def test_new_comments_are_folded_into_stored_score(self):
+        self.comment(self.busy_post, age=timedelta(hours=2))
+        rank_posts()
+        self.comment(self.busy_post)
+        rank_posts()
+
+        epochs = Comment.objects.filter(post=self.busy_post).values_list('created_at', flat=True)
+        _, expected = activity_scores(
+            np.array([self.busy_post.pk] * 2),
+            np.array([(moment - SCORE_EPOCH).total_seconds() for moment in epochs]),
+            decay_rate()
+        )
+        ranking = PostRanking.objects.get(post=self.busy_post)
+        self.assertAlmostEqual(ranking.activity_score, expected[0])
+
+    def test_activity_is_kept_while_unweighted(self):
+        self.comment(self.busy_post, age=timedelta(hours=1))
+        with override_settings(TRENDING_COMMENT_WEIGHT=0):
+            self.assertEqual(rank_posts(), 1)
+        ranking = PostRanking.objects.get(post=self.busy_post)
+        self.assertIsNotNone(ranking.activity_score)
+        self.assertIsNone(ranking.score)
+        self.assertEqual(self.client.get(f"{self.BASE_URL}trending/").json(), [])
+
+        self.comment(self.busy_post)
+        rank_posts()
+        epochs = Comment.objects.filter(post=self.busy_post).values_list('created_at', flat=True)
+        _, expected = activity_scores(
+            np.array([self.busy_post.pk] * 2),
+            np.array([(moment - SCORE_EPOCH).total_seconds() for moment in epochs]),
+            decay_rate()
+        )
+        ranking.refresh_from_db()
+        self.assertAlmostEqual(ranking.activity_score, expected[0])
+        self.assertIsNotNone(ranking.score)
+
+    def test_only_flushed_views_are_read(self):
+        counter = ViewCounter(flush_interval=3600, flush_threshold=100)
+        counter.increment(self.quiet_post.pk, hits=10)
+        counter.flush()
+        self.assertEqual(rank_posts(), 1)
+
+        # A view score that was not flushed since the last run is not read.
+        Post.objects.filter(pk=self.quiet_post.pk).update(view_score=F('view_score') + 1)
+        self.assertEqual(rank_posts(), 0)
+
+        counter.increment(self.quiet_post.pk)
+        counter.flush()
+        self.assertEqual(rank_posts(), 1)
+        ranking = PostRanking.objects.get(post=self.quiet_post)
+        self.assertEqual(ranking.view_score, Post.objects.get(pk=self.quiet_post.pk).view_score)
+
+    @override_settings(TRENDING_VIEW_WEIGHT=0)
+    def test_zero_weight_is_ignored(self):
+        self.assertEqual(combine(1.0, 5.0), 1.0)
+        self.assertIsNone(combine(None, 5.0))
+
+    def test_deleted_posts_are_not_trending(self):
+        self.comment(self.busy_post)
+        rank_posts()
+        self.busy_post.delete()
+
+        self.assertEqual(self.client.get(f"{self.BASE_URL}trending/").json(), [])
+
+    def test_command(self):
+        self.comment(self.busy_post)
+        out = StringIO()
+        call_command('rank_posts', stdout=out)
+
+        self.assertIn("Ranked 1 posts.", out.getvalue())
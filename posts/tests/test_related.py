@@ -0,0 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from posts.models import Post, RelatedPost
+from posts import related
+from posts.related import build_related_posts
+
+
+class RelatedPostsTestCase(APITestCase):
+    BASE_URL = "/api/v1/posts/"
+
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.python = baker.make(Category)
+        self.cooking = baker.make(Category)
+
+        self.post = self.make_post("Profiling python code", "sampling profiler flame graphs", self.python)
+        self.similar = self.make_post("Python profiling tips", "flame graphs from a sampling profiler", self.python)
+        self.same_category = self.make_post("Packaging", "wheels and sdists", self.python)
+        self.unrelated = self.make_post("Sourdough", "flour water salt", self.cooking)
+
+    def make_post(self, title, body, category):
+        post = baker.make(Post, owner=self.owner, title=title, body=body)
+        post.categories.add(category)
+        return post
+
+    def related_ids(self, post):
+        return list(
+            RelatedPost.objects.filter(post=post).order_by('rank').values_list('related_id', flat=True)
+        )
+
+    def age_related_posts(self):
+        RelatedPost.objects.update(computed_at=timezone.now() - timedelta(minutes=1))
+        Post.all_objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def test_related_posts_are_ranked_by_similarity(self):
+        self.assertEqual(build_related_posts(), 4)
+
+        self.assertEqual(self.related_ids(self.post), [self.similar.pk, self.same_category.pk])
+        self.assertEqual(self.related_ids(self.unrelated), [])
+
+    def test_related_endpoint(self):
+        build_related_posts()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{self.BASE_URL}{self.post.pk}/related/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.json()], [self.similar.pk, self.same_category.pk])
+        self.assertEqual(response.json()[0]['title'], self.similar.title)
+
+    def test_related_endpoint_of_missing_posts(self):
+        build_related_posts()
+        self.similar.delete()
+
+        for pk in ["not-a-number", 0, self.similar.pk]:
+            response = self.client.get(f"{self.BASE_URL}{pk}/related/")
+            self.assertEqual(response.status_code, 404, pk)
+
+    def test_incremental_build_only_encodes_changed_posts(self):
+        build_related_posts()
+        self.age_related_posts()
+
+        Post.objects.filter(pk=self.unrelated.pk).update(body="python profiler", updated_at=timezone.now())
+        with mock.patch.object(related, 'hash_terms', wraps=related.hash_terms) as hash_terms:
+            build_related_posts()
+
+        self.assertEqual(hash_terms.call_count, 1)
+        self.assertIn(self.unrelated.pk, self.related_ids(self.post))
+
+    def test_incremental_build_only_recomputes_affected_posts(self):
+        build_related_posts()
+        self.age_related_posts()
+
+        self.unrelated.categories.set([self.python])
+
+        self.assertEqual(build_related_posts(), 4)
+        self.assertIn(self.unrelated.pk, self.related_ids(self.post))
+
+        self.age_related_posts()
+        self.assertEqual(build_related_posts(), 0)
+
+    def test_deleted_posts_are_dropped(self):
+        build_related_posts()
+        self.age_related_posts()
+
+        self.similar.delete()
+        build_related_posts()
+
+        self.assertFalse(RelatedPost.objects.filter(post_id=self.similar.pk).exists())
+        self.assertEqual(self.related_ids(self.post), [self.same_category.pk])
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from categories.serializers import CategorySerializer
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from posts.models import Post
+from posts.serializers import PostSerializer
+from utils.renderers import FastJSONRenderer
+from utils.values import ValuesRowBuilder
+
+
+class ValuesRowBuilderParityTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = baker.make(User)
+        self.other_user = baker.make(User)
+        self.python = baker.make(Category, name="Python")
+        self.web = baker.make(Category, name="Web Development")
+
+        self.posts = [
+            baker.make(Post, title=f"Article {i}", body="Unicode body   çğüşö", owner=self.user)
+            for i in range(5)
+        ]
+        self.posts[0].categories.add(self.python, self.web)
+        self.posts[1].categories.add(self.web)
+
+        for post in self.posts[:3]:
+            baker.make(Comment, post=post, owner=self.other_user, _quantity=3)
+        Comment.objects.filter(post=self.posts[0]).first().delete()
+        self.posts[4].delete()
+
+    def assertParity(self, serializer_class, queryset):
+        expected = FastJSONRenderer().render(serializer_class(queryset, many=True).data)
+
+        builder = ValuesRowBuilder(serializer_class)
+        actual = FastJSONRenderer().render(builder.to_representation(builder.values(queryset)))
+
+        self.assertEqual(actual, expected)
+
+    def test_post_serializer_parity(self):
+        self.assertParity(PostSerializer, Post.objects.all())
+
+    def test_comment_serializer_parity(self):
+        self.assertParity(CommentSerializer, Comment.objects.all())
+
+    def test_category_serializer_parity(self):
+        self.assertParity(CategorySerializer, Category.objects.all())
+
+    def test_related_rows_inserted_out_of_pk_order(self):
+        categories = [baker.make(Category, pk=pk) for pk in (9003, 9001, 9002)]
+        post = baker.make(Post, owner=self.user)
+        for category in categories:
+            post.categories.add(category)
+        other = baker.make(Post, owner=self.user)
+        other.categories.add(categories[2], categories[0])
+        now = timezone.now()
+        for pk, minutes in ((9103, 1), (9101, 3), (9102, 2)):
+            baker.make(Comment, pk=pk, post=post, owner=self.user)
+            Comment.objects.filter(pk=pk).update(created_at=now + timedelta(minutes=minutes))
+
+        queryset = Post.objects.filter(pk__in=[post.pk, other.pk])
+        self.assertParity(PostSerializer, queryset)
+        self.assertParity(CategorySerializer, Category.objects.filter(pk__in=[c.pk for c in categories]))
+
+        builder = ValuesRowBuilder(PostSerializer)
+        row = builder.to_representation(builder.values(queryset.filter(pk=post.pk)))[0]
+        self.assertEqual(row['categories'], [9001, 9002, 9003])
+        self.assertEqual([comment['id'] for comment in row['comments']], [9103, 9102, 9101])
+
+    def test_empty_queryset(self):
+        self.assertParity(PostSerializer, Post.objects.none())
+
+    def test_list_endpoints_parity(self):
+        for url in ("/api/v1/posts/", "/api/v1/comments/", "/api/v1/categories/"):
+            with override_settings(VALUES_FAST_PATH=True):
+                fast = self.client.get(url)
+            with override_settings(VALUES_FAST_PATH=False):
+                slow = self.client.get(url)
+
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.content, slow.content, url)
+
+    @override_settings(VALUES_FAST_PATH=True)
+    def test_post_list_query_count(self):
+        with self.assertNumQueries(3):
+            self.client.get("/api/v1/posts/")
@@ -1,56 +1,26 @@
 from rest_framework import status
-from rest_framework.test import APITestCase
-from django.contrib.auth.models import User
 from posts.models import Post
 from categories.models import Category
+from comments.models import Comment
 from model_bakery import baker
+from utils.testing import BaseAPITestCase
 
 
-
-class PostViewSetTestCase(APITestCase):
+class PostViewSetTestCase(BaseAPITestCase):
     BASE_URL = "/api/v1/posts/"
 
-    def setUp(self) -> None:
-        self.super_user = User.objects.create_superuser(
-        username="test_admin",
-        email="test_admin@gmail.com",
-        password="dummy_password321"
-    )
-        self.normal_user = User.objects.create_user(
-        username="normal_user",
-        email="dummy@gmail.com",
-        password="dummy_password321"
-    )
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
         for i in range(1, 11):
             baker.make(
-                Post, 
+                Post,
                 title=f"Django Rest Article {i}",
-                owner=self.super_user 
+                owner=cls.super_user
             )
-        self.category1 = baker.make(Category, name="Python")
-        self.category2 = baker.make(Category, name="Web Development")
-
-    def tearDown(self) -> None:
-        Post.objects.all().delete()
-        Category.objects.all().delete()
-
-        self.assertEqual(Category.objects.count(), 0)
-        self.assertEqual(Post.objects.count(), 0)
-        
-
-        
-    def _get_jwt_token(self, username, password) -> dict[str, str]:
-        data = {
-            "username": username,
-            "password": password
-        }
-        access_token = self.client.post("/token/", data=data).json().get('access')
-        header = {
-            "Authorization": f"Bearer {access_token}"
-        }
+        cls.category1 = baker.make(Category, name="Python")
+        cls.category2 = baker.make(Category, name="Web Development")
 
-        return header
-    
     def test_get_all_posts(self):
         header = self._get_jwt_token(username="test_admin", password="dummy_password321")
         response = self.client.get(self.BASE_URL, headers=header).json()
@@ -79,6 +49,66 @@ class PostViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json().get('title'), "Updated Title")
 
+    def test_update_with_matching_if_match(self):
+        header = self._get_jwt_token(username="test_admin", password="dummy_password321")
+        post_pk = Post.objects.last().pk
+        etag = self.client.get(f"{self.BASE_URL}{post_pk}/", headers=header)["ETag"]
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{post_pk}/",
+            headers={**header, "If-Match": etag},
+            data={"title": "Updated Title"},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(etag, '"1"')
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(Post.objects.get(pk=post_pk).version, 2)
+
+    def test_update_with_stale_if_match(self):
+        header = self._get_jwt_token(username="test_admin", password="dummy_password321")
+        post = Post.objects.last()
+        Post.objects.filter(pk=post.pk).update(version=2, title="Concurrent Title")
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{post.pk}/",
+            headers={**header, "If-Match": '"1"'},
+            data={"title": "Updated Title"},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Post.objects.get(pk=post.pk).title, "Concurrent Title")
+
+    def test_update_with_weak_if_match(self):
+        header = self._get_jwt_token(username="test_admin", password="dummy_password321")
+        post_pk = Post.objects.last().pk
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{post_pk}/",
+            headers={**header, "If-Match": 'W/"1"'},
+            data={"title": "Updated Title"},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Post.objects.get(pk=post_pk).version, 1)
+
+    def test_update_with_any_matching_if_match(self):
+        header = self._get_jwt_token(username="test_admin", password="dummy_password321")
+        post_pk = Post.objects.last().pk
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{post_pk}/",
+            headers={**header, "If-Match": 'W/"1", "7", "1-gzip"'},
+            data={"title": "Updated Title"},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Post.objects.get(pk=post_pk).version, 2)
+
     def test_try_to_update_different_users_post(self):
         header = self._get_jwt_token(username="normal_user", password="dummy_password321")
         post_pk = Post.objects.last().pk
@@ -133,6 +163,22 @@ class PostViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Post.objects.filter(title="Java Compile Time").exists())
 
+    def test_deleted_post_is_soft_deleted(self):
+        header = self._get_jwt_token(username="test_admin", password="dummy_password321")
+        post = Post.objects.last()
+        comment = baker.make(Comment, post=post, owner=self.normal_user)
+
+        response = self.client.delete(f"{self.BASE_URL}{post.pk}/", headers=header)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNotNone(Post.all_objects.get(pk=post.pk).deleted_at)
+        self.assertTrue(Comment.objects.filter(pk=comment.pk).exists())
+        self.assertEqual(
+            self.client.get(f"{self.BASE_URL}{post.pk}/", headers=header).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(len(self.client.get("/api/v1/comments/", headers=header).json()), 0)
+
     def test_create_a_post_with_invalid_credentials(self):
         header = self._get_jwt_token(username="fake_user", password="dummy_password321")
 
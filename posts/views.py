@@ -1,15 +1,56 @@
+from django.db.models import F
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from .models import Post
-from .serializers import PostSerializer
+from rest_framework.response import Response
+from .counters import view_counter
+from .models import Post, RelatedPost
+from .serializers import PostSerializer, RelatedPostSerializer
 from utils.permissions import IsOwnerOrAdmin
+from utils.mixins import OptimisticConcurrencyMixin, ValuesListMixin
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(OptimisticConcurrencyMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrAdmin]
+    trending_limit = 10
+    trending_max_limit = 100
+
+    def get_permissions(self):
+        if self.action == 'related':
+            # Related posts are public like the post list.
+            return [IsAuthenticatedOrReadOnly()]
+        return super().get_permissions()
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
-        
\ No newline at end of file
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        view_counter.increment(response.data['id'])
+        return response
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.trending_limit))
+        except ValueError:
+            limit = self.trending_limit
+        limit = max(1, min(limit, self.trending_max_limit))
+
+        queryset = self.get_queryset().filter(
+            ranking__score__isnull=False
+        ).order_by(F('ranking__score').desc())[:limit]
+        return Response(self.get_list_data(queryset))
+
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        post = self.get_object()
+        queryset = RelatedPost.objects.filter(
+            post_id=post.pk,
+            related__deleted_at__isnull=True
+        ).select_related('related').only(
+            'related_id', 'score', 'related__title', 'related__owner_id', 'related__created_at'
+        ).order_by('rank')
+        return Response(RelatedPostSerializer(queryset, many=True).data)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from sync.models import Tombstone, TombstoneWatermark
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. "
+        "Sync cursors from before a pruned tombstone are answered with 410 Gone."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        with transaction.atomic():
+            pruned = Tombstone.objects.filter(deleted_at__lt=cutoff)
+            for row in pruned.values('model').annotate(last=Max('deleted_at')).order_by():
+                watermark, created = TombstoneWatermark.objects.get_or_create(
+                    model=row['model'], defaults={'pruned_until': row['last']}
+                )
+                if not created and watermark.pruned_until < row['last']:
+                    watermark.pruned_until = row['last']
+                    watermark.save(update_fields=['pruned_until'])
+            deleted, _ = pruned.delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstones."))
@@ -0,0 +1,27 @@
+from django.db.models import BigIntegerField, CharField, DateTimeField, Index, Model
+from django.utils import timezone
+
+
+class Tombstone(Model):
+    """
+    A row of a synced model that was hard deleted, kept for
+    ``SYNC_TOMBSTONE_RETENTION_DAYS`` so that clients syncing from an older
+    cursor learn about the deletion.
+    """
+    model = CharField(max_length=100)
+    object_id = BigIntegerField()
+    deleted_at = DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            Index(fields=['model', 'deleted_at', 'id'], name='tombstone_model_deleted_idx'),
+        ]
+
+
+class TombstoneWatermark(Model):
+    """
+    The newest tombstone of ``model`` deleted by ``prune_tombstones``.
+    Cursors from before it missed a deletion and have to sync again.
+    """
+    model = CharField(max_length=100, unique=True)
+    pruned_until = DateTimeField()
@@ -0,0 +1,40 @@
+from categories.serializers import CategorySerializer
+from posts.serializers import PostSerializer
+
+
+class PostSyncSerializer(PostSerializer):
+    # Comments change without touching their post, so they are left out.
+    comments = None
+
+    class Meta(PostSerializer.Meta):
+        fields = (
+            'id',
+            'title',
+            'body',
+            'owner',
+            'categories',
+            'views',
+            'version',
+            'created_at',
+            'updated_at'
+        )
+
+
+class CategorySyncSerializer(CategorySerializer):
+    posts = None
+
+    class Meta(CategorySerializer.Meta):
+        fields = [
+            'id',
+            'name',
+            'created_at',
+            'updated_at'
+        ]
+
+
+# Synced resources by the key they are sent under.
+RESOURCES = {
+    'posts': PostSyncSerializer,
+    'categories': CategorySyncSerializer,
+}
+
@@ -0,0 +1,177 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from sync.models import Tombstone, TombstoneWatermark
+from sync.serializers import RESOURCES
+from utils.values import get_values_builder
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ExpiredCursor(ValueError):
+    pass
+
+
+class SyncService(object):
+    """
+    Changes of the synced resources since a cursor.
+
+    Every resource is read as two streams in keyset order: rows by
+    ``(updated_at, id)``, soft-deleted rows included, and tombstones of hard
+    deleted rows by ``(deleted_at, id)``. The cursor holds the position
+    reached in each stream, so a page costs an index range scan of at most
+    ``limit + 1`` rows per stream whatever the size of the tables.
+
+    Rows written in the last ``SYNC_SETTLE_SECONDS`` are held back until the
+    next call: ``updated_at`` is set before a transaction commits, and a
+    cursor must not move past rows that are not visible yet.
+    """
+
+    def get_changes(self, since=None, limit=None):
+        """
+        :param since: A cursor returned by a previous call; None for a full
+            sync.
+        :type since: str
+
+        :return: ``{'cursor', 'has_more', <resource>: {'updated', 'deleted'}}``
+        :rtype: dict
+
+        :raises InvalidCursor: If ``since`` cannot be decoded.
+        :raises ExpiredCursor: If tombstones the cursor needs were pruned.
+        """
+        now = timezone.now()
+        horizon = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        limit = limit or settings.SYNC_PAGE_SIZE
+
+        if since:
+            positions = self.decode_cursor(since)
+            self.check_expiry(positions)
+        else:
+            # A client without data has no use for earlier deletions.
+            positions = {}
+            for name in RESOURCES:
+                positions[name] = (None, 0)
+                positions[f"{name}:deleted"] = (horizon, 0)
+
+        data = {'cursor': None, 'has_more': False}
+        for name, serializer_class in RESOURCES.items():
+            updated, deleted, position, more = self.get_updated(
+                serializer_class, positions[name], horizon, limit
+            )
+            tombstones, deleted_position, more_deleted = self.get_deleted(
+                serializer_class.Meta.model, positions[f"{name}:deleted"], horizon, limit
+            )
+            positions[name] = position
+            positions[f"{name}:deleted"] = deleted_position
+            data[name] = {'updated': updated, 'deleted': deleted + tombstones}
+            data['has_more'] = data['has_more'] or more or more_deleted
+
+        data['cursor'] = self.encode_cursor(positions)
+        return data
+
+    def check_expiry(self, positions):
+        """
+        :raises ExpiredCursor: If tombstones newer than a position of
+            ``positions`` were pruned. A cursor only expires when a deletion
+            it has not seen was pruned, however old it is.
+        """
+        # Pruned tombstones are older than the retention period, so recent
+        # cursors need no lookup.
+        expiry = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        stale = {
+            name: positions[f"{name}:deleted"][0] for name in RESOURCES
+            if positions[f"{name}:deleted"][0] < expiry
+        }
+        if not stale:
+            return
+
+        labels = {
+            RESOURCES[name].Meta.model._meta.label_lower: moment
+            for name, moment in stale.items()
+        }
+        watermarks = TombstoneWatermark.objects.filter(model__in=labels).values_list('model', 'pruned_until')
+        if any(labels[label] < pruned_until for label, pruned_until in watermarks):
+            raise ExpiredCursor()
+
+    def get_updated(self, serializer_class, position, horizon, limit):
+        model = serializer_class.Meta.model
+        manager = getattr(model, 'all_objects', model._default_manager)
+        soft_delete = hasattr(model, 'all_objects')
+
+        queryset = manager.filter(updated_at__lte=horizon)
+        updated_at, pk = position
+        if updated_at is not None:
+            queryset = queryset.filter(updated_at__gte=updated_at).exclude(
+                updated_at=updated_at, pk__lte=pk
+            )
+
+        builder = get_values_builder(serializer_class)
+        extra = [
+            column for column in ['updated_at'] + (['deleted_at'] if soft_delete else [])
+            if column not in builder.columns
+        ]
+        rows = list(
+            queryset.order_by('updated_at', 'pk').values(*builder.columns, *extra)[:limit + 1]
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            position = (rows[-1]['updated_at'], rows[-1][builder.pk_name])
+
+        live = [row for row in rows if not row.get('deleted_at')]
+        deleted = [row[builder.pk_name] for row in rows if row.get('deleted_at')]
+        return builder.to_representation(live), deleted, position, more
+
+    def get_deleted(self, model, position, horizon, limit):
+        deleted_at, pk = position
+        queryset = Tombstone.objects.filter(
+            model=model._meta.label_lower,
+            deleted_at__gte=deleted_at,
+            deleted_at__lte=horizon
+        ).exclude(deleted_at=deleted_at, pk__lte=pk)
+
+        rows = list(queryset.order_by('deleted_at', 'pk').values_list(
+            'pk', 'object_id', 'deleted_at'
+        )[:limit + 1])
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            position = (rows[-1][2], rows[-1][0])
+        if not more and position[0] < horizon:
+            # Every tombstone up to the horizon was read; moving up to it
+            # keeps the next range scan short.
+            position = (horizon, 0)
+        return [object_id for _, object_id, _ in rows], position, more
+
+    def encode_cursor(self, positions):
+        payload = {
+            name: [None if moment is None else moment.isoformat(), pk]
+            for name, (moment, pk) in positions.items()
+        }
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode())
+        return encoded.decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            positions = {}
+            for name in RESOURCES:
+                for key in (name, f"{name}:deleted"):
+                    moment, pk = payload[key]
+                    if moment is not None:
+                        moment = datetime.fromisoformat(moment)
+                        if timezone.is_naive(moment):
+                            raise ValueError(moment)
+                    elif key != name:
+                        raise ValueError(key)
+                    positions[key] = (moment, int(pk))
+        except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError):
+            raise InvalidCursor()
+        return positions
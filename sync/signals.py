@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete
+
+from .models import Tombstone
+from .serializers import RESOURCES
+
+
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+for serializer_class in RESOURCES.values():
+    post_delete.connect(
+        record_tombstone,
+        sender=serializer_class.Meta.model,
+        dispatch_uid=f'sync-tombstone-{serializer_class.Meta.model._meta.label_lower}'
+    )
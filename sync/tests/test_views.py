@@ -0,0 +1,148 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from posts.models import Post
+from sync.models import Tombstone, TombstoneWatermark
+from sync.services import SyncService
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncViewSetTestCase(APITestCase):
+    BASE_URL = "/api/v1/sync/"
+
+    def setUp(self) -> None:
+        self.owner = baker.make(User)
+        self.category = baker.make(Category, name="Python")
+        self.posts = [baker.make(Post, owner=self.owner, title=f"Post {i}") for i in range(3)]
+        self.posts[0].categories.add(self.category)
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(self.BASE_URL, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_full_sync_returns_every_row(self):
+        with self.assertNumQueries(5):
+            data = self.sync()
+
+        self.assertFalse(data['has_more'])
+        posts = {item['id']: item for item in data['posts']['updated']}
+        self.assertEqual(sorted(posts), [post.pk for post in self.posts])
+        self.assertEqual(posts[self.posts[0].pk]['categories'], [self.category.pk])
+        self.assertNotIn('comments', posts[self.posts[0].pk])
+        self.assertEqual(data['categories']['updated'][0]['name'], "Python")
+        self.assertEqual(data['posts']['deleted'], [])
+
+        data = self.sync(data['cursor'])
+        self.assertEqual(data['posts'], {'updated': [], 'deleted': []})
+        self.assertEqual(data['categories'], {'updated': [], 'deleted': []})
+
+    def test_changes_since_cursor(self):
+        cursor = self.sync()['cursor']
+
+        Post.objects.filter(pk=self.posts[1].pk).update(title="Edited", updated_at=timezone.now())
+        self.posts[2].delete()
+        new_post = baker.make(Post, owner=self.owner)
+
+        data = self.sync(cursor)
+        self.assertEqual([item['id'] for item in data['posts']['updated']], [self.posts[1].pk, new_post.pk])
+        self.assertEqual(data['posts']['updated'][0]['title'], "Edited")
+        self.assertEqual(data['posts']['deleted'], [self.posts[2].pk])
+
+    def test_hard_deletes_are_sent_from_tombstones(self):
+        cursor = self.sync()['cursor']
+        category_pk, post_pk = self.category.pk, self.posts[1].pk
+
+        self.category.delete()
+        self.posts[1].hard_delete()
+
+        data = self.sync(cursor)
+        self.assertEqual(data['categories']['deleted'], [category_pk])
+        self.assertEqual(data['posts']['deleted'], [post_pk])
+        # The post that lost its category is sent again.
+        self.assertEqual([item['id'] for item in data['posts']['updated']], [self.posts[0].pk])
+        self.assertEqual(data['posts']['updated'][0]['categories'], [])
+
+    def test_pages_are_bounded(self):
+        Post.all_objects.update(updated_at=timezone.now())
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            data = self.sync(cursor, limit=1)
+            self.assertLessEqual(len(data['posts']['updated']), 1)
+            seen += [item['id'] for item in data['posts']['updated']]
+            cursor = data['cursor']
+            pages += 1
+            if not data['has_more']:
+                break
+
+        self.assertEqual(sorted(seen), sorted(post.pk for post in self.posts))
+        self.assertEqual(pages, 3)
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_recent_rows_are_held_back(self):
+        data = self.sync()
+        self.assertEqual(data['posts']['updated'], [])
+
+        Post.all_objects.update(updated_at=timezone.now() - timedelta(minutes=2))
+        data = self.sync(data['cursor'])
+        self.assertEqual(len(data['posts']['updated']), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.BASE_URL, {'since': "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('since', response.json())
+
+    def age_cursor(self, cursor, days):
+        service = SyncService()
+        positions = service.decode_cursor(cursor)
+        for name, (moment, pk) in positions.items():
+            positions[name] = (moment and moment - timedelta(days=days), pk)
+        return service.encode_cursor(positions)
+
+    def test_expired_cursor(self):
+        cursor = self.age_cursor(self.sync()['cursor'], days=31)
+        self.posts[1].hard_delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=30, hours=12))
+        call_command('prune_tombstones', stdout=StringIO())
+
+        response = self.client.get(self.BASE_URL, {'since': cursor})
+        self.assertEqual(response.status_code, 410)
+
+    def test_old_cursor_without_deletes_is_not_expired(self):
+        # Tombstones of other deletions pruned before the cursor do not
+        # matter either.
+        TombstoneWatermark.objects.create(model='posts.post', pruned_until=timezone.now() - timedelta(days=40))
+        cursor = self.age_cursor(self.sync()['cursor'], days=31)
+
+        data = self.sync(cursor)
+        self.assertEqual(data['posts']['deleted'], [])
+        self.assertEqual(data['categories']['deleted'], [])
+
+    def test_cursor_moves_up_without_deletes(self):
+        service = SyncService()
+        first = service.decode_cursor(self.sync()['cursor'])
+        second = service.decode_cursor(self.sync(service.encode_cursor(first))['cursor'])
+        self.assertGreater(second['categories:deleted'][0], first['categories:deleted'][0])
+
+    def test_prune_tombstones(self):
+        self.category.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        baker.make(Category).delete()
+
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(Tombstone.objects.count(), 1)
+        watermark = TombstoneWatermark.objects.get()
+        self.assertEqual(watermark.model, 'categories.category')
+        self.assertLess(watermark.pruned_until, timezone.now() - timedelta(days=30))
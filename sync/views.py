@@ -0,0 +1,33 @@
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+
+from sync.services import ExpiredCursor, InvalidCursor, SyncService
+from utils.exceptions import Gone
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """
+    Rows of posts and categories created, updated or deleted since the
+    ``since`` cursor. Follow ``cursor`` while ``has_more`` is true.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    service = SyncService()
+    max_limit = 1000
+
+    def list(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 0)) or None
+        except ValueError:
+            raise ValidationError({'limit': "Expected a number of rows."})
+        if limit is not None:
+            limit = max(1, min(limit, self.max_limit))
+
+        try:
+            data = self.service.get_changes(request.query_params.get('since'), limit)
+        except InvalidCursor:
+            raise ValidationError({'since': "Invalid cursor."})
+        except ExpiredCursor:
+            raise Gone('The cursor has expired, sync again without "since".')
+        return Response(data)
@@ -0,0 +1,50 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from users.revocation import revocation_list
+from utils.identity import get_identity_map
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    ``JWTAuthentication`` that rejects revoked tokens and registers the
+    authenticated user in the request's identity map, so later lookups of
+    the same user by primary key do not query it again.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revocation_list.is_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked"), code="token_revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        identity_map = get_identity_map()
+        if identity_map is None or api_settings.USER_ID_FIELD != self.user_model._meta.pk.name:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = identity_map.get_object(self.user_model._default_manager.all(), user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    # Token generations are kept: deleting one would restart it at 0 and
+    # let tokens of a later revocation through.
+    help = "Delete revoked tokens that have expired."
+
+    def handle(self, *args, **options):
+        tokens, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Purged {tokens} revoked tokens."))
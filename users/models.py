@@ -1,3 +1,23 @@
 from django.db import models
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """
+    A revoked JWT, kept until it expires.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey('auth.User', related_name='revoked_tokens', on_delete=models.CASCADE)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class TokenGeneration(models.Model):
+    """
+    Every token of ``user`` carrying a generation lower than ``generation``
+    is revoked. "Log out everywhere" increments it.
+    """
+    user = models.OneToOneField(
+        'auth.User', primary_key=True, related_name='token_generation', on_delete=models.CASCADE
+    )
+    generation = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
@@ -0,0 +1,153 @@
+"""
+Revocation of JWTs without a query per request.
+
+Revoked tokens are stored in ``RevokedToken`` by ``jti``. "Log out
+everywhere" increments the ``TokenGeneration`` of a user, which revokes every
+token issued with a lower generation claim (see ``users.tokens``); unlike
+the whole-second ``iat``, the claim tells apart tokens issued in the same
+second before and after the revocation. Each worker keeps a bloom filter of
+the revoked ``jti`` and the generations in memory, so the common case of a token that is not revoked is
+answered without a query. A ``jti`` found in the filter is confirmed with an
+exact lookup, as the filter has false positives.
+
+The in-memory state is brought up to date with the rows written since the
+last time at most every ``TOKEN_REVOCATION_REFRESH_INTERVAL`` seconds, and
+rebuilt from scratch every ``TOKEN_REVOCATION_REBUILD_INTERVAL`` seconds to
+forget expired tokens. A token revoked in another worker may thus still be
+accepted for up to the refresh interval; the worker that revokes a token
+rejects it at once.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import RevokedToken, TokenGeneration
+from users.tokens import GENERATION_CLAIM
+from utils.bloom import BloomFilter
+
+# Revocations are read again for this many seconds after they were made, so
+# that rows of transactions that committed late are not missed.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+class TokenRevocationList:
+    def __init__(self):
+        self._reset()
+
+    def is_revoked(self, token):
+        """
+        :return: Whether ``token`` was revoked, by ``revoke`` or by a later
+            ``revoke_all`` of its user.
+        :rtype: bool
+        """
+        self.refresh()
+
+        generation = self._generations.get(str(token.get(api_settings.USER_ID_CLAIM)))
+        if generation and token.get(GENERATION_CLAIM, 0) < generation:
+            return True
+
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is None or jti not in self._bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, token, user):
+        jti = token[api_settings.JTI_CLAIM]
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={'user': user, 'expires_at': _timestamp(token['exp'])}
+        )
+        self.refresh()
+        with self._lock:
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+
+    def revoke_all(self, user):
+        """
+        Revoke every token of ``user`` issued until now.
+        """
+        TokenGeneration.objects.get_or_create(user=user)
+        TokenGeneration.objects.filter(user=user).update(
+            generation=F('generation') + 1, updated_at=timezone.now()
+        )
+        generation = TokenGeneration.objects.values_list('generation', flat=True).get(user=user)
+        self.refresh()
+        with self._lock:
+            self._generations[str(user.pk)] = generation
+
+    def refresh(self, force=False):
+        """
+        Read the revocations made since the last refresh, or all of them
+        when the filter is due for a rebuild.
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._bloom is not None
+            and now - self._refreshed_at < settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+        ):
+            return
+
+        with self._lock:
+            if (
+                self._bloom is None
+                or self._bloom.full
+                or now - self._rebuilt_at >= settings.TOKEN_REVOCATION_REBUILD_INTERVAL
+            ):
+                self._rebuild(now)
+            elif force or now - self._refreshed_at >= settings.TOKEN_REVOCATION_REFRESH_INTERVAL:
+                self._update(now)
+
+    def _rebuild(self, now):
+        started_at = timezone.now()
+        jtis = list(
+            RevokedToken.objects.filter(expires_at__gt=started_at).values_list('jti', flat=True)
+        )
+        bloom = BloomFilter(
+            max(settings.TOKEN_REVOCATION_BLOOM_CAPACITY, 2 * len(jtis)),
+            settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti in jtis:
+            bloom.add(jti)
+
+        self._bloom = bloom
+        self._generations = {
+            str(user_id): generation
+            for user_id, generation in TokenGeneration.objects.values_list('user_id', 'generation')
+        }
+        self._since = started_at
+        self._rebuilt_at = self._refreshed_at = now
+
+    def _update(self, now):
+        started_at = timezone.now()
+        since = self._since - REFRESH_OVERLAP
+        for jti in RevokedToken.objects.filter(revoked_at__gte=since).values_list('jti', flat=True):
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+        for user_id, generation in TokenGeneration.objects.filter(
+            updated_at__gte=since
+        ).values_list('user_id', 'generation'):
+            self._generations[str(user_id)] = generation
+        self._since = started_at
+        self._refreshed_at = now
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._generations = {}
+        self._since = None
+        self._rebuilt_at = self._refreshed_at = None
+
+
+revocation_list = TokenRevocationList()
+# A lock held by another thread at fork time would never be released.
+os.register_at_fork(after_in_child=revocation_list._reset)
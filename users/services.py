@@ -1,4 +1,14 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils import timezone
+
+from comments.models import Comment
+from posts.models import Post
+
 
 class UserService(object):
     def create_user(self, username: str, password: str):
@@ -11,5 +21,85 @@ class UserService(object):
     def update_user(self, instance, **fields):
         for key, value in fields.items():
             setattr(instance, key, value)
-            instance.save()
+        instance.save()
         return instance        
+
+
+class UserStatsService(object):
+    """
+    Activity digest per user over the last ``days`` days, computed with one
+    grouped aggregate query per metric for any number of users and cached
+    per user for ``USER_STATS_CACHE_TIMEOUT`` seconds.
+    """
+
+    def get_stats(self, user_ids, days):
+        """
+        :return: The digest of each user, in the order of ``user_ids``.
+        :rtype: list of dict
+        """
+        keys = {user_id: f"user-stats:{days}:{user_id}" for user_id in user_ids}
+        cached = cache.get_many(keys.values())
+
+        missing = [user_id for user_id, key in keys.items() if key not in cached]
+        if missing:
+            computed = self.compute(missing, days)
+            cache.set_many(
+                {keys[user_id]: stats for user_id, stats in computed.items()},
+                settings.USER_STATS_CACHE_TIMEOUT
+            )
+            cached.update({keys[user_id]: stats for user_id, stats in computed.items()})
+
+        return [cached[keys[user_id]] for user_id in user_ids]
+
+    def compute(self, user_ids, days):
+        since = timezone.now() - timedelta(days=days)
+        stats = {
+            user_id: {
+                'user': user_id,
+                'days': days,
+                'posts': 0,
+                'comments': 0,
+                'comments_received': 0,
+                'top_categories': [],
+            }
+            for user_id in user_ids
+        }
+
+        posts = Post.objects.filter(
+            owner_id__in=user_ids,
+            created_at__gte=since
+        ).values('owner_id').annotate(count=Count('pk')).order_by()
+        for row in posts:
+            stats[row['owner_id']]['posts'] = row['count']
+
+        comments = Comment.objects.filter(
+            owner_id__in=user_ids,
+            created_at__gte=since,
+            post__deleted_at__isnull=True
+        ).values('owner_id').annotate(count=Count('pk')).order_by()
+        for row in comments:
+            stats[row['owner_id']]['comments'] = row['count']
+
+        received = Comment.objects.filter(
+            post__owner_id__in=user_ids,
+            post__deleted_at__isnull=True,
+            created_at__gte=since
+        ).exclude(
+            owner_id=F('post__owner_id')
+        ).values('post__owner_id').annotate(count=Count('pk')).order_by()
+        for row in received:
+            stats[row['post__owner_id']]['comments_received'] = row['count']
+
+        categories = Post.categories.through.objects.filter(
+            post__owner_id__in=user_ids,
+            post__deleted_at__isnull=True,
+            post__created_at__gte=since
+        ).values('post__owner_id', 'category_id').annotate(
+            count=Count('post_id')
+        ).order_by('post__owner_id', '-count', 'category_id')
+        for row in categories:
+            top_categories = stats[row['post__owner_id']]['top_categories']
+            if len(top_categories) < settings.USER_STATS_TOP_CATEGORIES:
+                top_categories.append({'id': row['category_id'], 'count': row['count']})
+
+        return stats
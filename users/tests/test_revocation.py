@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status
+
+from users.models import RevokedToken
+from users.revocation import revocation_list
+from users.tokens import AccessToken, RefreshToken
+from utils.bloom import BloomFilter
+from utils.testing import BaseAPITestCase
+
+
+class BloomFilterTestCase(BaseAPITestCase):
+    def test_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for value in range(1000):
+            bloom.add(str(value))
+
+        self.assertTrue(all(str(value) in bloom for value in range(1000)))
+        false_positives = sum(str(value) in bloom for value in range(1000, 11000))
+        self.assertLess(false_positives, 300)
+        self.assertTrue(bloom.full)
+
+
+class TokenRevocationTestCase(BaseAPITestCase):
+    LOGOUT_URL = "/token/logout/"
+    REVOKE_ALL_URL = "/token/revoke-all/"
+    REFRESH_URL = "/token/refresh/"
+    OBTAIN_URL = "/token/"
+
+    def setUp(self):
+        # Revocations of other tests are rolled back in the database only.
+        revocation_list._reset()
+        self.addCleanup(revocation_list._reset)
+
+    def _header(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_logout_revokes_the_refresh_and_access_token(self):
+        refresh = RefreshToken.for_user(self.normal_user)
+        access = refresh.access_token
+        response = self.client.post(
+            self.LOGOUT_URL, data={"refresh": str(refresh)}, headers=self._header(access), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get("/api/v1/users/", headers=self._header(access))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['code'], "token_revoked")
+
+        response = self.client.post(self.REFRESH_URL, data={"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_refresh_token_of_another_user(self):
+        refresh = RefreshToken.for_user(self.super_user)
+        header = self._get_jwt_token(username="normal_user")
+        response = self.client.post(self.LOGOUT_URL, data={"refresh": str(refresh)}, headers=header, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_logout_without_token(self):
+        response = self.client.post(self.LOGOUT_URL, data={"refresh": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_all_revokes_earlier_tokens_only(self):
+        refresh = RefreshToken.for_user(self.normal_user)
+        other = AccessToken.for_user(self.super_user)
+        response = self.client.post(self.REVOKE_ALL_URL, headers=self._header(refresh.access_token))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(self.REFRESH_URL, data={"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/api/v1/users/", headers=self._header(refresh.access_token))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get("/api/v1/users/", headers=self._header(other))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_right_after_revoke_all(self):
+        # Tokens issued in the same second as the revocation are accepted.
+        header = self._get_jwt_token(username="normal_user")
+        response = self.client.post(self.REVOKE_ALL_URL, headers=header)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(
+            self.OBTAIN_URL, data={"username": "normal_user", "password": self.PASSWORD}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tokens = response.json()
+        response = self.client.get("/api/v1/users/", headers=self._header(tokens["access"]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.REFRESH_URL, data={"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get("/api/v1/users/", headers=header)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_valid_token_is_checked_without_queries(self):
+        token = AccessToken.for_user(self.normal_user)
+        revocation_list.revoke(AccessToken.for_user(self.normal_user), self.normal_user)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation_list.is_revoked(token))
+
+    def test_refresh_picks_up_revocations_of_other_workers(self):
+        token = AccessToken.for_user(self.normal_user)
+        self.assertFalse(revocation_list.is_revoked(token))
+
+        RevokedToken.objects.create(
+            jti=token['jti'], user=self.normal_user, expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertFalse(revocation_list.is_revoked(token))
+        revocation_list.refresh(force=True)
+        self.assertTrue(revocation_list.is_revoked(token))
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from categories.models import Category
+from comments.models import Comment
+from posts.models import Post
+
+
+class UserStatsTestCase(APITestCase):
+    BASE_URL = "/api/v1/users/"
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = baker.make(User)
+        self.reader = baker.make(User)
+        self.python, self.django = baker.make(Category, _quantity=2)
+
+        first = baker.make(Post, owner=self.author)
+        first.categories.set([self.python, self.django])
+        second = baker.make(Post, owner=self.author)
+        second.categories.set([self.django])
+        old = baker.make(Post, owner=self.author)
+        old.categories.set([self.python])
+        Post.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=60))
+
+        baker.make(Comment, post=first, owner=self.reader, _quantity=3)
+        baker.make(Comment, post=second, owner=self.author)
+        baker.make(Comment, post=old, owner=self.reader)
+
+        self.client.force_authenticate(self.reader)
+
+    def test_user_stats(self):
+        response = self.client.get(f"{self.BASE_URL}{self.author.pk}/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'user': self.author.pk,
+            'days': 30,
+            'posts': 2,
+            'comments': 1,
+            'comments_received': 4,
+            'top_categories': [
+                {'id': self.django.pk, 'count': 2},
+                {'id': self.python.pk, 'count': 1},
+            ],
+        })
+
+    def test_bulk_stats_use_one_query_per_metric_and_are_cached(self):
+        url = f"{self.BASE_URL}stats/?ids={self.reader.pk},{self.author.pk},0&days=90"
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+
+        data = response.json()
+        self.assertEqual([item['user'] for item in data], [self.reader.pk, self.author.pk])
+        self.assertEqual(data[0]['comments'], 4)
+        self.assertEqual(data[1]['posts'], 3)
+        self.assertEqual(data[1]['comments_received'], 4)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).json(), data)
+
+    def test_bulk_stats_validation(self):
+        self.assertEqual(self.client.get(f"{self.BASE_URL}stats/").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.BASE_URL}stats/?ids=a").status_code, 400)
+
+    def test_stats_require_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(f"{self.BASE_URL}{self.author.pk}/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,41 +1,11 @@
 from rest_framework import status
-from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from utils.testing import BaseAPITestCase
 
 
-class UserViewSetTestCase(APITestCase):
+class UserViewSetTestCase(BaseAPITestCase):
     BASE_URL = "/api/v1/users/"
 
-    def setUp(self) -> None:
-        self.super_user = User.objects.create_superuser(
-            username="test_admin",
-            email="test_admin@gmail.com",
-            password="dummy_password321"
-        )
-        self.normal_user = User.objects.create_user(
-            username="normal_user",
-            email="dummy@gmail.com",
-            password="dummy_password321"
-        )
-
-
-    def tearDown(self):
-        User.objects.all().delete()
-        self.assertEqual(User.objects.count(), 0)
-
-    def _get_jwt_token(self, username, password) -> dict[str, str]:
-        data = {
-            "username": username,
-            "password": password
-        }
-        access_token = self.client.post("/token/", data=data).json().get('access')
-        header = {
-            "Authorization": f"Bearer {access_token}"
-        }
-
-        return header
-        
-
     def test_get_users(self):
         header = self._get_jwt_token(username="test_admin", password="dummy_password321")
         response = self.client.get(self.BASE_URL, headers=header).json()
@@ -0,0 +1,30 @@
+"""
+Tokens carrying the revocation generation of their user in the
+``GENERATION_CLAIM`` claim, see ``users.revocation``. Access tokens derived
+from a refresh token copy its generation.
+"""
+from rest_framework_simplejwt import tokens
+
+from users.models import TokenGeneration
+
+GENERATION_CLAIM = 'gen'
+
+
+def get_generation(user):
+    return TokenGeneration.objects.filter(user=user).values_list('generation', flat=True).first() or 0
+
+
+class GenerationTokenMixin:
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[GENERATION_CLAIM] = get_generation(user)
+        return token
+
+
+class RefreshToken(GenerationTokenMixin, tokens.RefreshToken):
+    pass
+
+
+class AccessToken(GenerationTokenMixin, tokens.AccessToken):
+    pass
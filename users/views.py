@@ -1,18 +1,31 @@
 from django.contrib.auth.models import User
-from users.serializers import UserSerializer
-from rest_framework import viewsets
+from users.serializers import (
+    LogoutSerializer, TokenObtainPairSerializer, TokenRefreshSerializer, UserSerializer
+)
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework_simplejwt import views as jwt_views
 from utils.permissions import IsOwnerOrAdmin
-from users.services import UserService
+from utils.mixins import IdentityMapMixin
+from users.revocation import revocation_list
+from users.services import UserService, UserStatsService
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(IdentityMapMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     service = UserService()
+    stats_service = UserStatsService()
+    stats_default_days = 30
+    stats_max_days = 365
+    stats_max_ids = 100
 
     def get_permissions(self):
-        if self.action in ["retrieve", "list"]:
+        if self.action in ["retrieve", "list", "stats", "stats_list"]:
             permission_classes = [IsAuthenticated]
         elif self.action in ['create', 'destroy']:
             permission_classes = [IsAdminUser]
@@ -27,4 +40,67 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.instance = self.service.create_user(**serializer.validated_data)
 
     def perform_update(self, serializer):
-        self.service.update_user(serializer.instance, **serializer.validated_data)
\ No newline at end of file
+        self.service.update_user(serializer.instance, **serializer.validated_data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        user = self.get_object()
+        return Response(self.stats_service.get_stats([user.pk], self.get_stats_days())[0])
+
+    @action(detail=False, methods=['get'], url_path='stats', url_name='stats-list')
+    def stats_list(self, request):
+        try:
+            ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            raise ValidationError({'ids': "Expected a comma separated list of user ids."})
+        if not ids or len(ids) > self.stats_max_ids:
+            raise ValidationError({'ids': f"Expected between 1 and {self.stats_max_ids} user ids."})
+
+        existing = set(User.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        ids = [user_id for user_id in dict.fromkeys(ids) if user_id in existing]
+        return Response(self.stats_service.get_stats(ids, self.get_stats_days()))
+
+    def get_stats_days(self):
+        try:
+            days = int(self.request.query_params.get('days', self.stats_default_days))
+        except ValueError:
+            raise ValidationError({'days': "Expected a number of days."})
+        return max(1, min(days, self.stats_max_days))
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    serializer_class = TokenObtainPairSerializer
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    serializer_class = TokenRefreshSerializer
+
+
+class LogoutView(generics.GenericAPIView):
+    """
+    Revoke the given refresh token and the access token of the request.
+    Access tokens obtained earlier with the refresh token stay valid until
+    they expire.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = LogoutSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revocation_list.revoke(serializer.validated_data['refresh'], request.user)
+        if request.auth is not None:
+            revocation_list.revoke(request.auth, request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RevokeAllView(APIView):
+    """
+    Revoke every token of the user issued until now, logging out all of
+    their sessions.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revocation_list.revoke_all(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
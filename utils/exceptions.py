@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified by another request.'
+    default_code = 'precondition_failed'
+
+
+class Gone(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The resource is no longer available.'
+    default_code = 'gone'
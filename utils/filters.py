@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class IdsFilterBackend(BaseFilterBackend):
+    """
+    Multi-get for list endpoints: ``?ids=1,2,3`` restricts the list to those
+    primary keys with a single ``IN`` query. At most ``IDS_FILTER_MAX_IDS``
+    ids are accepted; unknown ids are left out of the response.
+    """
+    query_param = 'ids'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.query_param)
+        if value is None or getattr(view, 'detail', False):
+            return queryset
+
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(',') if pk.strip()))
+        except ValueError:
+            raise ValidationError({self.query_param: "Expected a comma separated list of ids."})
+        if not ids or len(ids) > settings.IDS_FILTER_MAX_IDS:
+            raise ValidationError({
+                self.query_param: f"Expected between 1 and {settings.IDS_FILTER_MAX_IDS} ids."
+            })
+        return queryset.filter(pk__in=ids)
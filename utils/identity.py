@@ -0,0 +1,157 @@
+"""
+Request-scoped identity map.
+
+Within a request the same users and categories are looked up by primary key
+several times: by authentication, by ``get_object`` and by related field
+validation. While a map is active (see ``IdentityMapMiddleware``) those
+lookups go through ``get_object``/``load`` and each row of the models in
+``IDENTITY_MAP_MODELS`` is fetched at most once, and the same instance is
+returned to every caller.
+
+The active map is kept in a ``ContextVar``, so concurrent requests in
+threads or asyncio tasks each see their own map.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    def __init__(self, models):
+        self.models = frozenset(models)
+        self.saved_queries = 0
+        self._objects = {}
+
+    def handles(self, model, queryset=None):
+        """
+        Whether lookups of ``model`` through ``queryset`` can be answered
+        from the map. Filtered querysets could exclude a cached row, so
+        they are always sent to the database.
+        """
+        if model._meta.concrete_model not in self.models:
+            return False
+        return queryset is None or not queryset.query.has_filters()
+
+    def key(self, model, pk):
+        return model._meta.concrete_model, model._meta.pk.to_python(pk)
+
+    def add(self, obj):
+        if obj._meta.concrete_model in self.models:
+            self._objects[self.key(type(obj), obj.pk)] = obj
+        return obj
+
+    def get_object(self, queryset, pk):
+        """
+        ``queryset.get(pk=pk)``, unless the row is already in the map.
+        """
+        if not self.handles(queryset.model, queryset):
+            return queryset.get(pk=pk)
+
+        try:
+            obj = self._objects.get(self.key(queryset.model, pk))
+        except ValidationError:
+            # Let the query raise the error callers expect for a bad key.
+            obj = None
+        if obj is not None:
+            self.saved_queries += 1
+            return obj
+        return self.add(queryset.get(pk=pk))
+
+    def load(self, queryset, pks):
+        """
+        Fetch the rows of ``pks`` missing from the map with a single query.
+        Primary keys of the wrong type or without a row are ignored.
+        """
+        if not self.handles(queryset.model, queryset):
+            return
+
+        missing = set()
+        for pk in pks:
+            if isinstance(pk, bool):
+                continue
+            try:
+                key = self.key(queryset.model, pk)
+            except (TypeError, ValueError, ValidationError):
+                continue
+            if key not in self._objects:
+                missing.add(key[1])
+
+        if missing:
+            # The single query replaces one query per row.
+            self.saved_queries -= 1
+            for obj in queryset.filter(pk__in=missing):
+                self.add(obj)
+
+
+def get_identity_map():
+    """
+    :return: The identity map of the current request, or None.
+    :rtype: IdentityMap
+    """
+    return _current.get()
+
+
+def get_object(queryset, pk):
+    identity_map = get_identity_map()
+    if identity_map is None:
+        return queryset.get(pk=pk)
+    return identity_map.get_object(queryset, pk)
+
+
+@contextmanager
+def identity_map():
+    identities = IdentityMap(
+        apps.get_model(label) for label in settings.IDENTITY_MAP_MODELS
+    )
+    token = _current.set(identities)
+    try:
+        yield identities
+    finally:
+        _current.reset(token)
+
+
+class IdentityMapMiddleware:
+    """
+    Activate an identity map for the duration of each request. With
+    ``DEBUG`` the number of queries it saved is logged and sent in the
+    ``X-Identity-Map-Saved-Queries`` header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with identity_map() as identities:
+            response = self.get_response(request)
+        return self.report(request, response, identities)
+
+    async def __acall__(self, request):
+        with identity_map() as identities:
+            response = await self.get_response(request)
+        return self.report(request, response, identities)
+
+    def report(self, request, response, identities):
+        if settings.DEBUG:
+            logger.debug(
+                "%s %s: identity map saved %d queries.",
+                request.method, request.path, identities.saved_queries
+            )
+            response['X-Identity-Map-Saved-Queries'] = str(identities.saved_queries)
+        return response
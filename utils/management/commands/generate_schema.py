@@ -0,0 +1,29 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.schema import generate_schema, get_artifact_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI document to SCHEMA_ARTIFACT_DIR, from where the "
+        "schema views serve it. Run on every deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help="Base URL of the API to put in the document, e.g. https://api.example.com."
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.SCHEMA_ARTIFACT_DIR, exist_ok=True)
+        for format, content in generate_schema(url=options['url']).items():
+            path = get_artifact_path(format)
+            # Replaced atomically so workers never read a partial file.
+            with open(f"{path}.tmp", 'wb') as artifact:
+                artifact.write(content)
+            os.replace(f"{path}.tmp", path)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}."))
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_CODE = """
+import {module}
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+IMPORT_CODE_WITHOUT_URLS = """
+import {module}
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Report per-module import time of the WSGI or ASGI application, "
+        "measured with python -X importtime in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            default='api.wsgi',
+            help="Module to import, e.g. api.wsgi or api.asgi."
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help="Number of modules to report."
+        )
+        parser.add_argument(
+            '--sort',
+            choices=('cumulative', 'self'),
+            default='cumulative',
+            help="Order modules by cumulative time or by their own time."
+        )
+        parser.add_argument(
+            '--no-urls',
+            action='store_true',
+            help="Do not load the URLconf, which workers otherwise do on their first request."
+        )
+
+    def handle(self, *args, **options):
+        template = IMPORT_CODE_WITHOUT_URLS if options['no_urls'] else IMPORT_CODE
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'api.settings'
+        ))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', template.format(module=options['module'])],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode:
+            raise CommandError(f"Importing {options['module']} failed:\n{result.stderr}")
+
+        timings = parse_importtime(result.stderr)
+        total = sum(self_us for _, self_us, _ in timings)
+        key = 1 if options['sort'] == 'self' else 2
+        timings.sort(key=lambda timing: timing[key], reverse=True)
+
+        self.stdout.write(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for module, self_us, cumulative_us in timings[:options['limit']]:
+            self.stdout.write(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+        self.stdout.write(f"Imported {len(timings)} modules in {total / 1000:.1f} ms.")
+
+
+def parse_importtime(output):
+    """
+    Parse ``-X importtime`` output into ``(module, self_us, cumulative_us)``
+    tuples.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            # The header line.
+            continue
+        timings.append((module.strip(), int(self_us), int(cumulative_us)))
+    return timings
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils.partitions import (
+    add_months,
+    create_future_partitions,
+    detach_partitions_before,
+    get_partitions,
+    is_partitioned,
+    month_start,
+    partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of the coming months and detach the "
+        "partitions older than the retention period. Detached partitions "
+        "are kept as standalone tables to be archived and dropped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.PARTITION_MONTHS_AHEAD,
+            help="Number of months after the current one to create partitions for."
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=settings.PARTITION_RETENTION_MONTHS,
+            help="Detach partitions older than this many months. Nothing is detached when omitted."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report the partitions that would be created and detached."
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        for table in settings.PARTITIONED_TABLES:
+            if not is_partitioned(table):
+                self.stderr.write(f"{table} is not partitioned, skipping.")
+                continue
+
+            if options['dry_run']:
+                self.dry_run(table, now, options)
+                continue
+
+            for name in create_future_partitions(table, now, options['months_ahead']):
+                self.stdout.write(self.style.SUCCESS(f"Created {name}."))
+
+            if options['retention_months'] is not None:
+                cutoff = add_months(month_start(now), -options['retention_months'])
+                for name in detach_partitions_before(table, cutoff):
+                    self.stdout.write(self.style.SUCCESS(f"Detached {name}."))
+
+    def dry_run(self, table, now, options):
+        existing = get_partitions(table)
+        first = month_start(now)
+        for offset in range(options['months_ahead'] + 1):
+            month = add_months(first, offset)
+            if month not in existing:
+                self.stdout.write(f"{partition_name(table, month)} would be created.")
+
+        if options['retention_months'] is not None:
+            cutoff = add_months(first, -options['retention_months'])
+            for month, name in sorted(existing.items()):
+                if month < cutoff:
+                    self.stdout.write(f"{name} would be detached.")
@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from comments.models import Comment
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Hard delete soft-deleted posts and comments in bounded batches. "
+        "Comments of purged posts are removed first so that no single "
+        "statement cascades over an unbounded number of rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=7,
+            help="Only purge rows soft-deleted at least this many days ago."
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Maximum number of rows deleted per statement."
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help="Seconds to pause between batches."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many rows would be purged."
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            options['batch_size'] = 1
+
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        targets = [
+            (
+                Comment,
+                # Comments are created before they or their post are
+                # deleted; the created_at bound skips the newer partitions.
+                Comment.all_objects.filter(
+                    Q(deleted_at__lt=cutoff) | Q(post__deleted_at__lt=cutoff),
+                    created_at__lt=cutoff
+                )
+            ),
+            (Post, Post.all_objects.filter(deleted_at__lt=cutoff)),
+        ]
+
+        for model, queryset in targets:
+            label = model._meta.verbose_name_plural
+            if options['dry_run']:
+                self.stdout.write(f"{queryset.count()} {label} would be purged.")
+                continue
+
+            purged = self.purge(queryset, options['batch_size'], options['sleep'])
+            self.stdout.write(self.style.SUCCESS(f"Purged {purged} {label}."))
+
+    def purge(self, queryset, batch_size, sleep):
+        model = queryset.model
+        purged = 0
+        while True:
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return purged
+
+            with transaction.atomic():
+                model.all_objects.filter(pk__in=pks).hard_delete()
+            purged += len(pks)
+
+            if sleep:
+                time.sleep(sleep)
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from users.tokens import AccessToken
+from utils.querylog import slow_query_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Request API paths in-process with the slow-query sampler recording "
+        "every query over the threshold, and print them with their plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Paths to request, e.g. /api/v1/posts/.")
+        # Requests run against the real database, so only methods that do
+        # not write are allowed.
+        parser.add_argument(
+            '--method',
+            type=str.upper,
+            choices=['GET', 'HEAD', 'OPTIONS'],
+            default='GET',
+            help="HTTP method of the requests."
+        )
+        parser.add_argument(
+            '--user',
+            help="Username to authenticate the requests as."
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0,
+            help="Only report queries taking at least this many milliseconds."
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help="Number of times each path is requested."
+        )
+        parser.add_argument(
+            '--no-plan',
+            action='store_true',
+            help="Do not print query plans."
+        )
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist.")
+            headers['HTTP_AUTHORIZATION'] = f"Bearer {AccessToken.for_user(user)}"
+
+        slow_query_log.clear()
+        with override_settings(
+            SLOW_QUERY_SAMPLE_RATE=1,
+            SLOW_QUERY_THRESHOLD_MS=options['threshold'],
+            ALLOWED_HOSTS=['*']
+        ):
+            client = Client()
+            for path in options['paths']:
+                for _ in range(max(1, options['repeat'])):
+                    response = client.generic(options['method'], path, **headers)
+                    self.stdout.write(f"{options['method']} {path}: {response.status_code}")
+
+        entries = sorted(slow_query_log.entries(), key=lambda entry: entry['duration_ms'], reverse=True)
+        for entry in entries:
+            self.stdout.write(f"\n{entry['duration_ms']:.1f} ms  {entry['view']}\n{entry['sql']}")
+            if entry['plan'] and not options['no_plan']:
+                self.stdout.write('\n'.join(f"    {line}" for line in entry['plan'].splitlines()))
+        self.stdout.write(f"\n{len(entries)} queries recorded.")
@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'image/svg+xml',
+    'text/',
+)
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an ``Accept-Encoding`` header into a ``{coding: qvalue}`` dict.
+    """
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def etag_for_coding(etag, coding):
+    """
+    Return the strong ``etag`` of an uncompressed body with a ``-<coding>``
+    suffix, the ETag of the same body compressed with ``coding``.
+    """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def strip_etag_coding(opaque):
+    """
+    Remove the ``-<coding>`` suffix added by ``etag_for_coding`` from the
+    unquoted ``opaque`` part of an ETag.
+    """
+    for coding in ('br', 'gzip'):
+        suffix = f'-{coding}'
+        if opaque.endswith(suffix):
+            return opaque[:-len(suffix)]
+    return opaque
+
+
+class CompressedBodyCache:
+    """
+    Thread-safe LRU of compressed bodies keyed by coding and a digest of the
+    uncompressed body, bounded by the total size of the stored bodies.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, coding, content):
+        return coding, hashlib.sha256(content).digest()
+
+    def get(self, key):
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+            return compressed
+
+    def set(self, key, compressed):
+        if len(compressed) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+
+            self._entries[key] = compressed
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with brotli (when the ``brotli`` package is
+    installed) or gzip, following the client's ``Accept-Encoding``
+    preferences.
+
+    Only non-streaming responses of a compressible content type and at
+    least ``COMPRESSION_MIN_SIZE`` bytes are compressed, so small JSON
+    bodies and streamed responses are left alone. Compressed bodies are kept
+    in a process-wide LRU keyed by a digest of the uncompressed body, so a
+    body that is served repeatedly is compressed once.
+
+    The negotiated coding is kept on the request as ``compression_coding``;
+    the request's own ``Accept-Encoding`` header is left as sent.
+
+    A strong ``ETag`` stays strong on a compressed response but gains a
+    ``-<coding>`` suffix, since the compressed bytes differ from the
+    uncompressed ones. ``If-None-Match`` is checked against the suffixed tag,
+    and ``strip_etag_coding`` recovers the original one.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.gzip_level = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        self.cache = CompressedBodyCache(
+            getattr(settings, 'COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+        )
+        self.codings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def process_request(self, request):
+        request.compression_coding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        coding = getattr(request, 'compression_coding', 'identity')
+        if coding == 'identity':
+            return response
+
+        # Bodies below the threshold are neither hashed nor compressed.
+        content = response.content
+        if len(content) < self.min_size:
+            return response
+
+        key = self.cache.key(coding, content)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.compress(coding, content)
+            self.cache.set(key, compressed)
+
+        if len(compressed) >= len(content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = etag_for_coding(etag, coding)
+            if request.method in ('GET', 'HEAD') and response.status_code == 200:
+                return get_conditional_response(request, etag=response['ETag'], response=response)
+        return response
+
+    def negotiate(self, header):
+        if not header:
+            return 'identity'
+
+        accepted = parse_accept_encoding(header)
+        best, best_quality = 'identity', 0.0
+        for coding in self.codings:
+            quality = accepted.get(coding, accepted.get('*', 0.0))
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def compress(self, coding, content):
+        if coding == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies.
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
@@ -1,5 +1,18 @@
 __author__ = "Ufuk Orhan"
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+from utils.exceptions import PreconditionFailed
+from utils.identity import get_identity_map
+from utils.middleware import strip_etag_coding
+from utils.values import get_values_builder
+
+
 def check_viewset_methods(viewset_class, http_methods): # NoQA
     """
     Check if the provided ClassViewSet has the required methods for the
@@ -91,4 +104,125 @@ def required_test_methods(
 
         return cls
 
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+class OptimisticConcurrencyMixin:
+    """
+    ModelViewSet mixin for models deriving from ``VersionedModel``.
+
+    Responses carry the row version as an ``ETag`` and updates are written
+    with a single ``UPDATE ... WHERE id = %s AND version = %s``. Clients may
+    send ``If-Match`` with previously seen ETags; the update goes ahead when
+    any of them names the current version, compared strongly, so weak tags
+    never match. Without the header the version loaded by ``get_object`` is
+    used. A lost race answers 412 instead of
+    silently overwriting the other writer, and no row lock is held between
+    reading and writing.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        return self._set_etag(response)
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        return self._set_etag(response)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        expected_version = self.get_expected_version(instance)
+
+        fields = dict(serializer.validated_data)
+        related = {
+            name: fields.pop(name) for name in list(fields)
+            if instance._meta.get_field(name).many_to_many
+        }
+
+        with transaction.atomic():
+            if not instance.update_if_version(expected_version, **fields):
+                raise PreconditionFailed()
+            for name, value in related.items():
+                getattr(instance, name).set(value)
+
+    def get_expected_version(self, instance):
+        if_match = self.request.headers.get('If-Match')
+        if not if_match or if_match.strip() == '*':
+            return instance.version
+
+        for tag in parse_etags(if_match):
+            if tag.startswith('W/'):
+                continue
+            try:
+                version = int(strip_etag_coding(tag.strip('"')))
+            except ValueError:
+                continue
+            if version == instance.version:
+                return version
+        raise PreconditionFailed()
+
+    def _set_etag(self, response):
+        version = getattr(response, 'data', {}).get('version')
+        if version is not None:
+            response['ETag'] = f'"{version}"'
+        return response
+
+
+class ValuesListMixin:
+    """
+    ModelViewSet mixin serving ``list`` from ``QuerySet.values()`` rows
+    through ``ValuesRowBuilder`` instead of the serializer. The output is
+    the same as the serializer's. It is only used while the
+    ``VALUES_FAST_PATH`` setting is enabled.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'VALUES_FAST_PATH', False):
+            return super().list(request, *args, **kwargs)
+
+        builder = get_values_builder(self.get_serializer_class())
+        queryset = builder.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(builder.to_representation(page))
+
+        return Response(builder.to_representation(queryset))
+
+    def get_list_data(self, queryset):
+        """
+        Representation of ``queryset`` for custom list actions, built the
+        same way as ``list``.
+        """
+        if not getattr(settings, 'VALUES_FAST_PATH', False):
+            return self.get_serializer(queryset, many=True).data
+
+        builder = get_values_builder(self.get_serializer_class())
+        return builder.to_representation(builder.values(queryset))
+
+
+class IdentityMapMixin:
+    """
+    ModelViewSet mixin resolving ``get_object`` through the request's
+    identity map, so an object already loaded in the request, e.g. the
+    authenticated user, is not fetched again.
+    """
+
+    def get_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        identity_map = get_identity_map()
+        if (
+            identity_map is None
+            or self.lookup_field not in ('pk', queryset.model._meta.pk.name)
+            or not identity_map.handles(queryset.model, queryset)
+        ):
+            return super().get_object()
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = identity_map.get_object(queryset, self.kwargs[lookup_url_kwarg])
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404()
+
+        self.check_object_permissions(self.request, obj)
+        return obj
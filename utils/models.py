@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
@@ -7,3 +9,92 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        Mark the rows as deleted with a single UPDATE instead of cascading.
+        """
+        now = timezone.now()
+        return self.update(deleted_at=now, updated_at=now)
+
+    def hard_delete(self):
+        return super().delete()
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(BaseModel):
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        Mark the row as deleted. ``post_save`` is sent with the updated
+        fields, as the row is updated rather than deleted.
+        """
+        using = using or self._state.db
+        now = timezone.now()
+        type(self).all_objects.using(using).filter(pk=self.pk).update(
+            deleted_at=now,
+            updated_at=now
+        )
+        self.deleted_at = now
+        self.updated_at = now
+        post_save.send(
+            sender=type(self), instance=self, created=False, raw=False,
+            using=using, update_fields=frozenset(['deleted_at', 'updated_at'])
+        )
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
+
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def update_if_version(self, expected_version, **fields):
+        """
+        Write the given fields with a single conditional UPDATE that only
+        matches while the row is still at ``expected_version``. ``post_save``
+        is sent with the updated fields on success.
+
+        :return: True if the row was updated, False on a version conflict.
+        :rtype: bool
+        """
+        now = timezone.now()
+        for field in self._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                fields[field.attname] = now
+
+        updated = type(self)._base_manager.filter(
+            pk=self.pk,
+            version=expected_version
+        ).update(version=models.F('version') + 1, **fields)
+        if not updated:
+            return False
+
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.version = expected_version + 1
+        post_save.send(
+            sender=type(self), instance=self, created=False, raw=False,
+            using=self._state.db, update_fields=frozenset([*fields, 'version'])
+        )
+        return True
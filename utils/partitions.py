@@ -0,0 +1,274 @@
+"""
+Monthly range partitioning of tables on ``BaseModel.created_at``.
+
+A partitioned table has one partition per calendar month (UTC), named
+``<table>_pYYYY_MM``, and a ``<table>_default`` partition that catches rows
+outside of the created months. Its primary key is ``(id, created_at)``
+because Postgres requires the partition key in every unique constraint; ``id``
+stays unique as it is drawn from a single sequence.
+
+Queries that filter on ``created_at`` only scan the matching partitions, and
+indexes and vacuum work per partition, so their cost follows the size of the
+recent months instead of the whole history.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection as default_connection, transaction
+
+PARTITION_KEY = 'created_at'
+
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def is_partitioned(table, connection=default_connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table
+            WHERE partrelid = to_regclass(%s)
+            """,
+            [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions(table, connection=default_connection):
+    """
+    :return: The monthly partitions of ``table`` as ``{month: name}``.
+    :rtype: dict
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [table]
+        )
+        names = [name for name, in cursor.fetchall()]
+
+    partitions = {}
+    prefix = f"{table}_p"
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        try:
+            month = datetime.strptime(name[len(prefix):], '%Y_%m')
+        except ValueError:
+            continue
+        partitions[month.replace(tzinfo=dt_timezone.utc)] = name
+    return partitions
+
+
+def create_partition(table, month, connection=default_connection):
+    """
+    Create and attach the partition of ``table`` for ``month``. Rows of that
+    month that were written to the default partition are moved into it
+    first, as Postgres refuses to attach a range the default partition still
+    has rows for.
+
+    :return: True if the partition was created, False if it existed.
+    :rtype: bool
+    """
+    month = month_start(month)
+    if month in get_partitions(table, connection):
+        return False
+
+    quote = connection.ops.quote_name
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = month, add_months(month, 1)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {quote(name)} "
+            f"(LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {quote(default)}
+                WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s
+                RETURNING *
+            )
+            INSERT INTO {quote(name)} SELECT * FROM moved
+            """,
+            [start, end]
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [start, end]
+        )
+    return True
+
+
+def create_future_partitions(table, now, months_ahead, connection=default_connection):
+    """
+    Make sure ``table`` has partitions from the month of ``now`` up to
+    ``months_ahead`` months later.
+
+    :return: The names of the created partitions.
+    :rtype: list
+    """
+    created = []
+    first = month_start(now)
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if create_partition(table, month, connection):
+            created.append(partition_name(table, month))
+    return created
+
+
+def detach_partition(table, name, connection=default_connection):
+    """
+    Detach the partition ``name`` of ``table``. The partition is kept as a
+    standalone archive table, without its foreign keys so that archived rows
+    do not block deleting the rows they reference.
+    """
+    quote = connection.ops.quote_name
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+        cursor.execute(
+            """
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [name]
+        )
+        for constraint, in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {quote(name)} DROP CONSTRAINT {quote(constraint)}")
+
+
+def detach_partitions_before(table, before, connection=default_connection):
+    """
+    Detach the partitions of ``table`` for the months before the month of
+    ``before``.
+
+    :return: The names of the detached partitions.
+    :rtype: list
+    """
+    cutoff = month_start(before)
+    detached = []
+    for month, name in sorted(get_partitions(table, connection).items()):
+        if month < cutoff:
+            detach_partition(table, name, connection)
+            detached.append(name)
+    return detached
+
+
+def convert_table(table, partitioned, now, months_ahead=3, connection=default_connection):
+    """
+    Rebuild ``table`` as a table partitioned by month on ``created_at``, or
+    back as a plain table. Rows, the id sequence, indexes and foreign keys
+    are carried over under the same names. Meant to run in a migration.
+    """
+    if is_partitioned(table, connection) == partitioned:
+        return
+
+    quote = connection.ops.quote_name
+    old = f"{table}_old"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conname FROM pg_constraint
+            WHERE confrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [table]
+        )
+        referencing = [name for name, in cursor.fetchall()]
+        if referencing:
+            raise ValueError(
+                f"{table} cannot be rebuilt while foreign keys reference it: "
+                f"{', '.join(referencing)}."
+            )
+
+        cursor.execute(
+            """
+            SELECT indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = %s
+                AND indexname <> %s
+            """,
+            [table, f"{table}_pkey"]
+        )
+        # Indexes of a partitioned table are defined ON ONLY the parent.
+        indexes = [definition.replace(' ON ONLY ', ' ON ') for definition, in cursor.fetchall()]
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [table]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT min({PARTITION_KEY}) FROM {quote(table)}")
+        oldest = cursor.fetchone()[0] or now
+
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(old)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(old)} INCLUDING DEFAULTS INCLUDING IDENTITY)"
+            + (f" PARTITION BY RANGE ({PARTITION_KEY})" if partitioned else "")
+        )
+        if partitioned:
+            default = default_partition_name(table)
+            cursor.execute(f"CREATE TABLE {quote(default)} PARTITION OF {quote(table)} DEFAULT")
+            month, last = month_start(min(oldest, now)), add_months(month_start(now), months_ahead)
+            while month <= last:
+                cursor.execute(
+                    f"CREATE TABLE {quote(partition_name(table, month))} PARTITION OF {quote(table)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)]
+                )
+                month = add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {quote(table)} OVERRIDING SYSTEM VALUE SELECT * FROM {quote(old)}")
+        cursor.execute(
+            f"""
+            SELECT setval(
+                pg_get_serial_sequence(%s, 'id'),
+                coalesce(max(id), 1),
+                max(id) IS NOT NULL
+            ) FROM {quote(table)}
+            """,
+            [table]
+        )
+        cursor.execute(f"DROP TABLE {quote(old)} CASCADE")
+        # The new identity sequence was created while the old one existed.
+        cursor.execute(
+            """
+            SELECT seq.relname FROM pg_class seq
+            WHERE seq.oid = pg_get_serial_sequence(%s, 'id')::regclass
+            """,
+            [table]
+        )
+        sequence = cursor.fetchone()[0]
+        if sequence != f"{table}_id_seq":
+            cursor.execute(f"ALTER SEQUENCE {quote(sequence)} RENAME TO {quote(table + '_id_seq')}")
+
+        primary_key = f"id, {PARTITION_KEY}" if partitioned else "id"
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_pkey')} "
+            f"PRIMARY KEY ({primary_key})"
+        )
+        for definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
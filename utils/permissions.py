@@ -5,7 +5,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return obj.owner == request.user
+        return obj.owner_id == request.user.pk
 
     
 class IsOwnerOrAdmin(permissions.BasePermission):
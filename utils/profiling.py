@@ -0,0 +1,224 @@
+"""
+Sampling profiler for live requests.
+
+``ProfilingMiddleware`` profiles a request when it is sent by a staff user
+with the ``PROFILE_HEADER`` header, e.g. ``X-Profile: 1``, or with a
+probability of ``PROFILE_SAMPLE_RATE``. While a request is profiled, a
+daemon thread records the stack of the thread serving it every
+``PROFILE_INTERVAL_MS`` milliseconds. Stacks are aggregated per route
+(``"<method> <view name>"``) in ``profile_store``, the profiles of this
+process, as collapsed stacks::
+
+    django.core.handlers.base:BaseHandler._get_response;posts.views:PostViewSet.list 12
+
+which flame graph tools such as ``flamegraph.pl`` or speedscope read as is.
+The store keeps ``PROFILE_MAX_ROUTES`` routes and ``PROFILE_MAX_STACKS``
+distinct stacks per route.
+
+Requests that are not profiled pay one header lookup. Without a header and
+with a sample rate of 0 the middleware is not installed at all, and the
+sampling thread only runs while a request is being profiled.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.exceptions import AuthenticationFailed
+
+from users.authentication import JWTAuthentication
+
+TRUNCATED = '[truncated]'
+
+
+def get_frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame, root):
+    """
+    :return: The stack from ``root``, exclusive, down to ``frame`` as
+        ``"outer;...;inner"``, or None if ``frame`` is not called from
+        ``root``.
+    :rtype: str
+    """
+    names = []
+    while frame is not None and frame is not root:
+        names.append(get_frame_name(frame))
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return ';'.join(reversed(names))
+
+
+class ProfileStore:
+    """
+    Thread-safe store of the collapsed stacks sampled per route.
+    """
+
+    def __init__(self, max_routes, max_stacks):
+        self.max_routes = max_routes
+        self.max_stacks = max_stacks
+        self._routes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, route, stacks):
+        with self._lock:
+            profile = self._routes.pop(route, None)
+            if profile is None:
+                profile = {'requests': 0, 'samples': 0, 'stacks': Counter()}
+            self._routes[route] = profile
+            while len(self._routes) > self.max_routes:
+                self._routes.popitem(last=False)
+
+            profile['requests'] += 1
+            for stack, count in stacks.items():
+                profile['samples'] += count
+                if stack not in profile['stacks'] and len(profile['stacks']) >= self.max_stacks:
+                    stack = TRUNCATED
+                profile['stacks'][stack] += count
+
+    def routes(self):
+        """
+        :return: The profiled routes with their request and sample counts,
+            most recently profiled first.
+        :rtype: list of dict
+        """
+        with self._lock:
+            return [
+                {'route': route, 'requests': profile['requests'], 'samples': profile['samples']}
+                for route, profile in reversed(self._routes.items())
+            ]
+
+    def collapsed(self, route):
+        """
+        :return: The stacks of ``route`` in collapsed format, one
+            ``"<stack> <count>"`` line per stack, or None if the route was not
+            profiled.
+        :rtype: str
+        """
+        with self._lock:
+            profile = self._routes.get(route)
+            if profile is None:
+                return None
+            return ''.join(f"{stack} {count}\n" for stack, count in profile['stacks'].most_common())
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+
+class StackSampler:
+    """
+    Samples the stacks of the threads that are being profiled from a daemon
+    thread, which is started on first use and idles while no thread is
+    profiled.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._reset()
+
+    def start(self, root):
+        """
+        Start sampling the current thread below the frame ``root``.
+
+        :return: The counter the samples are added to.
+        :rtype: collections.Counter
+        """
+        samples = Counter()
+        with self._lock:
+            self._profiled[threading.get_ident()] = (root, samples)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+            self._active.set()
+        return samples
+
+    def stop(self):
+        with self._lock:
+            self._profiled.pop(threading.get_ident(), None)
+            if not self._profiled:
+                self._active.clear()
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        # Holding the lock keeps stop() from returning while the samples of
+        # its thread are being counted.
+        with self._lock:
+            frames = sys._current_frames()
+            for thread_id, (root, samples) in self._profiled.items():
+                frame = frames.get(thread_id)
+                stack = collapse_stack(frame, root) if frame is not None else None
+                if stack:
+                    samples[stack] += 1
+
+    def _reset(self):
+        # The sampling thread does not survive a fork; the next start starts
+        # a new one.
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._profiled = {}
+        self._thread = None
+
+
+profile_store = ProfileStore(settings.PROFILE_MAX_ROUTES, settings.PROFILE_MAX_STACKS)
+stack_sampler = StackSampler(settings.PROFILE_INTERVAL_MS / 1000)
+os.register_at_fork(after_in_child=stack_sampler._reset)
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests of staff users sending ``PROFILE_HEADER`` and a
+    ``PROFILE_SAMPLE_RATE`` sample of all requests with ``stack_sampler``.
+    Not used while neither is enabled.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILE_HEADER and not settings.PROFILE_SAMPLE_RATE:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.header = None
+        if settings.PROFILE_HEADER:
+            self.header = 'HTTP_' + settings.PROFILE_HEADER.upper().replace('-', '_')
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        samples = stack_sampler.start(sys._getframe())
+        try:
+            response = self.get_response(request)
+        finally:
+            stack_sampler.stop()
+
+        match = getattr(request, 'resolver_match', None)
+        route = f"{request.method} {match.view_name if match is not None else request.path}"
+        profile_store.add(route, samples)
+        response['X-Profile-Samples'] = str(sum(samples.values()))
+        return response
+
+    def should_profile(self, request):
+        if self.header is not None and request.META.get(self.header):
+            return self.is_staff(request)
+        return bool(self.sample_rate) and random.random() < self.sample_rate
+
+    def is_staff(self, request):
+        # Only requests asking to be profiled are authenticated here; the
+        # view authenticates every request again as usual.
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
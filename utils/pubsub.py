@@ -0,0 +1,223 @@
+"""
+Publish/subscribe for streaming endpoints.
+
+``Hub`` fans messages out to the asyncio subscribers of one process. Each
+subscription has a bounded queue: a subscriber that falls more than
+``max_queue`` messages behind is dropped instead of buffering without limit,
+and is expected to reconnect and catch up from the database.
+
+Backends carry small notifications between processes, e.g. the id of a new
+row; each process then turns a notification into the message for its own
+subscribers, with one query no matter how many of them are connected.
+
+- ``LocalBackend`` delivers notifications to the current process only, once
+  the publishing transaction commits.
+- ``PostgresBackend`` uses ``NOTIFY``, so every process listening on the
+  channel is notified when the publishing transaction commits.
+"""
+import asyncio
+import logging
+import os
+import select
+import threading
+
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, hub, channel, max_queue):
+        self.hub = hub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_queue)
+        self.overflowed = False
+
+    def push(self, message):
+        """
+        Queue ``message``; called on the subscriber's event loop.
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout=None):
+        """
+        :return: The next message, or None once the subscriber has fallen
+            too far behind.
+
+        :raises asyncio.TimeoutError: If no message arrived in ``timeout``
+            seconds.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Hub:
+    """
+    Thread-safe registry of the subscriptions of one process by channel.
+    """
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, max_queue):
+        subscription = Subscription(self, channel, max_queue)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def has_subscribers(self, channel):
+        return channel in self._subscriptions
+
+    def count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def publish(self, channel, message):
+        """
+        Hand ``message`` to every subscriber of ``channel``. Can be called
+        from any thread.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, message)
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self.unsubscribe(subscription)
+
+    def _reset(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+
+class LocalBackend:
+    def __init__(self):
+        self._callbacks = {}
+
+    def publish(self, channel, payload, using=None):
+        callbacks = list(self._callbacks.get(channel, ()))
+        if callbacks:
+            transaction.on_commit(lambda: self._notify(callbacks, payload), using=using)
+
+    def listen(self, channel, callback):
+        """
+        Call ``callback(payload)`` for every notification on ``channel``.
+        Listening again with the same callback is a no-op.
+        """
+        callbacks = self._callbacks.setdefault(channel, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def _notify(self, callbacks, payload):
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Notification callback failed.")
+
+
+class PostgresBackend(LocalBackend):
+    """
+    ``NOTIFY``/``LISTEN`` on the default database. Payloads are limited to
+    8000 bytes by Postgres. Notifications are received by a daemon thread
+    with its own connection, started by the first ``listen``; callbacks run
+    in that thread.
+    """
+    poll_interval = 5
+    reconnect_delay = 1
+
+    def __init__(self, using='default'):
+        super().__init__()
+        self.using = using
+        self._thread = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def publish(self, channel, payload, using=None):
+        with connections[using or self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [channel, payload])
+
+    def listen(self, channel, callback):
+        with self._lock:
+            super().listen(channel, callback)
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name='pubsub-listener', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Listening for notifications failed, reconnecting.")
+                self._stopped.wait(self.reconnect_delay)
+
+    def _listen(self):
+        wrapper = connections[self.using]
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            connection.autocommit = True
+            listening = set()
+            while not self._stopped.is_set():
+                channels = set(self._callbacks)
+                with connection.cursor() as cursor:
+                    for channel in channels - listening:
+                        cursor.execute(f"LISTEN {wrapper.ops.quote_name(channel)}")
+                listening = channels
+
+                if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                connection.poll()
+                # Callbacks may use the ORM from this thread.
+                close_old_connections()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    self._notify(self._callbacks.get(notify.channel, ()), notify.payload)
+        finally:
+            connection.close()
+
+    def _reset(self):
+        # The listener thread does not survive a fork; the next listen
+        # starts a new one.
+        self._thread = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+
+hub = Hub()
+os.register_at_fork(after_in_child=hub._reset)
@@ -0,0 +1,176 @@
+"""
+Sampling slow-query log.
+
+``SlowQueryMiddleware`` installs ``SlowQuerySampler`` as an execute wrapper
+on every database connection for the duration of each request. Each query
+is timed; ``SLOW_QUERY_SAMPLE_RATE`` of the queries that take at least
+``SLOW_QUERY_THRESHOLD_MS`` are recorded in ``slow_query_log``, a ring
+buffer of the last ``SLOW_QUERY_LOG_SIZE`` entries of this process, with
+their normalized SQL, the view that ran them and their plan.
+
+Plans come from ``EXPLAIN (ANALYZE, BUFFERS)`` for ``SELECT`` statements,
+which runs the query a second time in a savepoint, and from a plain
+``EXPLAIN`` for everything else, so writes are never repeated. With a sample
+rate of 0 the middleware is not installed at all.
+"""
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+_current_request = ContextVar('slow_query_request', default=None)
+
+WHITESPACE_RE = re.compile(r'\s+')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_RE = re.compile(r'%s|%\(\w+\)s')
+LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+ROWS_RE = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+# Statements whose second run would have side effects.
+SIDE_EFFECT_RE = re.compile(r'\b(?:nextval|setval|pg_notify|pg_advisory\w*|FOR\s+UPDATE)\b', re.I)
+
+
+def normalize_sql(sql):
+    """
+    ``sql`` with literals and placeholders replaced by ``?`` and lists of
+    them collapsed, so that the same statement with different parameters
+    normalizes to the same text.
+    """
+    sql = WHITESPACE_RE.sub(' ', sql).strip()
+    sql = STRING_RE.sub('?', sql)
+    sql = PLACEHOLDER_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = LIST_RE.sub('(...)', sql)
+    return ROWS_RE.sub('(...)', sql)
+
+
+class SlowQueryLog:
+    """
+    Thread-safe ring buffer of slow query entries.
+    """
+
+    def __init__(self, size):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self):
+        """
+        :return: The recorded entries, newest first.
+        :rtype: list of dict
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SlowQuerySampler:
+    """
+    Execute wrapper recording a sample of the slow queries into ``log``.
+    """
+
+    def __init__(self, log, threshold_ms, sample_rate, explain_analyze=True):
+        self.log = log
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain_analyze = explain_analyze
+        self._local = threading.local()
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(self._local, 'explaining', False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+
+        if duration >= self.threshold and random.random() < self.sample_rate:
+            self.record(sql, params, many, context, duration)
+        return result
+
+    def record(self, sql, params, many, context, duration):
+        request = _current_request.get()
+        view = None
+        if request is not None:
+            match = getattr(request, 'resolver_match', None)
+            view = match.view_name if match is not None else request.path
+
+        connection = context['connection']
+        self.log.add({
+            'sql': normalize_sql(sql),
+            'duration_ms': round(duration * 1000, 3),
+            'database': connection.alias,
+            'view': view,
+            'method': request.method if request is not None else None,
+            'plan': None if many else self.explain(connection, sql, params),
+            'recorded_at': timezone.now(),
+        })
+
+    def explain(self, connection, sql, params):
+        if connection.vendor != 'postgresql':
+            return None
+
+        statement = sql.lstrip()
+        analyze = (
+            self.explain_analyze
+            and statement[:6].upper() == 'SELECT'
+            and not SIDE_EFFECT_RE.search(statement)
+        )
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+
+        self._local.explaining = True
+        try:
+            # A savepoint keeps a failing EXPLAIN from aborting the
+            # request's transaction.
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(prefix + statement, params)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+        except DatabaseError as error:
+            return f"EXPLAIN failed: {error}"
+        finally:
+            self._local.explaining = False
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+class SlowQueryMiddleware:
+    """
+    Time the queries of each request with ``SlowQuerySampler``. Not used
+    while ``SLOW_QUERY_SAMPLE_RATE`` is 0.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_SAMPLE_RATE:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sampler = SlowQuerySampler(
+            slow_query_log,
+            threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+            sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+            explain_analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+        )
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.sampler))
+                return self.get_response(request)
+        finally:
+            _current_request.reset(token)
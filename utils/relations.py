@@ -0,0 +1,50 @@
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework.relations import (
+    MANY_RELATION_KWARGS,
+    ManyRelatedField,
+    PrimaryKeyRelatedField,
+)
+
+from utils.identity import get_identity_map, get_object
+
+
+class IdentityMapManyRelatedField(ManyRelatedField):
+    def to_internal_value(self, data):
+        identity_map = get_identity_map()
+        child = self.child_relation
+        if (
+            identity_map is not None
+            and child.pk_field is None
+            and not isinstance(data, str)
+            and hasattr(data, '__iter__')
+        ):
+            identity_map.load(child.get_queryset(), data)
+        return super().to_internal_value(data)
+
+
+class IdentityMapPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    """
+    ``PrimaryKeyRelatedField`` that resolves primary keys through the
+    request's identity map, with one query for all the keys of a
+    ``many=True`` field.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return IdentityMapManyRelatedField(**list_kwargs)
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return get_object(self.get_queryset(), data)
+        except ObjectDoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
@@ -0,0 +1,83 @@
+import math
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Output that may hold a float orjson wrote differently from json.dumps:
+# null for NaN and infinities, an exponent without "+" or zero padding, or a
+# plain decimal where json.dumps switches to an exponent below 1e-4.
+_FLOAT_SUSPECT = re.compile(rb'null|\de|0\.0000')
+
+
+def _floats_render_like_stock(data):
+    """
+    Return whether every float in ``data`` is finite and within the range
+    where orjson and ``json.dumps`` format it identically.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value) or (value and not 1e-4 <= abs(value) < 1e16):
+                return False
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return True
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with ``orjson`` when it is installed.
+
+    The output is the same compact, UTF-8 JSON the stock renderer produces.
+    Datetimes, decimals and any other type orjson does not handle natively
+    go through DRF's ``JSONEncoder.default``. Pretty printed responses
+    (``indent``), values orjson refuses (e.g. integers wider than 64 bits)
+    and installs without orjson fall back to the stock renderer.
+
+    orjson formats floats outside ``1e-4 <= abs(x) < 1e16`` differently
+    (``1e16`` rather than ``1e+16``) and writes NaN and infinities as
+    ``null``. Responses holding such floats are rendered by the stock
+    renderer instead, which raises for NaN and infinities under
+    ``STRICT_JSON``. Floats produced by ``JSONEncoder.default`` itself (e.g.
+    decimals with ``COERCE_DECIMAL_TO_STRING`` off) are not checked and keep
+    orjson's formatting, and neither are float dict keys, so a ``1e16`` key
+    is written as ``"1e16"``.
+    """
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _FLOAT_SUSPECT.search(ret) and not _floats_render_like_stock(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the stock renderer's escaping of U+2028 and U+2029.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from users.tokens import AccessToken
+from utils.mixins import required_test_methods
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BaseAPITestCase(APITestCase):
+    """
+    Base test case for the API views.
+
+    The users every view test needs, ``super_user`` and ``normal_user``, are
+    created once per class in ``setUpTestData``; subclasses add their own
+    rows by extending it. Each test runs in a transaction that is rolled
+    back, and Django gives each test a fresh copy of the class-level
+    objects. Passwords are hashed with MD5 and JWTs are minted directly
+    instead of going through ``/token/``.
+
+    Subclasses that set ``view_set`` and ``required_http_methods`` are
+    checked with ``required_test_methods``.
+    """
+    PASSWORD = "dummy_password321"
+    view_set = None
+    required_http_methods = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.view_set is not None and cls.required_http_methods is not None:
+            required_test_methods(
+                http_methods=cls.required_http_methods,
+                class_view_set=cls.view_set
+            )(cls)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.super_user = User.objects.create_superuser(
+            username="test_admin",
+            email="test_admin@gmail.com",
+            password=cls.PASSWORD
+        )
+        cls.normal_user = User.objects.create_user(
+            username="normal_user",
+            email="dummy@gmail.com",
+            password=cls.PASSWORD
+        )
+
+    def _get_jwt_token(self, username, password=PASSWORD) -> dict[str, str]:
+        """
+        Authorization header for ``username``, with the same outcome as
+        obtaining a token from ``/token/``: unknown users and wrong
+        passwords get a header with no valid token.
+        """
+        user = User.objects.filter(username=username).first()
+        access_token = None
+        if user is not None and user.is_active and user.check_password(password):
+            access_token = str(AccessToken.for_user(user))
+
+        return {
+            "Authorization": f"Bearer {access_token}"
+        }
+
+
+class QueryPlanMixin:
+    """
+    Test case mixin failing tests whose queries plan a sequential scan over
+    a large table::
+
+        with self.assertNoSeqScans():
+            self.client.get("/api/v1/posts/")
+
+    Every ``SELECT``, ``INSERT``, ``UPDATE`` and ``DELETE`` run in the block
+    is explained, without running it again, with ``enable_seqscan`` off, so
+    the plan shows the index the query would use on a large table whatever
+    the size of the seeded data. A sequential scan, or a scan of a whole
+    index that filters rows instead of looking them up, on ``plan_tables``
+    or their partitions holding more than ``plan_min_rows`` rows fails the
+    test, unless it is expected to return at least ``plan_full_scan_ratio``
+    of the rows, which no index would make cheaper.
+    """
+    plan_tables = ('posts_post', 'comments_comment')
+    plan_min_rows = 1000
+    plan_full_scan_ratio = 0.5
+    explained_statements = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+    @contextmanager
+    def assertNoSeqScans(self, tables=None, min_rows=None, using='default'):
+        connection = connections[using]
+        with CaptureQueriesContext(connection) as queries:
+            yield queries
+
+        tables = tables or self.plan_tables
+        min_rows = self.plan_min_rows if min_rows is None else min_rows
+        failures = []
+        with connection.cursor() as cursor:
+            guarded = self._get_guarded_relations(cursor, tables)
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                for query in queries:
+                    sql = query['sql']
+                    if not sql.lstrip()[:6].upper().startswith(self.explained_statements):
+                        continue
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                    plan = cursor.fetchone()[0][0]['Plan']
+                    for relation, scan, rows in self._get_full_scans(plan):
+                        total = guarded.get(relation, -1)
+                        if total > min_rows and rows < total * self.plan_full_scan_ratio:
+                            failures.append(f"Full scan of {relation} ({scan}):\n    {sql}")
+            finally:
+                cursor.execute("RESET enable_seqscan")
+
+        if failures:
+            self.fail("\n".join(failures))
+
+    def _get_guarded_relations(self, cursor, tables):
+        """
+        :return: Estimated rows of ``tables`` and of their partitions by
+            relation name.
+        :rtype: dict
+        """
+        for table in tables:
+            cursor.execute(f"ANALYZE {cursor.db.ops.quote_name(table)}")
+        cursor.execute(
+            """
+            SELECT relation.relname, relation.reltuples
+            FROM pg_class relation
+            LEFT JOIN pg_inherits ON pg_inherits.inhrelid = relation.oid
+            LEFT JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE relation.relname = ANY(%s) OR parent.relname = ANY(%s)
+            """,
+            [list(tables), list(tables)]
+        )
+        return dict(cursor.fetchall())
+
+    def _get_full_scans(self, plan):
+        """
+        :return: ``(relation, description, estimated rows)`` of the scans
+            reading a whole table or index.
+        :rtype: iterator of tuple
+        """
+        node = plan['Node Type']
+        if node == 'Seq Scan':
+            yield plan['Relation Name'], node, plan['Plan Rows']
+        elif node in ('Index Scan', 'Index Only Scan') and 'Index Cond' not in plan and 'Filter' in plan:
+            yield (
+                plan['Relation Name'],
+                f"{node} using {plan['Index Name']} with a filter",
+                plan['Plan Rows']
+            )
+        for child in plan.get('Plans', ()):
+            yield from self._get_full_scans(child)
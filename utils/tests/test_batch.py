@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from categories.models import Category
+from comments.models import Comment
+from posts.models import Post
+from utils.testing import BaseAPITestCase
+
+
+class IdsFilterTestCase(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.categories = baker.make(Category, _quantity=4)
+
+    def test_list_is_restricted_to_ids(self):
+        ids = [self.categories[0].pk, self.categories[2].pk, 0]
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/v1/categories/", {'ids': ','.join(map(str, ids))})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(item['id'] for item in response.json()), sorted(ids[:2]))
+
+    def test_ids_on_users(self):
+        header = self._get_jwt_token(username="normal_user")
+        response = self.client.get("/api/v1/users/", {'ids': self.super_user.pk}, headers=header)
+        self.assertEqual([item['username'] for item in response.json()], ["test_admin"])
+
+    @override_settings(IDS_FILTER_MAX_IDS=2)
+    def test_invalid_ids(self):
+        for value in ("1,a", "", "1,2,3"):
+            response = self.client.get("/api/v1/categories/", {'ids': value})
+            self.assertEqual(response.status_code, 400, value)
+            self.assertIn('ids', response.json())
+
+
+class BatchTestCase(BaseAPITestCase):
+    BASE_URL = "/api/v1/batch/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = baker.make(Category, name="Python")
+        cls.post = baker.make(Post, owner=cls.normal_user, title="Batched")
+        cls.post.categories.add(cls.category)
+        baker.make(Comment, post=cls.post, owner=cls.super_user, _quantity=2)
+
+    def batch(self, requests, **kwargs):
+        return self.client.post(self.BASE_URL, {'requests': requests}, format='json', **kwargs)
+
+    def test_sub_requests_are_answered_in_order(self):
+        header = self._get_jwt_token(username="test_admin")
+        response = self.batch([
+            {'method': 'GET', 'path': f"/api/v1/posts/{self.post.pk}/"},
+            {'method': 'GET', 'path': f"/api/v1/users/{self.normal_user.pk}/"},
+            {'method': 'GET', 'path': f"/api/v1/categories/?ids={self.category.pk}"},
+            {'method': 'GET', 'path': f"/api/v1/comments/?ids=0"},
+            {'method': 'GET', 'path': "/api/v1/posts/0/"},
+            {'method': 'GET', 'path': "/api/v1/missing/"},
+        ], headers=header)
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([item['status'] for item in responses], [200, 200, 200, 200, 404, 404])
+        self.assertEqual(responses[0]['body']['title'], "Batched")
+        self.assertEqual(responses[0]['headers']['ETag'], '"1"')
+        self.assertEqual(responses[1]['body']['username'], "normal_user")
+        self.assertEqual(responses[2]['body'][0]['name'], "Python")
+        self.assertEqual(responses[3]['body'], [])
+
+    def test_sub_requests_share_authentication(self):
+        header = self._get_jwt_token(username="normal_user")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.batch([
+                {'method': 'GET', 'path': f"/api/v1/users/{self.normal_user.pk}/"},
+                {'method': 'GET', 'path': f"/api/v1/users/{self.normal_user.pk}/"},
+                {'method': 'GET', 'path': f"/api/v1/users/{self.super_user.pk}/"},
+            ], headers=header)
+        self.assertEqual([item['status'] for item in response.json()['responses']], [200, 200, 200])
+
+        # The authenticated user is loaded once, then served from the
+        # identity map; only the other user is fetched.
+        user_queries = [query for query in queries if 'FROM "auth_user"' in query['sql']]
+        self.assertEqual(len(user_queries), 2)
+
+    def test_writes_apply_permissions_of_the_sub_request(self):
+        anonymous = self.batch([
+            {'method': 'PATCH', 'path': f"/api/v1/posts/{self.post.pk}/", 'body': {'title': "Anonymous"}},
+        ])
+        self.assertEqual(anonymous.json()['responses'][0]['status'], 401)
+
+        header = self._get_jwt_token(username="test_admin")
+        response = self.batch([
+            {
+                'method': 'PATCH',
+                'path': f"/api/v1/posts/{self.post.pk}/",
+                'body': {'title': "Renamed"},
+                'headers': {'If-Match': '"2"'}
+            },
+            {'method': 'PATCH', 'path': f"/api/v1/posts/{self.post.pk}/", 'body': {'title': "Renamed"}},
+        ], headers=header)
+        self.assertEqual([item['status'] for item in response.json()['responses']], [412, 200])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "Renamed")
+
+    def test_failing_sub_request_does_not_fail_the_batch(self):
+        header = self._get_jwt_token(username="test_admin")
+        with mock.patch('posts.views.PostViewSet.retrieve', side_effect=DatabaseError("gone")), \
+                self.assertLogs('django.request', 'ERROR') as logs:
+            response = self.batch([
+                {'method': 'PATCH', 'path': f"/api/v1/categories/{self.category.pk}/", 'body': {'name': "Go"}},
+                {'method': 'GET', 'path': f"/api/v1/posts/{self.post.pk}/"},
+                {'method': 'GET', 'path': f"/api/v1/users/{self.normal_user.pk}/"},
+            ], headers=header)
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([item['status'] for item in responses], [200, 500, 200])
+        self.assertEqual(responses[1]['body'], {'detail': "Server error."})
+        self.assertIn(f"/api/v1/posts/{self.post.pk}/", logs.output[0])
+
+    def test_invalid_batches(self):
+        response = self.batch([{'method': 'GET', 'path': "/admin/"}])
+        self.assertEqual(response.status_code, 400)
+
+        response = self.batch([{'method': 'POST', 'path': self.BASE_URL, 'body': {'requests': []}}])
+        self.assertEqual(response.json()['responses'][0]['status'], 400)
+
+        response = self.batch([{'method': 'GET', 'path': f"/api/v1/comments/stream/?post={self.post.pk}"}])
+        self.assertEqual(response.json()['responses'][0]['status'], 400)
+
+        with self.settings(BATCH_MAX_REQUESTS=1):
+            response = self.batch([{'method': 'GET', 'path': "/api/v1/posts/"}] * 2)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,128 @@
+import asyncio
+import io
+import json
+from wsgiref.util import setup_testing_defaults
+
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import override_settings
+from model_bakery import baker
+
+from api.handlers import APIASGIHandler, APIWSGIHandler, ASGIDispatcher, WSGIDispatcher
+from categories.models import Category
+from posts.models import Post
+from utils.testing import BaseAPITestCase
+
+
+def wsgi_get(application, path, **environ):
+    environ.update({'PATH_INFO': path, 'HTTP_HOST': 'testserver'})
+    setup_testing_defaults(environ)
+    result = {}
+
+    def start_response(status, headers):
+        result['status'] = int(status.split()[0])
+        result['headers'] = dict(headers)
+
+    result['body'] = b''.join(application(environ, start_response))
+    return result
+
+
+def get_middleware(handler):
+    """
+    :return: The middleware classes of the chain of ``handler``, outermost
+        first.
+    """
+    middleware = []
+    chain = handler._middleware_chain
+    while True:
+        # Each middleware is wrapped by convert_exception_to_response().
+        chain = getattr(chain, '__wrapped__', chain)
+        if not hasattr(chain, 'get_response'):
+            return middleware
+        middleware.append(f"{type(chain).__module__}.{type(chain).__name__}")
+        chain = chain.get_response
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class APIHandlerTestCase(BaseAPITestCase):
+    def setUp(self):
+        # Like the test client, keep the handlers from closing the test
+        # transaction's connection.
+        for signal in (request_started, request_finished):
+            signal.disconnect(close_old_connections)
+            self.addCleanup(signal.connect, close_old_connections)
+
+    def test_api_middleware_is_loaded(self):
+        middleware = get_middleware(APIWSGIHandler())
+        self.assertNotIn('django.contrib.sessions.middleware.SessionMiddleware', middleware)
+        self.assertIn('django.middleware.common.CommonMiddleware', middleware)
+
+    def test_authenticated_write(self):
+        # A JWT authenticated POST needs neither the CSRF nor the session
+        # middleware.
+        category = baker.make(Category)
+        body = json.dumps({'title': "Handlers", 'body': "Body", 'categories': [category.pk]}).encode()
+        response = wsgi_get(
+            APIWSGIHandler(),
+            "/api/v1/posts/",
+            REQUEST_METHOD='POST',
+            CONTENT_TYPE='application/json',
+            CONTENT_LENGTH=str(len(body)),
+            HTTP_AUTHORIZATION=self._get_jwt_token(username="normal_user")['Authorization'],
+            **{'wsgi.input': io.BytesIO(body)},
+        )
+        self.assertEqual(response['status'], 201, response['body'])
+        self.assertNotIn('Set-Cookie', response['headers'])
+        self.assertEqual(Post.objects.get(title="Handlers").owner, self.normal_user)
+
+    def test_load_middleware_leaves_settings_alone(self):
+        with override_settings(MIDDLEWARE=['django.middleware.common.CommonMiddleware']):
+            handler = APIWSGIHandler()
+        self.assertIn('utils.identity.IdentityMapMiddleware', get_middleware(handler))
+
+    def test_wsgi_dispatch_by_path(self):
+        category = baker.make(Category)
+
+        class Recorder:
+            def __init__(self, handler):
+                self.handler = handler
+                self.paths = []
+
+            def __call__(self, environ, start_response):
+                self.paths.append(environ['PATH_INFO'])
+                return self.handler(environ, start_response)
+
+        api = Recorder(APIWSGIHandler())
+        default = Recorder(lambda environ, start_response: start_response('404 Not Found', []) or [])
+        application = WSGIDispatcher(api, default)
+
+        response = wsgi_get(application, f"/api/v1/categories/{category.pk}/")
+        self.assertEqual(response['status'], 200)
+        self.assertIn(category.name.encode(), response['body'])
+        self.assertNotIn('Set-Cookie', response['headers'])
+
+        wsgi_get(application, "/admin/")
+        self.assertEqual(api.paths, [f"/api/v1/categories/{category.pk}/"])
+        self.assertEqual(default.paths, ["/admin/"])
+
+    def test_asgi_dispatch_by_path(self):
+        calls = []
+
+        def app(name):
+            async def application(scope, receive, send):
+                calls.append((name, scope['path']))
+            return application
+
+        application = ASGIDispatcher(app('api'), app('default'))
+        for scope in (
+            {'type': 'http', 'path': '/api/v1/posts/'},
+            {'type': 'http', 'path': '/prefix/token/', 'root_path': '/prefix'},
+            {'type': 'http', 'path': '/admin/'},
+            {'type': 'lifespan', 'path': '/api/'},
+        ):
+            asyncio.run(application(scope, None, None))
+
+        self.assertEqual([name for name, _ in calls], ['api', 'api', 'default', 'default'])
+
+    def test_asgi_handler_loads_async_chain(self):
+        self.assertIsNotNone(APIASGIHandler()._middleware_chain)
@@ -0,0 +1,71 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from categories.models import Category
+from utils.identity import get_identity_map, identity_map
+
+
+class IdentityMapTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = baker.make(User)
+        self.categories = baker.make(Category, _quantity=3)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def count_pk_selects(self, queries, table):
+        return sum(
+            1 for query in queries
+            if f'FROM "{table}" WHERE "{table}"."id"' in query['sql']
+        )
+
+    def test_authenticated_user_is_not_fetched_again(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f"/api/v1/users/{self.user.pk}/", {'username': 'renamed'}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.count_pk_selects(queries, 'auth_user'), 1)
+
+    def test_related_categories_are_fetched_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/v1/posts/", {
+                'title': 'Title',
+                'body': 'Body',
+                'categories': [category.pk for category in self.categories]
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.count_pk_selects(queries, 'categories_category'), 1)
+
+    def test_unknown_related_category(self):
+        response = self.client.post("/api/v1/posts/", {
+            'title': 'Title',
+            'body': 'Body',
+            'categories': [self.categories[0].pk, 0, 'x']
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(DEBUG=True)
+    def test_saved_queries_header(self):
+        response = self.client.get(f"/api/v1/users/{self.user.pk}/")
+
+        self.assertEqual(response['X-Identity-Map-Saved-Queries'], '1')
+
+    def test_map_is_scoped_to_the_context(self):
+        seen = []
+        with identity_map() as identities:
+            thread = threading.Thread(target=lambda: seen.append(get_identity_map()))
+            thread.start()
+            thread.join()
+            self.assertIs(get_identity_map(), identities)
+
+        self.assertEqual(seen, [None])
+        self.assertIsNone(get_identity_map())
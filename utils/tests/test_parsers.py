@@ -0,0 +1,33 @@
+import io
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from utils.parsers import FastJSONParser
+
+
+class FastJSONParserTestCase(SimpleTestCase):
+    def parse(self, parser, body, **parser_context):
+        return parser.parse(io.BytesIO(body), 'application/json', parser_context)
+
+    def test_parses_like_stock(self):
+        body = '{"a": [1, 2.5, null, true], "b": "żółw\\u2028", "c": {"d": 1e16}}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_non_utf8_body_uses_stock_parser(self):
+        body = '{"a": "caf\xe9"}'.encode('latin-1')
+        self.assertEqual(
+            self.parse(FastJSONParser(), body, encoding='latin-1'),
+            {'a': 'caf\xe9'}
+        )
+
+    def test_parse_errors(self):
+        for body in (b'{"a": ', b'{"a": 1,}', b'\xff\xfe', b''):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as stock:
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(FastJSONParser(), body)
+                self.assertTrue(str(fast.exception.detail).startswith('JSON parse error - '))
+                self.assertTrue(str(stock.exception.detail).startswith('JSON parse error - '))
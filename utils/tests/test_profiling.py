@@ -0,0 +1,100 @@
+import sys
+from collections import Counter
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from utils.profiling import TRUNCATED, ProfileStore, ProfilingMiddleware, StackSampler, profile_store
+from utils.testing import BaseAPITestCase
+
+
+class StackSamplerTestCase(SimpleTestCase):
+    def test_samples_stack_below_root(self):
+        sampler = StackSampler(interval=60)
+
+        def handler():
+            sampler.sample()
+
+        samples = sampler.start(sys._getframe())
+        try:
+            handler()
+        finally:
+            sampler.stop()
+
+        stacks = [stack for stack in samples if stack.endswith('StackSampler.sample')]
+        self.assertEqual(len(stacks), 1)
+        self.assertEqual(stacks[0].split(';'), [
+            f"{__name__}:StackSamplerTestCase.test_samples_stack_below_root.<locals>.handler",
+            "utils.profiling:StackSampler.sample",
+        ])
+
+    def test_store_is_bounded(self):
+        store = ProfileStore(max_routes=2, max_stacks=2)
+        store.add('GET a', Counter({'x': 1, 'y': 2}))
+        store.add('GET a', Counter({'z': 3, 'x': 1}))
+        store.add('GET b', Counter({'x': 1}))
+        store.add('GET c', Counter())
+
+        self.assertEqual([route['route'] for route in store.routes()], ['GET c', 'GET b'])
+        store.add('GET a', Counter({'x': 1, 'y': 2}))
+        store.add('GET a', Counter({'z': 3}))
+        self.assertEqual(store.collapsed('GET a'), f"{TRUNCATED} 3\ny 2\nx 1\n")
+        self.assertEqual(store.routes()[0], {'route': 'GET a', 'requests': 2, 'samples': 6})
+
+    @override_settings(PROFILE_HEADER=None, PROFILE_SAMPLE_RATE=0)
+    def test_middleware_is_not_used_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+
+class ProfilingTestCase(BaseAPITestCase):
+    BASE_URL = "/api/v1/profiles/"
+
+    def setUp(self):
+        profile_store.clear()
+        self.addCleanup(profile_store.clear)
+
+    def test_header_profiles_requests_of_staff_users(self):
+        header = self._get_jwt_token(username="test_admin")
+        response = self.client.get("/api/v1/categories/", headers={**header, 'X-Profile': '1'})
+        self.assertIn('X-Profile-Samples', response)
+
+        routes = self.client.get(self.BASE_URL, headers=header).json()['routes']
+        self.assertEqual([(route['route'], route['requests']) for route in routes], [("GET category-list", 1)])
+
+    def test_header_is_ignored_for_other_users(self):
+        header = self._get_jwt_token(username="normal_user")
+        response = self.client.get("/api/v1/categories/", headers={**header, 'X-Profile': '1'})
+        self.assertNotIn('X-Profile-Samples', response)
+        response = self.client.get("/api/v1/categories/", headers={'X-Profile': '1'})
+        self.assertNotIn('X-Profile-Samples', response)
+        self.assertEqual(profile_store.routes(), [])
+
+    @override_settings(PROFILE_SAMPLE_RATE=1)
+    def test_sample_rate_profiles_all_requests(self):
+        self.client.get("/api/v1/categories/")
+        self.assertEqual(profile_store.routes()[0]['route'], "GET category-list")
+
+    def test_download_collapsed_stacks(self):
+        profile_store.add("GET post-list", Counter({'a;b': 3, 'a;c': 1}))
+        header = self._get_jwt_token(username="test_admin")
+
+        response = self.client.get(self.BASE_URL + "collapsed/", {'route': "GET post-list"}, headers=header)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"a;b 3\na;c 1\n")
+        self.assertIn('GET-post-list.folded', response['Content-Disposition'])
+
+        response = self.client.get(self.BASE_URL + "collapsed/", {'route': "GET user-list"}, headers=header)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.BASE_URL + "collapsed/", headers=header)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.BASE_URL + "clear/", headers=header)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(profile_store.routes(), [])
+
+    def test_profiles_are_for_admins(self):
+        header = self._get_jwt_token(username="normal_user")
+        response = self.client.get(self.BASE_URL, headers=header)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,94 @@
+from model_bakery import baker
+from rest_framework import status
+
+from categories.models import Category
+from comments.models import Comment
+from posts.models import Post
+from utils.testing import BaseAPITestCase, QueryPlanMixin
+
+
+class HotEndpointQueryPlanTestCase(QueryPlanMixin, BaseAPITestCase):
+    """
+    The queries of the most requested endpoints must be served by indexes.
+    """
+    plan_min_rows = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        categories = baker.make(Category, _quantity=5)
+        owners = [cls.normal_user] + baker.make('auth.User', _quantity=29)
+        cls.posts = Post.objects.bulk_create(
+            Post(title=f"Post {i}", body=f"Body {i}", owner=owners[i % 30]) for i in range(300)
+        )
+        Post.categories.through.objects.bulk_create(
+            Post.categories.through(post=post, category=categories[i % 5])
+            for i, post in enumerate(cls.posts)
+        )
+        Comment.objects.bulk_create(
+            Comment(body=f"Comment {i}", post=cls.posts[i % 300], owner=owners[i % 30])
+            for i in range(900)
+        )
+        cls.post = cls.posts[0]
+        cls.comment = Comment.objects.filter(post=cls.post).first()
+
+    def test_post_endpoints(self):
+        header = self._get_jwt_token(username="test_admin")
+        with self.assertNoSeqScans():
+            for url in (
+                "/api/v1/posts/",
+                f"/api/v1/posts/?ids={self.post.pk},{self.posts[1].pk}",
+                f"/api/v1/posts/{self.post.pk}/",
+                "/api/v1/posts/trending/",
+                f"/api/v1/posts/{self.post.pk}/related/",
+            ):
+                response = self.client.get(url, headers=header)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+
+    def test_comment_endpoints(self):
+        header = self._get_jwt_token(username="test_admin")
+        with self.assertNoSeqScans():
+            for url in (
+                f"/api/v1/comments/?ids={self.comment.pk}",
+                f"/api/v1/comments/?post={self.post.pk}",
+                f"/api/v1/comments/{self.comment.pk}/",
+            ):
+                response = self.client.get(url, headers=header)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            response = self.client.patch(
+                f"/api/v1/comments/{self.comment.pk}/", {'body': "Edited"}, headers=header
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_endpoints(self):
+        header = self._get_jwt_token(username="test_admin")
+        with self.assertNoSeqScans():
+            for url in (
+                f"/api/v1/users/{self.normal_user.pk}/",
+                f"/api/v1/users/{self.normal_user.pk}/stats/",
+            ):
+                response = self.client.get(url, headers=header)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+
+    def test_sync(self):
+        with self.settings(SYNC_SETTLE_SECONDS=0), self.assertNoSeqScans():
+            response = self.client.get("/api/v1/sync/", {'limit': 50})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get("/api/v1/sync/", {'since': response.json()['cursor'], 'limit': 50})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_full_scans_fail(self):
+        with self.assertRaisesMessage(AssertionError, "Full scan of posts_post"):
+            with self.assertNoSeqScans():
+                list(Post.objects.filter(body="Body 1"))
+
+        with self.assertRaisesMessage(AssertionError, "Full scan of comments_comment_"):
+            with self.assertNoSeqScans():
+                list(Comment.all_objects.filter(body="Comment 1"))
+
+        with self.assertNoSeqScans(min_rows=1000):
+            list(Post.objects.filter(body="Body 1"))
+
+        # Reading every row is not a missing index.
+        with self.assertNoSeqScans():
+            list(Comment.all_objects.all())
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from model_bakery import baker
+
+from categories.models import Category
+from utils.querylog import normalize_sql, slow_query_log
+from utils.testing import BaseAPITestCase
+
+
+class NormalizeSqlTestCase(SimpleTestCase):
+    def test_literals_and_lists_are_replaced(self):
+        self.assertEqual(
+            normalize_sql(
+                'SELECT "a"."id" FROM "a"\n  WHERE "a"."id" IN (%s, %s, %s) AND "a"."name" = \'x\' LIMIT 21'
+            ),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) AND "a"."name" = ? LIMIT ?'
+        )
+        self.assertEqual(
+            normalize_sql('INSERT INTO "a" ("x", "y") VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "a" ("x", "y") VALUES (...)'
+        )
+        self.assertEqual(normalize_sql('SELECT 1 FROM "t_p2026_01"'), 'SELECT ? FROM "t_p2026_01"')
+
+
+@override_settings(SLOW_QUERY_SAMPLE_RATE=1, SLOW_QUERY_THRESHOLD_MS=0)
+class SlowQuerySamplerTestCase(BaseAPITestCase):
+    BASE_URL = "/api/v1/slow-queries/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        baker.make(Category, _quantity=2)
+
+    def setUp(self) -> None:
+        slow_query_log.clear()
+
+    def test_selects_are_recorded_with_analyzed_plans(self):
+        self.client.get("/api/v1/categories/")
+
+        entry, = slow_query_log.entries()
+        self.assertTrue(entry['sql'].startswith('SELECT "categories_category"."id"'))
+        self.assertEqual(entry['view'], 'category-list')
+        self.assertEqual(entry['method'], 'GET')
+        self.assertIn('actual time=', entry['plan'])
+
+    def test_writes_are_explained_without_running_them_again(self):
+        header = self._get_jwt_token(username="test_admin")
+        self.client.post("/api/v1/categories/", {'name': "Rust"}, headers=header)
+
+        inserts = [entry for entry in slow_query_log.entries() if entry['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertNotIn('actual time=', inserts[0]['plan'])
+        self.assertEqual(Category.objects.filter(name="Rust").count(), 1)
+
+    @override_settings(SLOW_QUERY_SAMPLE_RATE=0)
+    def test_disabled_sampler_records_nothing(self):
+        self.client.get("/api/v1/categories/")
+        self.assertEqual(slow_query_log.entries(), [])
+
+    def test_endpoint_is_admin_only(self):
+        self.client.get("/api/v1/categories/")
+
+        header = self._get_jwt_token(username="normal_user")
+        self.assertEqual(self.client.get(self.BASE_URL, headers=header).status_code, 403)
+
+        header = self._get_jwt_token(username="test_admin")
+        response = self.client.get(self.BASE_URL, headers=header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['entries'][-1]['view'], 'category-list')
+
+        response = self.client.post(f"{self.BASE_URL}clear/", headers=header)
+        self.assertEqual(response.status_code, 204)
+        # Only the queries of the clear request itself are left.
+        self.assertTrue(all(entry['view'] == 'slow-query-clear' for entry in slow_query_log.entries()))
+
+    @override_settings(SLOW_QUERY_SAMPLE_RATE=0)
+    def test_command(self):
+        out = StringIO()
+        call_command('slow_queries', '/api/v1/categories/', '--repeat', '2', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("GET /api/v1/categories/: 200", output)
+        self.assertIn('SELECT "categories_category"."id"', output)
+        self.assertIn("2 queries recorded.", output)
+
+    def test_command_refuses_writes(self):
+        with self.assertRaises(CommandError):
+            call_command('slow_queries', '/api/v1/categories/', '--method', 'post', stdout=StringIO())
+
+        out = StringIO()
+        call_command('slow_queries', '/api/v1/categories/', '--method', 'head', stdout=out)
+        self.assertIn("HEAD /api/v1/categories/: 200", out.getvalue())
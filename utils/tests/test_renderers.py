@@ -0,0 +1,56 @@
+import datetime
+import decimal
+import uuid
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from utils.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    def assertRendersLikeStock(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_datetime_decimal_and_uuid(self):
+        self.assertRendersLikeStock({
+            'naive': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+            'aware': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2024, 1, 2),
+            'time': datetime.time(3, 4, 5, 6000),
+            'decimal': decimal.Decimal('1.10'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        })
+
+    def test_line_separators_are_escaped(self):
+        self.assertRendersLikeStock({'text': 'a\u2028b\u2029c', 'unicode': 'żółw'})
+        self.assertIn(b'a\\u2028b\\u2029c', FastJSONRenderer().render({'text': 'a\u2028b\u2029c'}))
+
+    def test_floats(self):
+        for value in (1e16, -2.5e20, 1e-05, 3.851825232865298e-05, 0.0001, 0.1, 123.456, -0.0):
+            with self.subTest(value=value):
+                self.assertRendersLikeStock({'a': value, 'b': None})
+
+        self.assertEqual(FastJSONRenderer().render({'a': 1e16}), b'{"a":1e+16}')
+
+    def test_non_finite_floats_raise_like_stock(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'a': [value]})
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({'a': [value]})
+
+    def test_indent_falls_back_to_stock(self):
+        data = {'a': [1, 2], 'b': {'c': 'd'}}
+        self.assertRendersLikeStock(data, 'application/json; indent=4')
+        self.assertIn(b'\n    ', FastJSONRenderer().render(data, 'application/json; indent=4'))
+
+    def test_wide_integers_fall_back_to_stock(self):
+        self.assertRendersLikeStock({'a': 2 ** 70})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.schema import get_view
+from utils.management.commands.importtime import parse_importtime
+
+
+class SchemaTestCase(APITestCase):
+    URL = "/swagger.json/"
+
+    def setUp(self) -> None:
+        self.artifact_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.artifact_dir)
+        settings_override = override_settings(SCHEMA_ARTIFACT_DIR=self.artifact_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_serves_generated_artifact_with_caching_headers(self):
+        call_command('generate_schema', stdout=StringIO())
+
+        response = self.client.get(self.URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/api/v1/posts/', response.json()['paths'])
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/swagger.yaml/")
+        self.assertEqual(response['Content-Type'], 'application/yaml')
+
+    def test_missing_artifact(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 404)
+
+        with override_settings(DEBUG=True):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/api/v1/posts/', response.json()['paths'])
+
+    @override_settings(DEBUG=False)
+    def test_missing_artifact_is_not_generated_without_debug(self):
+        with mock.patch('api.schema.get_view') as get_view:
+            response = self.client.get(self.URL)
+
+        self.assertEqual(response.status_code, 404)
+        get_view.assert_not_called()
+
+    def test_ui_views_are_built_once(self):
+        self.assertEqual(self.client.get("/redoc/").status_code, 200)
+        self.assertIs(get_view('redoc'), get_view('redoc'))
+
+
+class ImportTimeTestCase(APITestCase):
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     django.utils.version\n"
+            "import time:      2500 |       2620 | django\n"
+        )
+
+        self.assertEqual(parse_importtime(output), [
+            ('django.utils.version', 120, 120),
+            ('django', 2500, 2620),
+        ])
@@ -0,0 +1,206 @@
+import functools
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+
+class ValuesRowBuilder:
+    """
+    Build the representation of a ``ModelSerializer`` straight from
+    ``QuerySet.values()`` rows, without instantiating model objects or
+    running the serializer per row.
+
+    The plan is derived from the serializer's own fields so the output
+    matches ``serializer_class(queryset, many=True).data``:
+
+    - concrete model fields and foreign keys are read as columns,
+    - ``PrimaryKeyRelatedField(many=True)`` relations are loaded with one
+      query per relation and merged by primary key,
+    - nested ``many=True`` serializers over a reverse foreign key are built
+      recursively with one query per level.
+
+    Related rows are ordered like the related manager orders them for the
+    serializer, by the related model's ``Meta.ordering``, with the primary
+    key breaking ties.
+
+    Read-only fields whose source does not exist on the model are left out,
+    like DRF does. Any other field type raises ``ImproperlyConfigured``.
+    """
+    COLUMN = 'column'
+    DATETIME = 'datetime'
+    RELATED = 'related'
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.pk_name = self.model._meta.pk.attname
+        self.columns = [self.pk_name]
+        self.fields = []
+        self.loaders = {}
+
+        for field_name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+
+            model_field = self._get_model_field(field)
+            if model_field is None:
+                continue
+
+            if isinstance(field, ManyRelatedField):
+                self._add_related_ids(field_name, field, model_field)
+            elif isinstance(field, serializers.ListSerializer):
+                self._add_nested(field_name, field, model_field)
+            elif isinstance(field, (serializers.Serializer, serializers.SerializerMethodField)):
+                self._unsupported(field_name)
+            elif model_field.concrete:
+                self._add_column(field_name, field, model_field)
+            else:
+                self._unsupported(field_name)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, rows):
+        """
+        :param rows: Rows returned by ``self.values(queryset)``.
+        :type rows: iterable of dict
+
+        :return: One representation per row, in the same order.
+        :rtype: list of dict
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        pks = [row[self.pk_name] for row in rows]
+        related = {name: loader(pks) for name, loader in self.loaders.items()}
+        # Resolved once instead of once per value by DateTimeField.
+        current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+        data = []
+        for row in rows:
+            item = {}
+            for field_name, kind, source, converter in self.fields:
+                if kind == self.RELATED:
+                    item[field_name] = related[field_name].get(row[self.pk_name], [])
+                    continue
+
+                value = row[source]
+                if value is None:
+                    pass
+                elif kind == self.DATETIME and current_timezone is not None and value.tzinfo is not None:
+                    value = value.astimezone(current_timezone).isoformat()
+                    if value.endswith('+00:00'):
+                        value = value[:-6] + 'Z'
+                elif converter is not None:
+                    value = converter(value)
+                item[field_name] = value
+            data.append(item)
+        return data
+
+    def grouped(self, queryset, key):
+        """
+        Build the representations of ``queryset`` grouped by the ``key``
+        column, e.g. comments by ``post_id``.
+        """
+        columns = self.columns if key in self.columns else self.columns + [key]
+        rows = list(queryset.values(*columns))
+
+        grouped = {}
+        for row, item in zip(rows, self.to_representation(rows)):
+            grouped.setdefault(row[key], []).append(item)
+        return grouped
+
+    def _get_model_field(self, field):
+        if '.' in field.source or field.source == '*':
+            self._unsupported(field.field_name)
+
+        try:
+            return self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            if field.required or hasattr(self.model, field.source):
+                self._unsupported(field.field_name)
+            # DRF skips read-only fields whose attribute does not exist.
+            return None
+
+    def _add_column(self, field_name, field, model_field):
+        kind = self.COLUMN
+        converter = field.to_representation
+        if self._is_iso_datetime(field):
+            kind = self.DATETIME
+        elif isinstance(field, PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                self._unsupported(field_name)
+            converter = None
+        elif type(field) in (serializers.CharField, serializers.IntegerField):
+            # values() already returns str and int for these.
+            converter = None
+
+        self.columns.append(model_field.attname)
+        self.fields.append((field_name, kind, model_field.attname, converter))
+
+    def _is_iso_datetime(self, field):
+        if type(field) is not serializers.DateTimeField or hasattr(field, 'timezone'):
+            return False
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+    def _add_related_ids(self, field_name, field, model_field):
+        child = field.child_relation
+        if not isinstance(child, PrimaryKeyRelatedField) or child.pk_field is not None:
+            self._unsupported(field_name)
+
+        lookup = self._get_reverse_lookup(field_name, model_field)
+        manager = model_field.related_model._default_manager
+
+        def load(pks):
+            related = {}
+            queryset = self._order_related(manager.filter(**{f'{lookup}__in': pks}), lookup)
+            rows = queryset.values_list(lookup, 'pk')
+            for pk, related_pk in rows:
+                related.setdefault(pk, []).append(related_pk)
+            return related
+
+        self.fields.append((field_name, self.RELATED, None, None))
+        self.loaders[field_name] = load
+
+    def _add_nested(self, field_name, field, model_field):
+        if not model_field.one_to_many:
+            self._unsupported(field_name)
+
+        builder = ValuesRowBuilder(type(field.child))
+        lookup = model_field.field.name
+        key = model_field.field.attname
+        manager = model_field.related_model._default_manager
+
+        def load(pks):
+            queryset = self._order_related(manager.filter(**{f'{lookup}__in': pks}), lookup)
+            return builder.grouped(queryset, key)
+
+        self.fields.append((field_name, self.RELATED, None, None))
+        self.loaders[field_name] = load
+
+    def _order_related(self, queryset, lookup):
+        return queryset.order_by(lookup, *queryset.model._meta.ordering, 'pk')
+
+    def _get_reverse_lookup(self, field_name, model_field):
+        if model_field.many_to_many and model_field.concrete:
+            return model_field.related_query_name()
+        if model_field.one_to_many or model_field.many_to_many:
+            return model_field.field.name
+        self._unsupported(field_name)
+
+    def _unsupported(self, field_name):
+        raise ImproperlyConfigured(
+            f"{self.serializer_class.__name__}.{field_name} cannot be built"
+            f" from values() rows."
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_values_builder(serializer_class):
+    return ValuesRowBuilder(serializer_class)
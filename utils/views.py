@@ -0,0 +1,60 @@
+import os
+
+from django.http import HttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from utils.profiling import profile_store
+from utils.querylog import slow_query_log
+
+
+class SlowQueryViewSet(viewsets.ViewSet):
+    """
+    The slow queries sampled by the worker process serving the request,
+    newest first. Every worker keeps its own log.
+    """
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response({'pid': os.getpid(), 'entries': slow_query_log.entries()})
+
+    @action(detail=False, methods=['post'])
+    def clear(self, request):
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    The routes profiled by the worker process serving the request, most
+    recently profiled first. Every worker keeps its own profiles.
+    """
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response({'pid': os.getpid(), 'routes': profile_store.routes()})
+
+    @action(detail=False, methods=['get'])
+    def collapsed(self, request):
+        """
+        The stacks of ``?route=`` in collapsed format, for flame graph tools.
+        """
+        route = request.query_params.get('route')
+        if not route:
+            raise ValidationError({'route': "Expected a route, e.g. 'GET post-list'."})
+        stacks = profile_store.collapsed(route)
+        if stacks is None:
+            raise NotFound()
+
+        response = HttpResponse(stacks, content_type='text/plain; charset=utf-8')
+        filename = route.replace(' ', '-').replace('/', '_')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.folded"'
+        return response
+
+    @action(detail=False, methods=['post'])
+    def clear(self, request):
+        profile_store.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)